@@ -0,0 +1,1112 @@
+# agregacion.py
+import json
+import os
+import shutil
+import threading
+from functools import cached_property, wraps
+
+import numpy as np
+import pandas as pd
+
+from aproximado import CANDIDATOS_TOPK, BocetosIndicadores, cuantizar
+from instrumentacion import medir
+
+# Textos distintos de habilidades que contar_habilidades separa a la vez
+TEXTOS_POR_BLOQUE = 100_000
+
+# Orden en que se presentan los indicadores en el informe
+INDICADORES = (
+    'usuarios_nuevos_semana',
+    'tipo_usuario_mas_registrado',
+    'hoja_vida_completa',
+    'habilidades_mas_frecuentes',
+    'consultas_familiares',
+    'horarios_acceso_familiares',
+    'promedio_notas_grupo',
+    'materias_mas_reprobaciones',
+    'asistencia_promedio_estudiante',
+    'estudiantes_ausencias_recurrentes',
+    'tipos_apoyo_solicitados',
+    'frecuencia_solicitudes_mes',
+    'resumen_estadistico_grupo',
+    'correlacion_nota_asistencia',
+)
+
+COLUMNAS_HOJA_VIDA = ['nombre', 'email', 'telefono', 'direccion']
+
+# Columnas que lee cada indicador (para cargar solo lo necesario)
+COLUMNAS_INDICADOR = {
+    'usuarios_nuevos_semana': ['fecha_registro'],
+    'tipo_usuario_mas_registrado': ['tipo_usuario'],
+    'hoja_vida_completa': COLUMNAS_HOJA_VIDA,
+    'habilidades_mas_frecuentes': ['habilidades'],
+    'consultas_familiares': ['id_estudiante', 'tipo_usuario', 'timestamp'],
+    'horarios_acceso_familiares': ['timestamp', 'tipo_usuario'],
+    'promedio_notas_grupo': ['grupo_id', 'nota'],
+    'materias_mas_reprobaciones': ['materia', 'nota'],
+    'asistencia_promedio_estudiante': ['id_estudiante', 'asistencia'],
+    'estudiantes_ausencias_recurrentes': ['id_estudiante', 'estado_asistencia'],
+    'tipos_apoyo_solicitados': ['tipo_apoyo'],
+    'frecuencia_solicitudes_mes': ['timestamp'],
+    'resumen_estadistico_grupo': ['grupo_id', 'nota', 'asistencia'],
+    'correlacion_nota_asistencia': ['nota', 'asistencia'],
+}
+FRANJAS_HORARIAS = ['Madrugada', 'Mañana', 'Tarde', 'Noche']
+
+# Dimensiones del cubo de indicadores filtrables ('mes' sale de timestamp)
+DIMENSIONES_CUBO = ('grupo_id', 'materia', 'tipo_usuario', 'mes')
+ESTADISTICOS_RESUMEN = ['nota', 'asistencia']
+
+
+# --- Presentación de resultados (compartida por el plan y los parciales) ---
+
+def columnas_necesarias(indicadores=INDICADORES):
+    """Columnas que hay que cargar para calcular los indicadores pedidos"""
+    columnas = []
+    for nombre in indicadores:
+        columnas += [col for col in COLUMNAS_INDICADOR[nombre] if col not in columnas]
+    return columnas
+
+
+def contar_habilidades(habilidades, textos_por_bloque=TEXTOS_POR_BLOQUE):
+    """Frecuencia de cada habilidad en una columna de listas separadas por comas.
+
+    Cada texto distinto se separa y normaliza una sola vez (en una columna
+    categórica, directamente sobre sus categorías) y su número de filas se
+    reparte entre sus habilidades, sin crear una fila por habilidad. Los
+    textos distintos se procesan por bloques, así que la memoria depende del
+    vocabulario y no del número de filas. Devuelve conteos int64 indexados
+    por el vocabulario ordenado.
+    """
+    if isinstance(habilidades.dtype, pd.CategoricalDtype):
+        codigos = habilidades.cat.codes.to_numpy()
+        textos = habilidades.cat.categories
+    else:
+        codigos, textos = pd.factorize(habilidades)
+    filas_por_texto = np.bincount(codigos[codigos >= 0], minlength=len(textos))
+    return contar_habilidades_por_texto(textos, filas_por_texto, textos_por_bloque)
+
+
+def contar_habilidades_por_texto(textos, filas_por_texto, textos_por_bloque=TEXTOS_POR_BLOQUE):
+    """Como contar_habilidades, a partir de los textos distintos y su número de filas"""
+    textos = pd.Index(textos)
+    filas_por_texto = np.asarray(filas_por_texto)
+    usados = np.flatnonzero(filas_por_texto)
+
+    conteo = pd.Series(dtype='int64')
+    for inicio in range(0, len(usados), textos_por_bloque):
+        bloque = usados[inicio:inicio + textos_por_bloque]
+        tokens = pd.Series(textos[bloque].astype(str)).str.split(',').explode()
+        vocabulario, ids = np.unique(tokens.str.strip().str.lower().to_numpy(dtype=object), return_inverse=True)
+        pesos = filas_por_texto[bloque][tokens.index.to_numpy()]
+        conteos = np.bincount(ids, weights=pesos, minlength=len(vocabulario)).astype('int64')
+        conteo = conteo.add(pd.Series(conteos, index=vocabulario), fill_value=0)
+    return conteo.astype('int64')
+
+
+def top_k(conteo, k):
+    """Las k etiquetas más frecuentes, con desempate por etiqueta, sin ordenar todo el conteo"""
+    if not conteo.index.is_monotonic_increasing:
+        conteo = conteo.sort_index()
+    valores = conteo.to_numpy()
+    candidatos = np.arange(len(valores))
+    if len(valores) > k:
+        umbral = np.partition(valores, len(valores) - k)[len(valores) - k]
+        candidatos = np.flatnonzero(valores >= umbral)
+    return conteo.iloc[candidatos[np.argsort(-valores[candidatos], kind='stable')][:k]]
+
+
+def _ordenar_conteo(conteo):
+    """Ordena de mayor a menor con desempate por etiqueta, igual en todos los caminos"""
+    return conteo.sort_index(kind='stable').sort_values(ascending=False, kind='stable')
+
+
+def _tabla_semanas(conteo):
+    """Formatea conteos indexados por (año_registro, semana_registro)"""
+    usuarios_semana = conteo.sort_index().rename('usuarios_nuevos').reset_index()
+    usuarios_semana['semana'] = usuarios_semana['año_registro'].astype(str) + '-S' + usuarios_semana['semana_registro'].astype(str)
+    return usuarios_semana[['semana', 'usuarios_nuevos']]
+
+
+def _tabla_tipos_usuario(distribucion):
+    distribucion = _ordenar_conteo(distribucion)
+    porcentajes = (distribucion / distribucion.sum() * 100).round(2)
+    return pd.DataFrame({
+        'tipo': distribucion.index,
+        'cantidad': distribucion.values,
+        'porcentaje': porcentajes.values
+    })
+
+
+def _tabla_hoja_vida(completado, total):
+    estado_hoja_vida = _ordenar_conteo(completado).reset_index()
+    estado_hoja_vida.columns = ['completado', 'cantidad']
+    estado_hoja_vida['porcentaje'] = (estado_hoja_vida['cantidad'] / total * 100).round(2)
+    return estado_hoja_vida
+
+
+def _tabla_habilidades(conteo):
+    top_habilidades = top_k(conteo, 10).reset_index()
+    top_habilidades.columns = ['habilidad', 'frecuencia']
+    return top_habilidades
+
+
+def _resultado_consultas(consultas, es_estudiante, estudiante_nulo):
+    """consultas y es_estudiante son Series indexadas por id_estudiante"""
+    con_consulta = consultas.to_numpy() > 0
+    estudiantes = es_estudiante.to_numpy()
+    return {
+        'consultas_por_estudiante': pd.DataFrame({
+            'id_estudiante': consultas.index[con_consulta],
+            'consultas': consultas.to_numpy()[con_consulta]
+        }),
+        # Un id nulo entre los estudiantes cuenta como un estudiante más
+        'estudiantes_sin_interaccion': int((estudiantes & ~con_consulta).sum()) + int(estudiante_nulo),
+        'total_estudiantes': int(estudiantes.sum()) + int(estudiante_nulo)
+    }
+
+
+def _tabla_horarios(horas):
+    """Agrupa un conteo de accesos por hora en franjas horarias"""
+    franja_horaria = pd.cut(horas.index, bins=[0, 6, 12, 18, 24], labels=FRANJAS_HORARIAS)
+    accesos = horas.groupby(franja_horaria, observed=False).sum()
+    horarios = accesos.sort_values(ascending=False, kind='stable').reset_index()
+    horarios.columns = ['franja_horaria', 'accesos']
+    return horarios
+
+
+def _tabla_promedio_grupo(medias):
+    promedio_grupos = medias.round(2).reset_index()
+    promedio_grupos.columns = ['grupo_id', 'promedio_nota']
+    return promedio_grupos.sort_values('promedio_nota', ascending=False, kind='stable')
+
+
+def _tabla_reprobaciones(reprobaciones_materia):
+    reprobaciones_materia = reprobaciones_materia.reset_index()
+    reprobaciones_materia['porcentaje_reprobacion'] = (reprobaciones_materia['reprobados'] / reprobaciones_materia['total_estudiantes'] * 100).round(2)
+    return reprobaciones_materia.sort_values('porcentaje_reprobacion', ascending=False, kind='stable')
+
+
+def _tabla_asistencia(medias):
+    return pd.DataFrame({
+        'id_estudiante': medias.index,
+        'asistencia_promedio': medias.round(2).to_numpy()
+    })
+
+
+def _tabla_ausencias(ausencias):
+    con_ausencias = ausencias.to_numpy() > 0
+    conteo_ausencias = pd.DataFrame({
+        'id_estudiante': ausencias.index[con_ausencias],
+        'ausencias': ausencias.to_numpy()[con_ausencias]
+    })
+    estudiantes_problema = conteo_ausencias[conteo_ausencias['ausencias'] > 3]
+    return estudiantes_problema.sort_values('ausencias', ascending=False, kind='stable')
+
+
+def _tabla_apoyos(conteo, total=None):
+    """total, si se indica, reemplaza la suma del conteo (cuando el conteo solo trae algunos tipos)"""
+    apoyos = _ordenar_conteo(conteo).reset_index()
+    apoyos.columns = ['tipo_apoyo', 'solicitudes']
+    total = apoyos['solicitudes'].sum() if total is None else total
+    apoyos['porcentaje'] = (apoyos['solicitudes'] / total * 100).round(2)
+    return apoyos.head(3)
+
+
+def _tabla_meses(conteo):
+    """Formatea conteos indexados por mes codificado como año * 12 + (mes - 1)"""
+    conteo = conteo.sort_index()
+    meses = conteo.index.astype('int64')
+    return pd.DataFrame({
+        'mes': [_mes_texto(mes) for mes in meses],
+        'solicitudes': conteo.to_numpy()
+    })
+
+
+def _mes_texto(mes):
+    """'AAAA-MM' de un mes codificado como año * 12 + (mes - 1)"""
+    mes = int(mes)
+    return f'{mes // 12:04d}-{mes % 12 + 1:02d}'
+
+
+def _mes_codigo(mes):
+    """Código año * 12 + (mes - 1) de un mes dado como 'AAAA-MM', Period o código"""
+    if isinstance(mes, str):
+        mes = pd.Period(mes, freq='M')
+    if isinstance(mes, pd.Period):
+        return mes.year * 12 + mes.month - 1
+    return mes
+
+
+def _pearson(n, suma_x, suma_y, cuadrados_x, cuadrados_y, productos):
+    """Correlación de Pearson desde sumas sobre las filas con ambos valores"""
+    covarianza = n * productos - suma_x * suma_y
+    varianza = (n * cuadrados_x - suma_x ** 2) * (n * cuadrados_y - suma_y ** 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return covarianza / np.sqrt(np.where(varianza > 0, varianza, np.nan))
+
+
+def _correlacion(n, suma, cuadrados, productos):
+    """Correlación de Pearson por pares a partir de sumas sobre filas completas.
+
+    Las matrices son cuadradas e indexadas por columna: suma[i, j] es la suma
+    de i en las filas donde i y j no son nulos, y de igual forma cuadrados.
+    """
+    covarianza = n * productos - suma * suma.T
+    varianza = (n * cuadrados - suma ** 2) * (n * cuadrados.T - suma.T ** 2)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return covarianza / np.sqrt(varianza.where(varianza > 0))
+
+
+def _cuartiles(histograma, cuantiles):
+    """Cuantiles exactos por grupo (interpolación lineal) desde un histograma.
+
+    histograma es una Serie de conteos indexada por (grupo, valor) y ordenada.
+    """
+    grupos = histograma.index.get_level_values(0)
+    valores = histograma.index.get_level_values(1).to_numpy(dtype='float64')
+    acumulado = np.cumsum(histograma.to_numpy())
+    totales = histograma.groupby(grupos, sort=False).sum()
+    inicio = np.concatenate([[0], np.cumsum(totales.to_numpy())[:-1]])
+    n = totales.to_numpy()
+
+    resultado = {}
+    for q in cuantiles:
+        posicion = q * (n - 1)
+        bajo = np.floor(posicion)
+        a = valores[np.searchsorted(acumulado, inicio + bajo, side='right')]
+        b = valores[np.searchsorted(acumulado, inicio + np.minimum(bajo + 1, n - 1), side='right')]
+        # Misma interpolación que numpy.percentile
+        t = posicion - bajo
+        resultado[q] = np.where(t >= 0.5, b - (b - a) * (1 - t), a + (b - a) * t)
+    return pd.DataFrame(resultado, index=totales.index)
+
+
+def _indice_simple(indice):
+    if isinstance(indice, pd.CategoricalIndex):
+        return pd.Index(np.asarray(indice), name=indice.name)
+    return indice
+
+
+def _sin_categorias(parcial):
+    """Convierte índices categóricos en simples para poder sumar parciales de bloques distintos"""
+    if isinstance(parcial.index, pd.MultiIndex):
+        parcial.index = parcial.index.set_levels([_indice_simple(nivel) for nivel in parcial.index.levels])
+    else:
+        parcial.index = _indice_simple(parcial.index)
+    return parcial
+
+
+def _nivel_texto(nivel, otro):
+    """El nivel en texto si es numérico y el del otro parcial es texto"""
+    if len(otro) and otro.dtype == object and nivel.dtype.kind in 'iuf':
+        return nivel.astype(str)
+    return nivel
+
+
+def _claves_comunes(acumulado, nuevo):
+    """Los dos parciales con claves del mismo tipo en cada nivel.
+
+    Cada bloque convierte sus categorías en números solo si todas lo son
+    (ver esquema._limpiar_categoria): si un bloque trae un grupo_id 'A1',
+    sus grupos quedan en texto y los de los demás bloques pasan a texto.
+    """
+    indices = []
+    for parcial, otro in ((acumulado, nuevo), (nuevo, acumulado)):
+        if isinstance(parcial.index, pd.MultiIndex):
+            niveles = [_nivel_texto(nivel, nivel_otro) for nivel, nivel_otro in zip(parcial.index.levels, otro.index.levels)]
+            cambia = any(nivel is not previo for nivel, previo in zip(niveles, parcial.index.levels))
+            indices.append(parcial.index.set_levels(niveles) if cambia else parcial.index)
+        else:
+            indices.append(_nivel_texto(parcial.index, otro.index))
+    return [parcial if indice is parcial.index else parcial.set_axis(indice)
+            for parcial, indice in zip((acumulado, nuevo), indices)]
+
+
+def _sumar(acumulado, nuevo):
+    if acumulado is None:
+        return nuevo
+    acumulado, nuevo = _claves_comunes(acumulado, nuevo)
+    return acumulado.add(nuevo, fill_value=0)
+
+
+def _sumar_celdas(acumulado, nuevo):
+    """Suma celdas del cubo; a diferencia de add, une también las claves con nulos"""
+    if acumulado is None or acumulado.empty:
+        return nuevo
+    if nuevo.empty:
+        return acumulado
+    celdas = pd.concat(_claves_comunes(acumulado, nuevo))
+    return celdas.groupby(level=list(range(celdas.index.nlevels)), dropna=False).sum()
+
+
+# Acumuladores que no se combinan con _sumar
+_COMBINAR = {'cubo': _sumar_celdas}
+
+
+class _compartida(cached_property):
+    """cached_property que se calcula una sola vez aunque la pidan varios hilos a la vez.
+
+    El candado es del plan (ver PlanAgregacion.__init__): los planes de
+    otros DataFrames calculan la misma columna sin esperarse.
+    """
+
+    def __init__(self, funcion):
+        @wraps(funcion)
+        def calcular(plan):
+            # Se mide aparte: su costo lo paga el primer indicador que la pide
+            with medir(funcion.__name__, 'compartida', filas=len(plan.df)):
+                return funcion(plan)
+        super().__init__(calcular)
+
+    def __get__(self, instancia, propietario=None):
+        if instancia is None:
+            return self
+        # Ya calculado: el valor guardado en la instancia evita este método. No se usa
+        # cached_property.__get__, que en Python < 3.12 toma un candado de la clase
+        valores = instancia.__dict__
+        with instancia._candados[self.attrname]:
+            if self.attrname not in valores:
+                valores[self.attrname] = self.func(instancia)
+            return valores[self.attrname]
+
+
+class PlanAgregacion:
+    """Calcula todos los indicadores compartiendo columnas derivadas y agrupaciones.
+
+    Cada columna derivada (semana, mes, hora, reprobado) y cada clave de
+    agrupación se construye una sola vez y se reutiliza entre indicadores,
+    sin copiar el DataFrame completo. Los resultados coinciden con los
+    métodos individuales de AnalizadorEducativo.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        # Un candado por columna derivada: se calcula una vez por plan aunque la pidan varios hilos
+        self._candados = {nombre: threading.RLock() for clase in type(self).__mro__
+                          for nombre, atributo in vars(clase).items() if isinstance(atributo, _compartida)}
+
+    def _tiene(self, *columnas):
+        return all(col in self.df.columns for col in columnas)
+
+    # --- Columnas derivadas (se calculan una vez) ---
+
+    @_compartida
+    def semana_registro(self):
+        """Año y semana ISO de la fecha de registro"""
+        fechas = self.df['fecha_registro']
+        año = fechas.dt.year.astype('Int64').rename('año_registro')
+        semana = fechas.dt.isocalendar().week.rename('semana_registro')
+        return año, semana
+
+    @_compartida
+    def mes_solicitud(self):
+        """Mes del timestamp codificado como año * 12 + (mes - 1)"""
+        timestamps = self.df['timestamp']
+        return (timestamps.dt.year * 12 + timestamps.dt.month - 1).rename('mes')
+
+    @_compartida
+    def horas_familiares(self):
+        """Accesos de familiares por hora del día (0 a 23), calculando la hora solo en sus filas"""
+        horas = self.df['timestamp'].iloc[self.filas_tipo('familiar')].dt.hour
+        horas = horas.dropna().to_numpy(dtype='int64')
+        return pd.Series(np.bincount(horas, minlength=24), index=pd.RangeIndex(24))
+
+    @_compartida
+    def reprobado(self):
+        """Marca las notas inferiores a 3.0"""
+        return (self.df['nota'] < 3.0).rename('reprobado')
+
+    @_compartida
+    def es_ausente(self):
+        return (self.df['estado_asistencia'] == 'ausente').to_numpy()
+
+    @_compartida
+    def conteo_habilidades(self):
+        """Frecuencia de cada habilidad declarada, normalizada"""
+        return contar_habilidades(self.df['habilidades'])
+
+    # --- Claves de agrupación (se construyen una vez) ---
+
+    @_compartida
+    def codigos_estudiante(self):
+        """Códigos enteros de id_estudiante (-1 para nulos) y sus valores ordenados"""
+        codigos, ids = pd.factorize(self.df['id_estudiante'], sort=True)
+        return codigos, ids
+
+    @_compartida
+    def filas_por_tipo(self):
+        """Posiciones (en orden) de las filas de cada tipo_usuario, desde una sola codificación de la columna"""
+        codigos, tipos = pd.factorize(self.df['tipo_usuario'])
+        return {tipo: np.flatnonzero(codigos == i) for i, tipo in enumerate(tipos)}
+
+    def filas_tipo(self, tipo):
+        return self.filas_por_tipo.get(tipo, np.empty(0, dtype=np.intp))
+
+    @_compartida
+    def por_grupo(self):
+        """Agrupación por grupo_id compartida por los indicadores de grupo"""
+        return self.df.groupby('grupo_id', observed=True)
+
+    @_compartida
+    def media_nota_grupo(self):
+        return self.por_grupo['nota'].mean()
+
+    def _conteo_por_estudiante(self, filas):
+        """Cuenta filas por estudiante dentro de una máscara booleana o de posiciones de fila"""
+        codigos, ids = self.codigos_estudiante
+        seleccion = codigos[filas]
+        return pd.Series(np.bincount(seleccion[seleccion >= 0], minlength=len(ids)), index=ids)
+
+    def _estudiante_nulo(self):
+        codigos, _ = self.codigos_estudiante
+        return bool((codigos[self.filas_tipo('estudiante')] < 0).any())
+
+    # --- Indicadores ---
+
+    def usuarios_nuevos_semana(self):
+        """Calcula usuarios nuevos por semana"""
+        if self._tiene('fecha_registro'):
+            año, semana = self.semana_registro
+            return _tabla_semanas(año.groupby([año, semana]).size())
+        return pd.DataFrame()
+
+    def tipo_usuario_mas_registrado(self):
+        """Analiza distribución de tipos de usuario"""
+        if self._tiene('tipo_usuario'):
+            return _tabla_tipos_usuario(self.df['tipo_usuario'].value_counts())
+        return pd.DataFrame()
+
+    def _completado(self):
+        columnas_existentes = [col for col in COLUMNAS_HOJA_VIDA if col in self.df.columns]
+        return self.df[columnas_existentes].notna().all(axis=1).value_counts()
+
+    def hoja_vida_completa(self):
+        """Analiza completitud de hojas de vida"""
+        if any(col in self.df.columns for col in COLUMNAS_HOJA_VIDA):
+            return _tabla_hoja_vida(self._completado(), len(self.df))
+        return pd.DataFrame()
+
+    def habilidades_mas_frecuentes(self):
+        """Encuentra las habilidades más frecuentes"""
+        if self._tiene('habilidades'):
+            return _tabla_habilidades(self.conteo_habilidades)
+        return pd.DataFrame()
+
+    def consultas_familiares(self):
+        """Analiza consultas familiares a perfiles"""
+        if self._tiene('id_estudiante', 'tipo_usuario', 'timestamp'):
+            codigos, ids = self.codigos_estudiante
+            familiares = codigos[self.filas_tipo('familiar')]
+            consultas = np.bincount(familiares[familiares >= 0], minlength=len(ids))
+            con_consulta = np.flatnonzero(consultas)
+            estudiantes = codigos[self.filas_tipo('estudiante')]
+            estudiante_nulo = int((estudiantes < 0).any())
+            estudiantes = np.flatnonzero(np.bincount(estudiantes[estudiantes >= 0], minlength=len(ids)))
+            # Anti-join sobre códigos enteros: estudiantes sin ninguna fila familiar
+            sin_interaccion = np.isin(estudiantes, con_consulta, assume_unique=True, invert=True)
+            return {
+                'consultas_por_estudiante': pd.DataFrame({
+                    'id_estudiante': ids[con_consulta],
+                    'consultas': consultas[con_consulta]
+                }),
+                # Un id nulo entre los estudiantes cuenta como un estudiante más
+                'estudiantes_sin_interaccion': int(sin_interaccion.sum()) + estudiante_nulo,
+                'total_estudiantes': len(estudiantes) + estudiante_nulo
+            }
+        return {}
+
+    def horarios_acceso_familiares(self):
+        """Analiza horarios de acceso de familiares"""
+        if self._tiene('timestamp', 'tipo_usuario'):
+            return _tabla_horarios(self.horas_familiares)
+        return pd.DataFrame()
+
+    def promedio_notas_grupo(self):
+        """Calcula promedio general de notas por grupo"""
+        if self._tiene('grupo_id', 'nota'):
+            return _tabla_promedio_grupo(self.media_nota_grupo)
+        return pd.DataFrame()
+
+    def materias_mas_reprobaciones(self):
+        """Identifica materias con más reprobaciones"""
+        if self._tiene('materia', 'nota'):
+            reprobaciones_materia = self.reprobado.groupby(self.df['materia'], observed=True).agg(['sum', 'count'])
+            reprobaciones_materia.columns = ['reprobados', 'total_estudiantes']
+            return _tabla_reprobaciones(reprobaciones_materia)
+        return pd.DataFrame()
+
+    def asistencia_promedio_estudiante(self):
+        """Calcula asistencia promedio por estudiante"""
+        if self._tiene('id_estudiante', 'asistencia'):
+            codigos, ids = self.codigos_estudiante
+            medias = self.df['asistencia'].groupby(codigos).mean()
+            medias = medias[medias.index >= 0]
+            return _tabla_asistencia(pd.Series(medias.to_numpy(), index=ids.take(medias.index)))
+        return pd.DataFrame()
+
+    def estudiantes_ausencias_recurrentes(self):
+        """Identifica estudiantes con ausencias recurrentes"""
+        if self._tiene('id_estudiante', 'estado_asistencia'):
+            return _tabla_ausencias(self._conteo_por_estudiante(self.es_ausente))
+        return pd.DataFrame()
+
+    def tipos_apoyo_solicitados(self):
+        """Analiza tipos de apoyo más solicitados"""
+        if self._tiene('tipo_apoyo'):
+            return _tabla_apoyos(self.df['tipo_apoyo'].value_counts())
+        return pd.DataFrame()
+
+    def frecuencia_solicitudes_mes(self):
+        """Analiza frecuencia de solicitudes por mes"""
+        if self._tiene('timestamp'):
+            return _tabla_meses(self.mes_solicitud.groupby(self.mes_solicitud).size())
+        return pd.DataFrame()
+
+    def resumen_estadistico_grupo(self):
+        """Genera resumen estadístico por grupo"""
+        if self._tiene('grupo_id', 'nota', 'asistencia'):
+            # Equivalente a describe() pero con agregaciones vectorizadas por grupo
+            resumen = {}
+            for col in ESTADISTICOS_RESUMEN:
+                grupo = self.por_grupo[col]
+                # Sin grupos con datos unstack no deja columnas de cuartiles
+                cuartiles = grupo.quantile([0.25, 0.5, 0.75]).unstack().reindex(columns=[0.25, 0.5, 0.75])
+                resumen[col] = pd.DataFrame({
+                    'count': grupo.count().astype('float64'),
+                    'mean': self.media_nota_grupo if col == 'nota' else grupo.mean(),
+                    'std': grupo.std(),
+                    'min': grupo.min(),
+                    '25%': cuartiles[0.25],
+                    '50%': cuartiles[0.5],
+                    '75%': cuartiles[0.75],
+                    'max': grupo.max()
+                })
+            return pd.concat(resumen, axis=1).round(2)
+        return pd.DataFrame()
+
+    def correlacion_nota_asistencia(self):
+        """Calcula correlación entre nota y asistencia"""
+        if self._tiene('nota', 'asistencia'):
+            correlacion = self.df[['nota', 'asistencia']].corr().iloc[0, 1]
+            return round(correlacion, 4)
+        return None
+
+    def informacion_dataset(self):
+        """Resumen del dataset para las métricas generales del informe"""
+        return {
+            'registros': len(self.df),
+            'columnas': list(self.df.columns),
+            'nulos': int(self.df.isnull().sum().sum()),
+            'promedio_nota': self.df['nota'].mean() if self._tiene('nota') else None,
+            'promedio_asistencia': self.df['asistencia'].mean() if self._tiene('asistencia') else None,
+        }
+
+    def matriz_correlacion(self):
+        """Matriz de correlación de las columnas numéricas"""
+        return self.df.select_dtypes(include=[np.number]).corr()
+
+    def cubo(self, dimensiones=DIMENSIONES_CUBO):
+        """Estadísticos suficientes por cada combinación de las dimensiones (ver CuboIndicadores).
+
+        Las filas con una dimensión nula forman sus propias celdas, así que
+        los totales del cubo coinciden con los del DataFrame. Cada estadístico
+        se suma por separado sobre el código de celda de cada fila, sin armar
+        una tabla con una fila por registro.
+        """
+        dimensiones = [dim for dim in dimensiones if self._tiene('timestamp' if dim == 'mes' else dim)]
+        if not dimensiones:
+            return pd.DataFrame()
+        df = self.df
+        claves = [self.mes_solicitud if dim == 'mes' else df[dim].rename(dim) for dim in dimensiones]
+        agrupado = df.groupby(claves, observed=True, dropna=False)
+        celda = agrupado.ngroup().to_numpy()
+        filas = agrupado.size()
+        n = len(filas)
+
+        def contar(mascara):
+            return np.bincount(celda[mascara], minlength=n)
+
+        def sumar(mascara, valores):
+            # Sin filas bincount devuelve enteros aunque reciba pesos
+            return np.bincount(celda[mascara], weights=valores[mascara], minlength=n).astype('float64', copy=False)
+
+        estadisticos = {'filas': filas.to_numpy(dtype='int64')}
+        for col in ESTADISTICOS_RESUMEN:
+            if self._tiene(col):
+                valores = df[col].to_numpy(dtype='float64', na_value=np.nan)
+                presentes = ~np.isnan(valores)
+                estadisticos[f'{col}_n'] = contar(presentes)
+                estadisticos[f'{col}_suma'] = sumar(presentes, valores)
+                estadisticos[f'{col}_cuadrados'] = sumar(presentes, valores ** 2)
+        if self._tiene('nota'):
+            estadisticos['reprobados'] = contar(self.reprobado.to_numpy(dtype=bool))
+        if self._tiene('estado_asistencia'):
+            estadisticos['ausencias'] = contar(self.es_ausente)
+        if self._tiene('nota', 'asistencia'):
+            # Sumas sobre las filas con ambos valores, para la correlación por pares
+            nota = df['nota'].to_numpy(dtype='float64', na_value=np.nan)
+            asistencia = df['asistencia'].to_numpy(dtype='float64', na_value=np.nan)
+            pares = ~np.isnan(nota) & ~np.isnan(asistencia)
+            estadisticos.update({'pares_n': contar(pares), 'pares_nota': sumar(pares, nota),
+                                 'pares_asistencia': sumar(pares, asistencia),
+                                 'pares_nota_cuadrados': sumar(pares, nota ** 2),
+                                 'pares_asistencia_cuadrados': sumar(pares, asistencia ** 2),
+                                 'pares_productos': sumar(pares, nota * asistencia)})
+        celdas = pd.DataFrame(estadisticos, index=filas.index)
+        return _sin_categorias(celdas)
+
+    def calcular(self, nombre):
+        """Calcula un indicador (o informacion_dataset, matriz_correlacion) y lo mide en la traza activa"""
+        with medir(nombre, 'analisis', filas=len(self.df)):
+            return getattr(self, nombre)()
+
+    def ejecutar(self, indicadores=INDICADORES, cubo=False):
+        """Calcula los indicadores pedidos y los devuelve en un diccionario (con el cubo si se pide)"""
+        resultados = {nombre: self.calcular(nombre) for nombre in indicadores}
+        resultados['informacion_dataset'] = self.calcular('informacion_dataset')
+        resultados['matriz_correlacion'] = self.calcular('matriz_correlacion')
+        if cubo:
+            resultados['cubo'] = self.calcular('cubo')
+        return resultados
+
+    # --- Estadísticos suficientes para procesamiento por bloques ---
+
+    def parciales(self, aproximado=False):
+        """Conteos y sumas combinables del DataFrame, indexados por clave.
+
+        Sumar los parciales de varios bloques equivale a calcularlos sobre
+        la concatenación de los bloques. Con aproximado=True se omiten los
+        conteos que reemplazan los bocetos (habilidades, apoyos y consultas
+        por estudiante) y los histogramas usan valores cuantizados.
+        """
+        df = self.df
+        sumas = {'nulos': df.isnull().sum()}
+
+        if self._tiene('fecha_registro'):
+            año, semana = self.semana_registro
+            conteo = año.groupby([año, semana]).size()
+            conteo.index = conteo.index.set_levels([nivel.astype('int64') for nivel in conteo.index.levels])
+            sumas['semanas'] = conteo
+        if self._tiene('tipo_usuario'):
+            sumas['tipos_usuario'] = df['tipo_usuario'].value_counts()
+        if any(col in df.columns for col in COLUMNAS_HOJA_VIDA):
+            sumas['hoja_vida'] = self._completado()
+        if self._tiene('habilidades') and not aproximado:
+            sumas['habilidades'] = self.conteo_habilidades.copy()
+        if self._tiene('timestamp', 'tipo_usuario'):
+            sumas['horas_familiares'] = self.horas_familiares
+        if self._tiene('tipo_apoyo') and not aproximado:
+            sumas['apoyos'] = df['tipo_apoyo'].value_counts()
+        if self._tiene('timestamp'):
+            meses = self.mes_solicitud.dropna().astype('int64')
+            sumas['meses'] = meses.groupby(meses).size()
+        if self._tiene('materia', 'nota'):
+            materias = self.reprobado.groupby(df['materia'], observed=True).agg(['sum', 'count'])
+            materias.columns = ['reprobados', 'total_estudiantes']
+            sumas['materias'] = materias
+
+        if self._tiene('id_estudiante'):
+            codigos, ids = self.codigos_estudiante
+            estudiantes = {}
+            if self._tiene('tipo_usuario') and not aproximado:
+                estudiantes['consultas'] = self._conteo_por_estudiante(self.filas_tipo('familiar'))
+                estudiantes['es_estudiante'] = self._conteo_por_estudiante(self.filas_tipo('estudiante'))
+            if self._tiene('estado_asistencia'):
+                estudiantes['ausencias'] = self._conteo_por_estudiante(self.es_ausente)
+            if self._tiene('asistencia'):
+                asistencia = df['asistencia']
+                estudiantes['asistencia_n'] = self._conteo_por_estudiante(asistencia.notna().to_numpy())
+                sumas_asistencia = asistencia.astype('float64').groupby(codigos).sum()
+                sumas_asistencia = sumas_asistencia[sumas_asistencia.index >= 0]
+                estudiantes['asistencia_suma'] = pd.Series(sumas_asistencia.to_numpy(), index=ids.take(sumas_asistencia.index))
+            sumas['estudiantes'] = pd.DataFrame(estudiantes, index=ids)
+
+        if self._tiene('grupo_id'):
+            grupos = {}
+            for col in ESTADISTICOS_RESUMEN:
+                if self._tiene(col):
+                    # Sumas en float64 aunque la columna se cargue como float32
+                    valores = df[col].astype('float64')
+                    por_grupo = valores.groupby(df['grupo_id'], observed=True)
+                    grupos[f'{col}_n'] = por_grupo.count()
+                    grupos[f'{col}_suma'] = por_grupo.sum()
+                    grupos[f'{col}_cuadrados'] = (valores ** 2).groupby(df['grupo_id'], observed=True).sum()
+                    # Histograma de valores por grupo para cuartiles exactos (o con error
+                    # relativo ALFA_CUANTILES y cubetas acotadas en modo aproximado)
+                    histograma = df[col]
+                    if aproximado:
+                        histograma = pd.Series(cuantizar(valores), index=df.index, name=col)
+                    sumas[f'histograma_{col}'] = histograma.groupby([df['grupo_id'], histograma], observed=True).size()
+            sumas['grupos'] = pd.DataFrame(grupos)
+
+        sumas['cubo'] = self.cubo()
+
+        numericas = df.select_dtypes(include=[np.number])
+        presentes = numericas.notna().to_numpy(dtype='float64')
+        valores = numericas.fillna(0).to_numpy(dtype='float64')
+        columnas = numericas.columns
+        for clave, matriz in [('corr_n', presentes.T @ presentes),
+                              ('corr_suma', valores.T @ presentes),
+                              ('corr_cuadrados', (valores ** 2).T @ presentes),
+                              ('corr_productos', valores.T @ valores)]:
+            sumas[clave] = pd.DataFrame(matriz, index=columnas, columns=columnas)
+        return sumas
+
+
+# Archivo y nombres de columna auxiliares del estado guardado en disco
+MANIFIESTO_ESTADO = 'estado.json'
+_VALOR = '__valor__'
+_NIVEL = '__nivel_'
+
+
+class AgregadosParciales:
+    """Agregados parciales combinables para procesar un CSV por bloques.
+
+    Cada bloque aporta conteos, sumas y sumas de cuadrados indexados por
+    grupo, materia, estudiante, semana, mes, franja u habilidad; combinar
+    dos parciales es sumarlos. La memoria depende del número de claves y
+    no del número de filas.
+
+    Con aproximado=True, los estudiantes distintos, las consultas por
+    estudiante, las habilidades y los tipos de apoyo se estiman con bocetos
+    de tamaño fijo (ver aproximado.py) y los cuartiles por grupo salen de
+    histogramas cuantizados; los resultados llevan sus cotas de error en
+    'cotas_aproximadas'.
+    """
+
+    def __init__(self, aproximado=False):
+        self.registros = 0
+        self.columnas = []
+        self.estudiante_nulo = False
+        self.sumas = {}
+        self.bocetos = BocetosIndicadores() if aproximado else None
+
+    @property
+    def aproximado(self):
+        return self.bocetos is not None
+
+    def _tiene(self, *columnas):
+        return all(col in self.columnas for col in columnas)
+
+    def actualizar(self, bloque):
+        """Incorpora un bloque de filas ya limpio"""
+        plan = PlanAgregacion(bloque)
+        self.registros += len(bloque)
+        self.columnas += [col for col in bloque.columns if col not in self.columnas]
+        if plan._tiene('id_estudiante', 'tipo_usuario'):
+            self.estudiante_nulo |= plan._estudiante_nulo()
+        for clave, valor in plan.parciales(self.aproximado).items():
+            self.sumas[clave] = _COMBINAR.get(clave, _sumar)(self.sumas.get(clave), _sin_categorias(valor))
+        if self.aproximado:
+            self.bocetos.actualizar(plan)
+        return self
+
+    def combinar(self, otro):
+        """Suma los agregados de otro parcial (por ejemplo, de otro archivo)"""
+        if self.aproximado != otro.aproximado:
+            raise ValueError('No se pueden combinar agregados exactos con aproximados')
+        if self.aproximado:
+            self.bocetos.combinar(otro.bocetos)
+        self.registros += otro.registros
+        self.columnas += [col for col in otro.columnas if col not in self.columnas]
+        self.estudiante_nulo |= otro.estudiante_nulo
+        for clave, valor in otro.sumas.items():
+            self.sumas[clave] = _COMBINAR.get(clave, _sumar)(self.sumas.get(clave), valor)
+        return self
+
+    def guardar(self, directorio):
+        """Guarda el estado en disco: un archivo Feather por acumulador y un manifiesto.
+
+        Se escribe en un directorio temporal que luego reemplaza al anterior,
+        para que un corte a mitad de escritura no deje un estado mezclado.
+        """
+        temporal = directorio.rstrip(os.sep) + '.tmp'
+        shutil.rmtree(temporal, ignore_errors=True)
+        os.makedirs(temporal)
+        manifiesto = {'registros': self.registros, 'columnas': self.columnas,
+                      'estudiante_nulo': bool(self.estudiante_nulo), 'sumas': {}}
+        for clave, valor in self.sumas.items():
+            es_serie = isinstance(valor, pd.Series)
+            tabla = valor.to_frame(_VALOR) if es_serie else valor
+            niveles = list(tabla.index.names)
+            tabla = tabla.rename_axis([f'{_NIVEL}{i}' for i in range(len(niveles))])
+            tabla.reset_index().to_feather(os.path.join(temporal, f'{clave}.feather'))
+            manifiesto['sumas'][clave] = {'serie': es_serie, 'niveles': niveles}
+        if self.aproximado:
+            manifiesto['bocetos'] = self.bocetos.guardar(temporal)
+        with open(os.path.join(temporal, MANIFIESTO_ESTADO), 'w') as archivo:
+            json.dump(manifiesto, archivo)
+
+        anterior = directorio.rstrip(os.sep) + '.anterior'
+        shutil.rmtree(anterior, ignore_errors=True)
+        if os.path.exists(directorio):
+            os.replace(directorio, anterior)
+        os.replace(temporal, directorio)
+        shutil.rmtree(anterior, ignore_errors=True)
+
+    @classmethod
+    def cargar(cls, directorio):
+        """Reconstruye un estado guardado con guardar()"""
+        with open(os.path.join(directorio, MANIFIESTO_ESTADO), 'r') as archivo:
+            manifiesto = json.load(archivo)
+        parciales = cls()
+        if 'bocetos' in manifiesto:
+            parciales.bocetos = BocetosIndicadores.cargar(directorio, manifiesto['bocetos'])
+        parciales.registros = manifiesto['registros']
+        parciales.columnas = manifiesto['columnas']
+        parciales.estudiante_nulo = manifiesto['estudiante_nulo']
+        for clave, info in manifiesto['sumas'].items():
+            plano = pd.read_feather(os.path.join(directorio, f'{clave}.feather'))
+            niveles = info['niveles']
+            tabla = plano.set_index([f'{_NIVEL}{i}' for i in range(len(niveles))])
+            tabla = tabla.rename_axis(niveles if len(niveles) > 1 else niveles[0])
+            parciales.sumas[clave] = tabla[_VALOR].rename(None) if info['serie'] else tabla
+        return parciales
+
+    def _conteo(self, clave):
+        return self.sumas[clave].astype('int64')
+
+    def _resumen_grupo(self):
+        grupos = self.sumas['grupos']
+        resumen = {}
+        for col in ESTADISTICOS_RESUMEN:
+            n = grupos[f'{col}_n']
+            suma = grupos[f'{col}_suma']
+            with np.errstate(invalid='ignore', divide='ignore'):
+                media = (suma / n).where(n > 0)
+                varianza = ((grupos[f'{col}_cuadrados'] - suma ** 2 / n) / (n - 1)).where(n > 1)
+            histograma = self._conteo(f'histograma_{col}').sort_index()
+            histograma = histograma[histograma > 0]
+            cuartiles = _cuartiles(histograma, [0.25, 0.5, 0.75]).reindex(grupos.index)
+            por_grupo = pd.Series(histograma.index.get_level_values(1), index=histograma.index.get_level_values(0)).groupby(level=0)
+            resumen[col] = pd.DataFrame({
+                'count': n.astype('float64'),
+                'mean': media,
+                'std': np.sqrt(varianza.clip(lower=0)),
+                'min': por_grupo.min().reindex(grupos.index),
+                '25%': cuartiles[0.25],
+                '50%': cuartiles[0.5],
+                '75%': cuartiles[0.75],
+                'max': por_grupo.max().reindex(grupos.index)
+            })
+        return pd.concat(resumen, axis=1).round(2)
+
+    def _matriz_correlacion(self):
+        if 'corr_n' not in self.sumas:
+            # Ningún bloque incorporado: no hay columnas numéricas que correlacionar
+            return pd.DataFrame()
+        numericas = [col for col in self.columnas if col in self.sumas['corr_n'].index]
+        matrices = [self.sumas[clave].reindex(index=numericas, columns=numericas)
+                    for clave in ('corr_n', 'corr_suma', 'corr_cuadrados', 'corr_productos')]
+        return _correlacion(*matrices)
+
+    def finalizar(self):
+        """Calcula los indicadores a partir de los agregados acumulados"""
+        with medir('finalizar', filas=self.registros):
+            return self._finalizar()
+
+    def _finalizar(self):
+        resultados = {nombre: pd.DataFrame() for nombre in INDICADORES}
+        resultados['consultas_familiares'] = {}
+        resultados['correlacion_nota_asistencia'] = None
+
+        if self._tiene('fecha_registro'):
+            resultados['usuarios_nuevos_semana'] = _tabla_semanas(self._conteo('semanas'))
+        if self._tiene('tipo_usuario'):
+            resultados['tipo_usuario_mas_registrado'] = _tabla_tipos_usuario(
+                self._conteo('tipos_usuario'))
+        if any(col in self.columnas for col in COLUMNAS_HOJA_VIDA):
+            resultados['hoja_vida_completa'] = _tabla_hoja_vida(
+                self._conteo('hoja_vida'), self.registros)
+        if self._tiene('habilidades'):
+            resultados['habilidades_mas_frecuentes'] = _tabla_habilidades(
+                self.bocetos.habilidades.top(10) if self.aproximado else self._conteo('habilidades'))
+        if self._tiene('id_estudiante', 'tipo_usuario', 'timestamp') and self.aproximado:
+            resultados['consultas_familiares'] = self._consultas_aproximadas()
+        elif self._tiene('id_estudiante', 'tipo_usuario', 'timestamp'):
+            estudiantes = self.sumas['estudiantes'].sort_index()
+            resultados['consultas_familiares'] = _resultado_consultas(
+                estudiantes['consultas'].astype('int64'), estudiantes['es_estudiante'] > 0, self.estudiante_nulo)
+        if self._tiene('timestamp', 'tipo_usuario'):
+            resultados['horarios_acceso_familiares'] = _tabla_horarios(self._conteo('horas_familiares').sort_index())
+        if self._tiene('grupo_id', 'nota'):
+            grupos = self.sumas['grupos'].sort_index()
+            resultados['promedio_notas_grupo'] = _tabla_promedio_grupo(
+                (grupos['nota_suma'] / grupos['nota_n']).where(grupos['nota_n'] > 0))
+        if self._tiene('materia', 'nota'):
+            resultados['materias_mas_reprobaciones'] = _tabla_reprobaciones(self._conteo('materias').sort_index())
+        if self._tiene('id_estudiante', 'asistencia'):
+            estudiantes = self.sumas['estudiantes'].sort_index()
+            n = estudiantes['asistencia_n']
+            resultados['asistencia_promedio_estudiante'] = _tabla_asistencia(
+                (estudiantes['asistencia_suma'] / n).where(n > 0))
+        if self._tiene('id_estudiante', 'estado_asistencia'):
+            resultados['estudiantes_ausencias_recurrentes'] = _tabla_ausencias(
+                self.sumas['estudiantes']['ausencias'].sort_index().astype('int64'))
+        if self._tiene('tipo_apoyo') and self.aproximado:
+            apoyos = self.bocetos.apoyos
+            resultados['tipos_apoyo_solicitados'] = _tabla_apoyos(apoyos.top(3), apoyos.total)
+        elif self._tiene('tipo_apoyo'):
+            resultados['tipos_apoyo_solicitados'] = _tabla_apoyos(
+                self._conteo('apoyos'))
+        if self._tiene('timestamp'):
+            resultados['frecuencia_solicitudes_mes'] = _tabla_meses(self._conteo('meses'))
+        if self._tiene('grupo_id', 'nota', 'asistencia'):
+            resultados['resumen_estadistico_grupo'] = self._resumen_grupo().sort_index()
+
+        matriz = self._matriz_correlacion()
+        if self._tiene('nota', 'asistencia'):
+            resultados['correlacion_nota_asistencia'] = round(matriz.loc['nota', 'asistencia'], 4)
+
+        # Sin filas el promedio queda en NaN, como la media de pandas
+        with np.errstate(invalid='ignore'):
+            promedios = {col: self.sumas['corr_suma'].loc[col, col] / self.sumas['corr_n'].loc[col, col]
+                         for col in ('nota', 'asistencia') if col in matriz.index}
+        resultados['informacion_dataset'] = {
+            'registros': self.registros,
+            'columnas': list(self.columnas),
+            'nulos': int(self.sumas['nulos'].sum()) if 'nulos' in self.sumas else 0,
+            'promedio_nota': promedios.get('nota'),
+            'promedio_asistencia': promedios.get('asistencia'),
+        }
+        resultados['matriz_correlacion'] = matriz
+        resultados['cubo'] = self.sumas['cubo'].sort_index() if 'cubo' in self.sumas else pd.DataFrame()
+        if self.aproximado:
+            resultados['cotas_aproximadas'] = self.bocetos.cotas()
+        return resultados
+
+    def _consultas_aproximadas(self):
+        """consultas_familiares desde los bocetos: totales por HyperLogLog y solo los
+        estudiantes con más consultas (hasta CANDIDATOS_TOPK).
+
+        Como la tabla no tiene a todos los estudiantes con consultas, su número
+        va aparte en 'estudiantes_con_consultas'.
+        """
+        bocetos = self.bocetos
+        # Sin interacción = |estudiantes ∪ consultados| - |consultados|
+        union = bocetos.estudiantes.union(bocetos.consultados).cardinalidad()
+        sin_interaccion = max(round(union - bocetos.consultados.cardinalidad()), 0)
+        consultas = bocetos.consultas.top(CANDIDATOS_TOPK)
+        return {
+            'consultas_por_estudiante': pd.DataFrame({
+                'id_estudiante': consultas.index,
+                'consultas': consultas.to_numpy()
+            }),
+            'estudiantes_con_consultas': round(bocetos.consultados.cardinalidad()),
+            'estudiantes_sin_interaccion': sin_interaccion + int(self.estudiante_nulo),
+            'total_estudiantes': round(bocetos.estudiantes.cardinalidad()) + int(self.estudiante_nulo)
+        }
+
+
+class CuboIndicadores:
+    """Cubo de estadísticos suficientes por grupo_id, materia, tipo_usuario y mes.
+
+    Cada celda guarda, para las filas de esa combinación, el número de filas,
+    conteo, suma y suma de cuadrados de nota y asistencia, reprobados,
+    ausencias y las sumas por pares de la correlación. Filtrar y agrupar
+    opera sobre las celdas (miles, no millones de filas) y los promedios,
+    porcentajes y correlaciones se derivan de las sumas. Con 'id_estudiante'
+    entre las dimensiones también se obtiene la asistencia por estudiante.
+    """
+
+    def __init__(self, celdas):
+        self.celdas = celdas
+
+    @classmethod
+    def construir(cls, df, dimensiones=DIMENSIONES_CUBO):
+        """Cubo de un DataFrame ya limpio"""
+        return cls(PlanAgregacion(df).cubo(dimensiones))
+
+    @property
+    def dimensiones(self):
+        return [nombre for nombre in self.celdas.index.names if nombre is not None]
+
+    def _tiene(self, *estadisticos):
+        return all(col in self.celdas.columns for col in estadisticos)
+
+    def combinar(self, otro):
+        """Cubo con las celdas de ambos sumadas (por ejemplo, de otro archivo)"""
+        return CuboIndicadores(_sumar_celdas(self.celdas, otro.celdas))
+
+    def valores(self, dimension):
+        """Valores presentes de una dimensión, ordenados ('AAAA-MM' para mes)"""
+        valores = self.celdas.index.get_level_values(dimension).dropna().unique().sort_values()
+        return [_mes_texto(mes) for mes in valores] if dimension == 'mes' else list(valores)
+
+    def filtrar(self, **filtros):
+        """Cubo con las celdas que cumplen los filtros (un valor o una lista por dimensión)"""
+        mascara = np.ones(len(self.celdas), dtype=bool)
+        for dimension, valores in filtros.items():
+            if dimension not in self.dimensiones:
+                raise ValueError(f"El cubo no tiene la dimensión {dimension}")
+            if not isinstance(valores, (list, tuple, set, pd.Index, np.ndarray)):
+                valores = [valores]
+            if dimension == 'mes':
+                valores = [_mes_codigo(mes) for mes in valores]
+            mascara &= self.celdas.index.get_level_values(dimension).isin(valores)
+        return CuboIndicadores(self.celdas[mascara])
+
+    def totales(self, por=()):
+        """Sumas de las celdas agrupadas por las dimensiones de por (una fila si está vacío)"""
+        if not por:
+            return pd.DataFrame([self.celdas.to_numpy().sum(axis=0)], columns=self.celdas.columns)
+        return self.celdas.groupby(level=list(por)).sum()
+
+    def metricas(self, por=()):
+        """Promedios, porcentajes y correlación derivados de las sumas, por las dimensiones de por ('AAAA-MM' para mes)"""
+        totales = self.totales(por)
+        metricas = pd.DataFrame({'registros': totales['filas'].astype('int64')}, index=totales.index)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for col in ESTADISTICOS_RESUMEN:
+                if self._tiene(f'{col}_n'):
+                    n, suma = totales[f'{col}_n'], totales[f'{col}_suma']
+                    metricas[f'promedio_{col}'] = (suma / n).where(n > 0).round(2)
+                    varianza = ((totales[f'{col}_cuadrados'] - suma ** 2 / n) / (n - 1)).where(n > 1)
+                    metricas[f'desviacion_{col}'] = np.sqrt(varianza.clip(lower=0)).round(2)
+            if self._tiene('reprobados'):
+                metricas['porcentaje_reprobacion'] = (totales['reprobados'] / totales['filas'] * 100).round(2)
+            if self._tiene('ausencias'):
+                metricas['ausencias'] = totales['ausencias'].astype('int64')
+        if self._tiene('pares_n'):
+            metricas['correlacion_nota_asistencia'] = np.round(_pearson(
+                totales['pares_n'], totales['pares_nota'], totales['pares_asistencia'],
+                totales['pares_nota_cuadrados'], totales['pares_asistencia_cuadrados'],
+                totales['pares_productos']), 4)
+        if 'mes' in por:
+            metricas = metricas.rename(index=_mes_texto, level='mes' if len(por) > 1 else None)
+        return metricas
+
+    # --- Indicadores del informe calculados desde el cubo ---
+
+    def promedio_notas_grupo(self):
+        """Igual que AnalizadorEducativo.promedio_notas_grupo, sobre las celdas del cubo"""
+        if 'grupo_id' in self.dimensiones and self._tiene('nota_n'):
+            grupos = self.totales(['grupo_id'])
+            return _tabla_promedio_grupo((grupos['nota_suma'] / grupos['nota_n']).where(grupos['nota_n'] > 0))
+        return pd.DataFrame()
+
+    def materias_mas_reprobaciones(self):
+        """Igual que AnalizadorEducativo.materias_mas_reprobaciones, sobre las celdas del cubo"""
+        if 'materia' in self.dimensiones and self._tiene('reprobados'):
+            materias = self.totales(['materia'])[['reprobados', 'filas']].astype('int64')
+            materias.columns = ['reprobados', 'total_estudiantes']
+            return _tabla_reprobaciones(materias)
+        return pd.DataFrame()
+
+    def asistencia_promedio_estudiante(self):
+        """Igual que AnalizadorEducativo.asistencia_promedio_estudiante; requiere la dimensión id_estudiante"""
+        if 'id_estudiante' in self.dimensiones and self._tiene('asistencia_n'):
+            estudiantes = self.totales(['id_estudiante'])
+            n = estudiantes['asistencia_n']
+            return _tabla_asistencia((estudiantes['asistencia_suma'] / n).where(n > 0))
+        return pd.DataFrame()
+
+    def correlacion_nota_asistencia(self):
+        """Igual que AnalizadorEducativo.correlacion_nota_asistencia, sobre las celdas del cubo"""
+        if self._tiene('pares_n'):
+            # Sin celdas las sumas son cero y la correlación queda en NaN, como en pandas
+            pares = self.celdas[['pares_n', 'pares_nota', 'pares_asistencia', 'pares_nota_cuadrados',
+                                 'pares_asistencia_cuadrados', 'pares_productos']].to_numpy().sum(axis=0)
+            return round(float(_pearson(*pares)), 4)
+        return None
@@ -0,0 +1,256 @@
+# almacen.py
+import hashlib
+import io
+import json
+import os
+import re
+import threading
+from collections import defaultdict
+
+import pandas as pd
+import pyarrow as pa
+
+from agregacion import AgregadosParciales
+from esquema import leer_csv, limpiar_categorias
+
+METADATOS = 'metadatos.json'
+ESTADO = 'estado'
+
+# Un candado por directorio para que dos sesiones no anexen a la vez
+_CANDADOS = defaultdict(threading.Lock)
+
+# Columnas que identifican una fila al detectar filas ya guardadas
+COLUMNAS_CLAVE = ['id_estudiante', 'timestamp']
+
+
+class ArchivoDistinto(ValueError):
+    """El archivo no parece del mismo dataset que el almacén: no se anexa"""
+
+
+def nombre_dataset(nombre_archivo):
+    """Nombre de carpeta seguro a partir del nombre del archivo subido"""
+    base = os.path.splitext(os.path.basename(nombre_archivo))[0]
+    return re.sub(r'[^\w-]+', '_', base) or 'dataset'
+
+
+def _huella(contenido):
+    return hashlib.blake2b(contenido, digest_size=16).hexdigest()
+
+
+def _claves(df):
+    """Hash de 64 bits por fila de las columnas clave, independiente del tipo leído"""
+    claves = {}
+    for col in COLUMNAS_CLAVE:
+        if col in df.columns:
+            valores = df[col]
+            if pd.api.types.is_numeric_dtype(valores):
+                claves[col] = valores.astype('float64')
+            elif pd.api.types.is_datetime64_any_dtype(valores):
+                claves[col] = valores
+            else:
+                claves[col] = valores.astype(str)
+    return pd.util.hash_pandas_object(pd.DataFrame(claves), index=False)
+
+
+def _diccionarios_en_texto(esquema):
+    """Esquema con las columnas categóricas como diccionarios de texto.
+
+    Cada parte decide al limpiarse si sus categorías son números (un
+    grupo_id 'A1' en una parte posterior la deja en texto), así que se
+    guardan como texto y vuelven a ser números al leerlas si lo son en
+    toda la columna.
+    """
+    campos = []
+    for campo in esquema:
+        if pa.types.is_dictionary(campo.type):
+            campo = campo.with_type(pa.dictionary(pa.int32(), pa.string()))
+        campos.append(campo)
+    return pa.schema(campos)
+
+
+def _tipos_pandas(tipo):
+    """Las columnas de texto se leen como texto Arrow, sin crear objetos de Python"""
+    if pa.types.is_string(tipo) or pa.types.is_large_string(tipo):
+        return pd.ArrowDtype(tipo)
+    return None
+
+
+class AlmacenColumnar:
+    """Almacén local de un dataset limpio en archivos Arrow IPC con anexado incremental.
+
+    Cada ingesta escribe una parte nueva (los archivos existentes nunca se
+    reescriben) y la lectura mapea las partes en memoria y proyecta solo
+    las columnas pedidas.
+    """
+
+    def __init__(self, directorio):
+        self.directorio = directorio
+        os.makedirs(directorio, exist_ok=True)
+        self.metadatos = self._leer_metadatos()
+        self._estado = None
+
+    def _leer_metadatos(self):
+        ruta = os.path.join(self.directorio, METADATOS)
+        if os.path.exists(ruta):
+            with open(ruta, 'r') as archivo:
+                return json.load(archivo)
+        return {'partes': [], 'filas': 0, 'bytes_ingeridos': 0, 'huella_prefijo': None}
+
+    def _guardar_metadatos(self):
+        ruta = os.path.join(self.directorio, METADATOS)
+        temporal = ruta + '.tmp'
+        with open(temporal, 'w') as archivo:
+            json.dump(self.metadatos, archivo)
+        os.replace(temporal, ruta)
+
+    @property
+    def filas(self):
+        return self.metadatos['filas']
+
+    @property
+    def version(self):
+        """Identifica el contenido actual del almacén (cambia con cada anexado)"""
+        return f"{self.directorio}@{self.filas}"
+
+    # --- Escritura ---
+
+    def _comprobar_columnas(self, df):
+        if self.metadatos['partes']:
+            columnas = self._abrir(self.metadatos['partes'][0]).schema.names
+            if list(df.columns) != columnas:
+                raise ArchivoDistinto(f"El archivo no tiene las mismas columnas que el almacén {self.directorio}")
+
+    def filas_nuevas(self, df, forzar=False):
+        """Filas del DataFrame que aún no están en el almacén.
+
+        Compara la clave (id_estudiante, timestamp) contra las claves ya
+        guardadas, respetando repeticiones: si una clave aparece tres veces
+        en el archivo y dos en el almacén, solo la tercera es nueva. Sin esas
+        columnas se asume que el export crece al final.
+
+        Un archivo que no comparte ninguna clave con el almacén se toma por
+        otro dataset y lanza ArchivoDistinto; forzar lo anexa igual (por
+        ejemplo, un export que trae solo las filas nuevas).
+        """
+        if not self.filas:
+            return df
+        self._comprobar_columnas(df)
+        columnas = [col for col in COLUMNAS_CLAVE if col in df.columns]
+        if not columnas:
+            return df.iloc[self.filas:]
+
+        guardadas = _claves(self.leer(columnas)).value_counts()
+        claves = _claves(df)
+        ocurrencia = claves.groupby(claves.to_numpy()).cumcount().to_numpy()
+        previas = claves.map(guardadas).fillna(0).to_numpy()
+        if len(df) and not forzar and not previas.any():
+            raise ArchivoDistinto(f"El archivo no comparte filas con el almacén {self.directorio}: parece otro dataset")
+        return df[ocurrencia >= previas]
+
+    def _tabla(self, df):
+        tabla = pa.Table.from_pandas(df, preserve_index=False)
+        # Diccionarios uniformes para que las partes se puedan concatenar
+        tabla = tabla.cast(_diccionarios_en_texto(tabla.schema))
+        if self.metadatos['partes']:
+            self._comprobar_columnas(df)
+            tabla = tabla.cast(self._abrir(self.metadatos['partes'][0]).schema)
+        return tabla
+
+    def _escribir(self, nuevas):
+        tabla = self._tabla(nuevas)
+        parte = f"parte-{len(self.metadatos['partes']):06d}.arrow"
+        with pa.OSFile(os.path.join(self.directorio, parte), 'wb') as destino:
+            with pa.ipc.new_file(destino, tabla.schema) as escritor:
+                escritor.write_table(tabla)
+        estado = self.estado()
+        estado.actualizar(nuevas)
+        estado.guardar(os.path.join(self.directorio, ESTADO))
+        # Los metadatos se guardan al final: confirman la parte y el estado
+        self.metadatos['partes'].append(parte)
+        self.metadatos['filas'] += len(nuevas)
+        self._guardar_metadatos()
+        return len(nuevas)
+
+    def anexar(self, df, forzar=False):
+        """Guarda como parte nueva solo las filas que no estaban; devuelve cuántas"""
+        nuevas = self.filas_nuevas(df, forzar)
+        if nuevas.empty:
+            return 0
+        return self._escribir(nuevas)
+
+    def ingerir(self, archivo, limpiar, forzar=False):
+        """Anexa las filas nuevas de un CSV subido (BytesIO); devuelve cuántas.
+
+        Si el archivo empieza con los mismos bytes que la última ingesta (un
+        export que solo crece), se parsea únicamente la parte nueva. Si no,
+        se parsea completo y se anexan solo las filas con claves nuevas
+        (ver filas_nuevas para forzar). limpiar recibe el DataFrame leído y
+        lo devuelve limpio.
+        """
+        with _CANDADOS[os.path.abspath(self.directorio)], archivo.getbuffer() as contenido:
+            self.metadatos = self._leer_metadatos()
+            previos = self.metadatos['bytes_ingeridos']
+            crece = (previos and len(contenido) >= previos
+                     and _huella(contenido[:previos]) == self.metadatos['huella_prefijo'])
+            if crece and len(contenido) == previos:
+                return 0
+            if crece:
+                inicio = bytes(contenido[:min(previos, 1024 ** 2)])
+                cabecera = inicio[:inicio.index(b'\n') + 1]
+                nuevas = limpiar(leer_csv(io.BytesIO(cabecera + bytes(contenido[previos:]))))
+                anexadas = self._escribir(nuevas) if len(nuevas) else 0
+            else:
+                archivo.seek(0)
+                anexadas = self.anexar(limpiar(leer_csv(archivo)), forzar)
+            self.metadatos['bytes_ingeridos'] = len(contenido)
+            self.metadatos['huella_prefijo'] = _huella(contenido)
+            self._guardar_metadatos()
+        return anexadas
+
+    # --- Lectura ---
+
+    def estado(self):
+        """Agregados incrementales de todas las filas del almacén.
+
+        Se actualizan con cada parte nueva, así que los indicadores no
+        requieren releer el historial. Si el estado guardado no corresponde
+        a las filas confirmadas (por ejemplo, tras un corte), se reconstruye.
+        """
+        if self._estado is not None and self._estado.registros == self.filas:
+            return self._estado
+        ruta = os.path.join(self.directorio, ESTADO)
+        estado = None
+        if os.path.exists(ruta):
+            estado = AgregadosParciales.cargar(ruta)
+        if estado is None or estado.registros != self.filas or (self.filas and 'cubo' not in estado.sumas):
+            # Parte por parte (también si el estado es anterior al cubo de indicadores): la memoria depende del tamaño de cada parte
+            estado = AgregadosParciales()
+            for parte in self.metadatos['partes']:
+                estado.actualizar(limpiar_categorias(self._abrir(parte).to_pandas(types_mapper=_tipos_pandas)))
+            if self.filas:
+                estado.guardar(ruta)
+        self._estado = estado
+        return estado
+
+    def _abrir(self, parte):
+        fuente = pa.memory_map(os.path.join(self.directorio, parte), 'r')
+        tabla = pa.ipc.open_file(fuente).read_all()
+        # Las partes anteriores a guardar las categorías como texto pueden tener diccionarios numéricos
+        esquema = _diccionarios_en_texto(tabla.schema)
+        return tabla if esquema.equals(tabla.schema) else tabla.cast(esquema)
+
+    def leer_tabla(self, columnas=None):
+        """Tabla Arrow mapeada en memoria, solo con las columnas pedidas"""
+        tablas = []
+        for parte in self.metadatos['partes']:
+            tabla = self._abrir(parte)
+            if columnas is not None:
+                tabla = tabla.select([col for col in columnas if col in tabla.schema.names])
+            tablas.append(tabla)
+        if not tablas:
+            return pa.table({})
+        return pa.concat_tables(tablas)
+
+    def leer(self, columnas=None):
+        """DataFrame con las columnas pedidas; numéricos y texto sin copias innecesarias"""
+        return limpiar_categorias(self.leer_tabla(columnas).to_pandas(types_mapper=_tipos_pandas))
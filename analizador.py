@@ -0,0 +1,250 @@
+# analizador.py
+import pandas as pd
+from agregacion import INDICADORES, AgregadosParciales, PlanAgregacion, contar_habilidades, top_k
+from esquema import TIPOS_COLUMNAS, aplicar_esquema, leer_csv
+from instrumentacion import medir
+from paralelo import informe_en_paralelo, recolectar
+
+class AnalizadorEducativo:
+    def __init__(self, df):
+        self.df = df
+        self.resultados = {}
+        self.estado = None
+        
+    def limpiar_datos(self):
+        """Limpia y prepara el dataset"""
+        with medir('limpiar_datos', filas=len(self.df)):
+            # Columnas documentadas: tipos declarados y fechas con formato fijo
+            self.df = aplicar_esquema(self.df)
+            
+            # Convertir columnas de fecha si existen
+            columnas_fecha = ['fecha']
+            for col in columnas_fecha:
+                if col in self.df.columns:
+                    try:
+                        self.df[col] = pd.to_datetime(self.df[col], errors='coerce')
+                    except:
+                        pass
+            
+            # Limpiar espacios en strings
+            for col in self.df.select_dtypes(include=['object']).columns:
+                if col not in TIPOS_COLUMNAS:
+                    self.df[col] = self.df[col].astype(str).str.strip()
+            
+        return self.df
+    
+    def usuarios_nuevos_semana(self):
+        """Calcula usuarios nuevos por semana"""
+        if 'fecha_registro' in self.df.columns:
+            df_temp = self.df.copy()
+            df_temp['semana_registro'] = df_temp['fecha_registro'].dt.isocalendar().week
+            df_temp['año_registro'] = df_temp['fecha_registro'].dt.year.astype('Int64')
+            usuarios_semana = df_temp.groupby(['año_registro', 'semana_registro']).size().reset_index(name='usuarios_nuevos')
+            usuarios_semana['semana'] = usuarios_semana['año_registro'].astype(str) + '-S' + usuarios_semana['semana_registro'].astype(str)
+            return usuarios_semana[['semana', 'usuarios_nuevos']]
+        return pd.DataFrame()
+    
+    def tipo_usuario_mas_registrado(self):
+        """Analiza distribución de tipos de usuario"""
+        if 'tipo_usuario' in self.df.columns:
+            distribucion = self.df['tipo_usuario'].value_counts()
+            porcentajes = (self.df['tipo_usuario'].value_counts(normalize=True) * 100).round(2)
+            resultado = pd.DataFrame({
+                'tipo': distribucion.index,
+                'cantidad': distribucion.values,
+                'porcentaje': porcentajes.values
+            })
+            return resultado
+        return pd.DataFrame()
+    
+    def hoja_vida_completa(self):
+        """Analiza completitud de hojas de vida"""
+        # Asumiendo columnas que deberían estar completas
+        columnas_importantes = ['nombre', 'email', 'telefono', 'direccion']
+        columnas_existentes = [col for col in columnas_importantes if col in self.df.columns]
+        
+        if columnas_existentes:
+            df_temp = self.df.copy()
+            df_temp['completado'] = df_temp[columnas_existentes].notna().all(axis=1)
+            estado_hoja_vida = df_temp['completado'].value_counts().reset_index()
+            estado_hoja_vida.columns = ['completado', 'cantidad']
+            estado_hoja_vida['porcentaje'] = (estado_hoja_vida['cantidad'] / len(df_temp) * 100).round(2)
+            return estado_hoja_vida
+        return pd.DataFrame()
+    
+    def habilidades_mas_frecuentes(self):
+        """Encuentra las habilidades más frecuentes"""
+        if 'habilidades' in self.df.columns:
+            # Cada texto distinto se separa una sola vez; conteos por vocabulario
+            conteo = contar_habilidades(self.df['habilidades'])
+            top_habilidades = top_k(conteo, 10).reset_index()
+            top_habilidades.columns = ['habilidad', 'frecuencia']
+            return top_habilidades
+        return pd.DataFrame()
+    
+    def consultas_familiares(self):
+        """Analiza consultas familiares a perfiles"""
+        if all(col in self.df.columns for col in ['id_estudiante', 'tipo_usuario', 'timestamp']):
+            df_familiares = self.df[self.df['tipo_usuario'] == 'familiar']
+            consultas_por_estudiante = df_familiares.groupby('id_estudiante').size().reset_index(name='consultas')
+            
+            # Estudiantes sin interacción
+            todos_estudiantes = self.df[self.df['tipo_usuario'] == 'estudiante']['id_estudiante'].unique()
+            estudiantes_con_consulta = consultas_por_estudiante['id_estudiante'].unique()
+            estudiantes_sin_interaccion = set(todos_estudiantes) - set(estudiantes_con_consulta)
+            
+            return {
+                'consultas_por_estudiante': consultas_por_estudiante,
+                'estudiantes_sin_interaccion': len(estudiantes_sin_interaccion),
+                'total_estudiantes': len(todos_estudiantes)
+            }
+        return {}
+    
+    def horarios_acceso_familiares(self):
+        """Analiza horarios de acceso de familiares"""
+        if all(col in self.df.columns for col in ['timestamp', 'tipo_usuario']):
+            df_familiares = self.df[self.df['tipo_usuario'] == 'familiar'].copy()
+            df_familiares['hora'] = df_familiares['timestamp'].dt.hour
+            df_familiares['franja_horaria'] = pd.cut(df_familiares['hora'], 
+                                                   bins=[0, 6, 12, 18, 24], 
+                                                   labels=['Madrugada', 'Mañana', 'Tarde', 'Noche'])
+            horarios = df_familiares['franja_horaria'].value_counts().reset_index()
+            horarios.columns = ['franja_horaria', 'accesos']
+            return horarios
+        return pd.DataFrame()
+    
+    def promedio_notas_grupo(self):
+        """Calcula promedio general de notas por grupo"""
+        if all(col in self.df.columns for col in ['grupo_id', 'nota']):
+            promedio_grupos = self.df.groupby('grupo_id', observed=False)['nota'].mean().round(2).reset_index()
+            promedio_grupos.columns = ['grupo_id', 'promedio_nota']
+            return promedio_grupos.sort_values('promedio_nota', ascending=False)
+        return pd.DataFrame()
+    
+    def materias_mas_reprobaciones(self):
+        """Identifica materias con más reprobaciones"""
+        if all(col in self.df.columns for col in ['materia', 'nota']):
+            df_temp = self.df.copy()
+            df_temp['reprobado'] = df_temp['nota'] < 3.0
+            reprobaciones_materia = df_temp.groupby('materia', observed=False).agg({
+                'reprobado': ['sum', 'count']
+            }).round(2)
+            reprobaciones_materia.columns = ['reprobados', 'total_estudiantes']
+            reprobaciones_materia = reprobaciones_materia.reset_index()
+            reprobaciones_materia['porcentaje_reprobacion'] = (reprobaciones_materia['reprobados'] / reprobaciones_materia['total_estudiantes'] * 100).round(2)
+            return reprobaciones_materia.sort_values('porcentaje_reprobacion', ascending=False)
+        return pd.DataFrame()
+    
+    def asistencia_promedio_estudiante(self):
+        """Calcula asistencia promedio por estudiante"""
+        if all(col in self.df.columns for col in ['id_estudiante', 'asistencia']):
+            asistencia_estudiantes = self.df.groupby('id_estudiante').agg({
+                'asistencia': 'mean'
+            }).round(2).reset_index()
+            asistencia_estudiantes.columns = ['id_estudiante', 'asistencia_promedio']
+            return asistencia_estudiantes
+        return pd.DataFrame()
+    
+    def estudiantes_ausencias_recurrentes(self):
+        """Identifica estudiantes con ausencias recurrentes"""
+        if all(col in self.df.columns for col in ['id_estudiante', 'estado_asistencia']):
+            ausencias = self.df[self.df['estado_asistencia'] == 'ausente']
+            conteo_ausencias = ausencias.groupby('id_estudiante').size().reset_index(name='ausencias')
+            estudiantes_problema = conteo_ausencias[conteo_ausencias['ausencias'] > 3]
+            return estudiantes_problema.sort_values('ausencias', ascending=False)
+        return pd.DataFrame()
+    
+    def tipos_apoyo_solicitados(self):
+        """Analiza tipos de apoyo más solicitados"""
+        if 'tipo_apoyo' in self.df.columns:
+            apoyos = self.df['tipo_apoyo'].value_counts().reset_index()
+            apoyos.columns = ['tipo_apoyo', 'solicitudes']
+            apoyos['porcentaje'] = (apoyos['solicitudes'] / apoyos['solicitudes'].sum() * 100).round(2)
+            return apoyos.head(3)
+        return pd.DataFrame()
+    
+    def frecuencia_solicitudes_mes(self):
+        """Analiza frecuencia de solicitudes por mes"""
+        if 'timestamp' in self.df.columns:
+            df_temp = self.df.copy()
+            df_temp['mes'] = df_temp['timestamp'].dt.to_period('M')
+            solicitudes_mes = df_temp.groupby('mes').size().reset_index(name='solicitudes')
+            solicitudes_mes['mes'] = solicitudes_mes['mes'].astype(str)
+            return solicitudes_mes
+        return pd.DataFrame()
+    
+    def resumen_estadistico_grupo(self):
+        """Genera resumen estadístico por grupo"""
+        if all(col in self.df.columns for col in ['grupo_id', 'nota', 'asistencia']):
+            resumen = self.df.groupby('grupo_id', observed=False)[['nota', 'asistencia']].describe()
+            return resumen.round(2)
+        return pd.DataFrame()
+    
+    def correlacion_nota_asistencia(self):
+        """Calcula correlación entre nota y asistencia"""
+        if all(col in self.df.columns for col in ['nota', 'asistencia']):
+            correlacion = self.df[['nota', 'asistencia']].corr().iloc[0, 1]
+            return round(correlacion, 4)
+        return None
+    
+    def calcular_indicadores(self, trabajadores=None):
+        """Calcula todos los indicadores en una pasada con agrupaciones compartidas.
+        
+        Con trabajadores, los indicadores se calculan a la vez en un pool de hilos.
+        """
+        if trabajadores:
+            nombres = INDICADORES + ('informacion_dataset', 'matriz_correlacion')
+            self.resultados, _ = recolectar(informe_en_paralelo(self.df, nombres, trabajadores=trabajadores, graficar=False))
+        else:
+            self.resultados = PlanAgregacion(self.df).ejecutar()
+        return self.resultados
+    
+    def iniciar_estado(self):
+        """Crea el estado incremental de los indicadores a partir de self.df (ya limpio)"""
+        self.estado = AgregadosParciales().actualizar(self.df)
+        self.resultados = self.estado.finalizar()
+        return self.resultados
+    
+    def actualizar(self, filas_nuevas):
+        """Actualiza los indicadores con filas nuevas sin recalcular el historial.
+        
+        Solo se procesan las filas nuevas; self.df no se modifica y los
+        resultados corresponden a todas las filas incorporadas al estado.
+        """
+        if self.estado is None:
+            self.estado = AgregadosParciales()
+        self.estado.actualizar(AnalizadorEducativo(filas_nuevas).limpiar_datos())
+        self.resultados = self.estado.finalizar()
+        return self.resultados
+    
+    def guardar_estado(self, directorio):
+        """Guarda el estado incremental para retomarlo en otra ejecución"""
+        self.estado.guardar(directorio)
+    
+    @classmethod
+    def desde_estado(cls, directorio):
+        """Analizador sin filas cargadas que continúa un estado guardado"""
+        analizador = cls(pd.DataFrame())
+        analizador.estado = AgregadosParciales.cargar(directorio)
+        analizador.resultados = analizador.estado.finalizar()
+        return analizador
+    
+    def generar_informe_completo(self, trabajadores=None):
+        """Ejecuta todos los análisis en paralelo y muestra cada sección al terminar"""
+        from interfaz import mostrar_informe_progresivo
+        
+        # Limpiar datos primero
+        self.df = self.limpiar_datos()
+        eventos = informe_en_paralelo(self.df, trabajadores=trabajadores)
+        self.resultados, _ = mostrar_informe_progresivo(eventos)
+        return self.resultados
+    
+    @classmethod
+    def agregar_por_bloques(cls, archivo, filas_por_bloque, aproximado=False):
+        """Lee el CSV por bloques y acumula agregados parciales combinables (aproximados, con bocetos, si se pide)"""
+        parciales = AgregadosParciales(aproximado)
+        for bloque in leer_csv(archivo, chunksize=filas_por_bloque):
+            bloque = cls(bloque).limpiar_datos()
+            with medir('agregar_bloque', filas=len(bloque)):
+                parciales.actualizar(bloque)
+        return parciales
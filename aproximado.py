@@ -0,0 +1,299 @@
+# aproximado.py
+"""Bocetos combinables para el modo aproximado de los agregados por bloques.
+
+- cuantizar: lleva cada valor al representante de su cubeta logarítmica
+  (DDSketch). Un histograma de valores cuantizados da cuantiles con error
+  relativo alfa y tiene un número acotado de cubetas.
+- HyperLogLog: número de valores distintos con error relativo típico (una
+  desviación estándar) de 1.04 / sqrt(2 ** precision). Las cotas que se
+  informan son de DESVIACIONES_HLL desviaciones (99.7 % con tres).
+- TopK: count-min con actualización conservadora más un conjunto acotado de
+  candidatos. Ninguna frecuencia se subestima y el exceso es a lo sumo
+  e / ancho * total con probabilidad 1 - exp(-profundidad).
+
+Todos se combinan sumando o tomando máximos, así que los bocetos de bloques
+o archivos distintos se pueden unir.
+"""
+import json
+import math
+import os
+
+import numpy as np
+import pandas as pd
+
+ALFA_CUANTILES = 0.01
+PRECISION_HLL = 16
+ANCHO_CONTEO = 4096
+# Las consultas por estudiante tienen tantas claves como estudiantes
+ANCHO_CONSULTAS = 65536
+PROFUNDIDAD_CONTEO = 5
+CANDIDATOS_TOPK = 100
+# Desviaciones estándar de las cotas de HyperLogLog (error aproximadamente normal)
+DESVIACIONES_HLL = 3
+
+
+def cuantizar(valores, alfa=ALFA_CUANTILES):
+    """Representante de la cubeta (γ^(i-1), γ^i] de cada valor, con γ = (1 + alfa) / (1 - alfa).
+
+    Cualquier valor de la cubeta está a menos de alfa (relativo) de su
+    representante; el cero y los nulos se conservan.
+    """
+    gamma = (1 + alfa) / (1 - alfa)
+    valores = np.asarray(valores, dtype='float64')
+    absolutos = np.abs(valores)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        indices = np.ceil(np.log(absolutos) / np.log(gamma))
+        representantes = np.sign(valores) * 2 * gamma ** indices / (gamma + 1)
+    return np.where(absolutos > 0, representantes, valores)
+
+
+def _normalizar_claves(claves):
+    """Claves comparables entre bloques: enteros como int64 (también 5.0) y el resto como texto"""
+    claves = pd.Index(claves).dropna()
+    if isinstance(claves, pd.CategoricalIndex):
+        # Por sus valores: una categoría numérica es la misma clave que ese número
+        claves = claves.categories[claves.codes]
+    if claves.dtype.kind == 'f' and (claves == np.floor(claves)).all():
+        return claves.astype('int64')
+    if claves.dtype.kind in 'iub':
+        return claves.astype('int64')
+    return claves.astype(str)
+
+
+def _hash(claves, semilla=0):
+    """Hash de 64 bits, determinista entre procesos, de claves ya normalizadas.
+
+    Los enteros se mezclan con splitmix64 (mucho más rápido que hashear
+    objetos); el texto usa SipHash con una clave por semilla.
+    """
+    if claves.dtype.kind == 'i':
+        with np.errstate(over='ignore'):
+            x = claves.to_numpy().astype('uint64') + np.uint64(semilla + 1) * np.uint64(0x9E3779B97F4A7C15)
+            x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+            x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+            return x ^ (x >> np.uint64(31))
+    clave_hash = f'eduanalytics{semilla:04d}'
+    return pd.util.hash_array(np.asarray(claves, dtype=object), hash_key=clave_hash, categorize=False)
+
+
+def _ceros_iniciales(x):
+    """Ceros a la izquierda de cada entero de 64 bits (x > 0)"""
+    ceros = np.zeros(len(x), dtype='uint8')
+    for bits in (32, 16, 8, 4, 2, 1):
+        arriba_vacio = (x >> np.uint64(64 - bits)) == 0
+        ceros += np.where(arriba_vacio, bits, 0).astype('uint8')
+        x = np.where(arriba_vacio, x << np.uint64(bits), x)
+    return ceros
+
+
+class HyperLogLog:
+    """Cuenta de valores distintos en memoria fija (2 ** precision bytes)"""
+
+    def __init__(self, precision=PRECISION_HLL):
+        self.precision = precision
+        self.registros = np.zeros(2 ** precision, dtype='uint8')
+
+    @property
+    def error_relativo(self):
+        """Error relativo típico: una desviación estándar de la estimación"""
+        return 1.04 / math.sqrt(len(self.registros))
+
+    def cota_relativa(self, desviaciones=DESVIACIONES_HLL):
+        """Error relativo que se supera con probabilidad menor a 1 - probabilidad_cota(desviaciones)"""
+        return desviaciones * self.error_relativo
+
+    def agregar(self, claves):
+        claves = _normalizar_claves(claves).unique()
+        if len(claves) == 0:
+            return self
+        hashes = _hash(claves)
+        indices = (hashes >> np.uint64(64 - self.precision)).astype('int64')
+        # Un bit centinela acota el rango cuando los bits restantes son cero
+        resto = (hashes << np.uint64(self.precision)) | np.uint64(1 << (self.precision - 1))
+        np.maximum.at(self.registros, indices, _ceros_iniciales(resto) + 1)
+        return self
+
+    def combinar(self, otro):
+        self.registros = np.maximum(self.registros, otro.registros)
+        return self
+
+    def union(self, otro):
+        """Boceto de la unión, sin modificar ninguno de los dos"""
+        union = HyperLogLog(self.precision)
+        union.registros = np.maximum(self.registros, otro.registros)
+        return union
+
+    def cardinalidad(self):
+        m = len(self.registros)
+        alfa = 0.7213 / (1 + 1.079 / m)
+        estimacion = alfa * m * m / np.sum(2.0 ** -self.registros.astype('float64'))
+        vacios = int((self.registros == 0).sum())
+        if estimacion <= 2.5 * m and vacios:
+            # Rango bajo: conteo lineal
+            estimacion = m * math.log(m / vacios)
+        return estimacion
+
+
+class TopK:
+    """Frecuencias aproximadas (count-min) y las claves más frecuentes entre un conjunto de candidatos.
+
+    Los candidatos son las `candidatos` claves con mayor estimación vistas
+    hasta ahora; una clave que concentra más de total / candidatos de las
+    apariciones no puede quedar fuera.
+    """
+
+    def __init__(self, ancho=ANCHO_CONTEO, profundidad=PROFUNDIDAD_CONTEO, candidatos=CANDIDATOS_TOPK):
+        self.tabla = np.zeros((profundidad, ancho), dtype='int64')
+        self.total = 0
+        self.maximo_candidatos = candidatos
+        self.candidatos = None
+
+    @property
+    def error_absoluto(self):
+        """Exceso máximo de cualquier estimación, con probabilidad 1 - exp(-profundidad)"""
+        return math.e / self.tabla.shape[1] * self.total
+
+    def _columnas(self, claves):
+        ancho = np.uint64(self.tabla.shape[1])
+        return [(_hash(claves, fila) % ancho).astype('int64') for fila in range(len(self.tabla))]
+
+    def estimar(self, claves):
+        claves = _normalizar_claves(claves)
+        if len(claves) == 0:
+            return pd.Series(dtype='int64')
+        estimaciones = np.min([self.tabla[fila, columnas] for fila, columnas in enumerate(self._columnas(claves))], axis=0)
+        return pd.Series(estimaciones, index=claves)
+
+    def _recortar(self, nuevos):
+        nuevos = pd.Index(nuevos)
+        candidatos = nuevos.unique() if self.candidatos is None else self.candidatos.append(nuevos).unique()
+        if len(candidatos) > self.maximo_candidatos:
+            candidatos = self.estimar(candidatos).nlargest(self.maximo_candidatos).index
+        self.candidatos = candidatos
+
+    def agregar(self, conteo):
+        """Incorpora una Serie de conteos exactos indexada por clave (por ejemplo, de un bloque)"""
+        conteo = conteo[conteo > 0]
+        claves = _normalizar_claves(conteo.index)
+        if len(claves) != len(conteo):
+            conteo = conteo[pd.Index(conteo.index).notna()]
+        valores = conteo.to_numpy(dtype='int64')
+        columnas = self._columnas(claves)
+        # Actualización conservadora: cada celda sube solo hasta la estimación previa más el conteo
+        nuevas = np.min([self.tabla[fila, cols] for fila, cols in enumerate(columnas)], axis=0) + valores
+        for fila, cols in enumerate(columnas):
+            np.maximum.at(self.tabla[fila], cols, nuevas)
+        self.total += int(valores.sum())
+        # Del bloque solo pueden entrar como candidatas sus claves más frecuentes
+        self._recortar(pd.Series(valores, index=claves).nlargest(self.maximo_candidatos).index)
+        return self
+
+    def combinar(self, otro):
+        self.tabla += otro.tabla
+        self.total += otro.total
+        self._recortar(otro.candidatos)
+        return self
+
+    def top(self, k):
+        """Las k claves con mayor frecuencia estimada, de mayor a menor"""
+        if self.candidatos is None:
+            return pd.Series(dtype='int64')
+        estimaciones = self.estimar(self.candidatos).sort_index()
+        return estimaciones.sort_values(ascending=False, kind='stable').head(k)
+
+
+class BocetosIndicadores:
+    """Bocetos de los indicadores con conteos exactos costosos: estudiantes distintos, habilidades,
+    tipos de apoyo y consultas por estudiante"""
+
+    ARCHIVO = 'bocetos.npz'
+
+    def __init__(self):
+        self.estudiantes = HyperLogLog()
+        self.consultados = HyperLogLog()
+        self.habilidades = TopK()
+        self.apoyos = TopK()
+        self.consultas = TopK(ancho=ANCHO_CONSULTAS)
+
+    def _partes(self):
+        return {'estudiantes': self.estudiantes, 'consultados': self.consultados,
+                'habilidades': self.habilidades, 'apoyos': self.apoyos, 'consultas': self.consultas}
+
+    def actualizar(self, plan):
+        """Incorpora un bloque a partir de su PlanAgregacion"""
+        df = plan.df
+        if plan._tiene('id_estudiante', 'tipo_usuario'):
+            consultas = plan._conteo_por_estudiante(plan.filas_tipo('familiar'))
+            estudiantes = plan._conteo_por_estudiante(plan.filas_tipo('estudiante'))
+            self.estudiantes.agregar(estudiantes.index[estudiantes.to_numpy() > 0])
+            self.consultados.agregar(consultas.index[consultas.to_numpy() > 0])
+            self.consultas.agregar(consultas)
+        if plan._tiene('habilidades'):
+            self.habilidades.agregar(plan.conteo_habilidades)
+        if plan._tiene('tipo_apoyo'):
+            self.apoyos.agregar(df['tipo_apoyo'].value_counts())
+        return self
+
+    def combinar(self, otro):
+        for nombre, boceto in self._partes().items():
+            boceto.combinar(otro._partes()[nombre])
+        return self
+
+    def cotas(self):
+        """Cotas de error de los resultados aproximados.
+
+        Las de HyperLogLog (estudiantes, con consultas y sin interacción) se
+        cumplen con probabilidad probabilidad_estudiantes; las de count-min,
+        con probabilidad_conteos; la de cuantiles, siempre.
+        """
+        # Sin interacción es la diferencia de dos estimaciones: se suman sus cotas
+        union = self.estudiantes.union(self.consultados).cardinalidad()
+        sin_interaccion = self.estudiantes.cota_relativa() * (union + self.consultados.cardinalidad())
+        return {
+            'cuantiles_error_relativo': ALFA_CUANTILES,
+            'estudiantes_error_relativo': self.estudiantes.cota_relativa(),
+            'con_consultas_error_relativo': self.consultados.cota_relativa(),
+            'sin_interaccion_error_absoluto': sin_interaccion,
+            'probabilidad_estudiantes': probabilidad_cota(DESVIACIONES_HLL),
+            'habilidades_error_absoluto': self.habilidades.error_absoluto,
+            'apoyos_error_absoluto': self.apoyos.error_absoluto,
+            'consultas_error_absoluto': self.consultas.error_absoluto,
+            'probabilidad_conteos': 1 - math.exp(-PROFUNDIDAD_CONTEO),
+        }
+
+    def guardar(self, directorio):
+        """Registros y tablas en un .npz; totales y candidatos en el JSON que se devuelve"""
+        arreglos, datos = {}, {}
+        for nombre, boceto in self._partes().items():
+            if isinstance(boceto, HyperLogLog):
+                arreglos[nombre] = boceto.registros
+            else:
+                arreglos[nombre] = boceto.tabla
+                candidatos = [] if boceto.candidatos is None else boceto.candidatos.tolist()
+                datos[nombre] = {'total': boceto.total, 'candidatos': candidatos}
+        np.savez(os.path.join(directorio, self.ARCHIVO), **arreglos)
+        return datos
+
+    @classmethod
+    def cargar(cls, directorio, datos):
+        bocetos = cls()
+        with np.load(os.path.join(directorio, cls.ARCHIVO)) as arreglos:
+            for nombre, boceto in bocetos._partes().items():
+                if isinstance(boceto, HyperLogLog):
+                    boceto.registros = arreglos[nombre]
+                else:
+                    boceto.tabla = arreglos[nombre]
+                    boceto.total = datos[nombre]['total']
+                    if datos[nombre]['candidatos']:
+                        boceto.candidatos = _normalizar_claves(datos[nombre]['candidatos'])
+        return bocetos
+
+
+def probabilidad_cota(desviaciones):
+    """Probabilidad de que un error normal quede dentro de ±desviaciones desviaciones estándar"""
+    return math.erf(desviaciones / math.sqrt(2))
+
+
+def descripcion_cotas(cotas):
+    """Texto corto con las cotas de error, para mostrar junto a un informe aproximado"""
+    return json.dumps({clave: round(valor, 4) for clave, valor in cotas.items()}, ensure_ascii=False)
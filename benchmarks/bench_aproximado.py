@@ -0,0 +1,103 @@
+# benchmarks/bench_aproximado.py
+"""Compara los agregados por bloques exactos contra el modo aproximado: tiempo, tamaño del estado y error.
+
+Uso: python benchmarks/bench_aproximado.py --filas 1000000 --filas-por-bloque 200000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import AgregadosParciales  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import bloques  # noqa: E402
+
+
+def tamano_estado(parciales):
+    """Bytes de los acumuladores y, en modo aproximado, de los bocetos"""
+    total = 0
+    for valor in parciales.sumas.values():
+        uso = valor.memory_usage(index=True, deep=True)
+        total += int(uso.sum()) if isinstance(uso, pd.Series) else int(uso)
+    if parciales.aproximado:
+        for boceto in parciales.bocetos._partes().values():
+            total += boceto.registros.nbytes if hasattr(boceto, 'registros') else boceto.tabla.nbytes
+    return total
+
+
+def agregar(filas, filas_por_bloque, aproximado, **opciones):
+    parciales = AgregadosParciales(aproximado)
+    inicio = time.perf_counter()
+    for bloque in bloques(filas, filas_por_bloque=filas_por_bloque, **opciones):
+        parciales.actualizar(AnalizadorEducativo(bloque).limpiar_datos())
+    resultados = parciales.finalizar()
+    return resultados, time.perf_counter() - inicio, tamano_estado(parciales)
+
+
+def errores(exacto, aproximado):
+    """Error observado de cada resultado aproximado frente al exacto"""
+    consultas_e, consultas_a = exacto['consultas_familiares'], aproximado['consultas_familiares']
+    errores = {
+        'total_estudiantes': abs(consultas_a['total_estudiantes'] - consultas_e['total_estudiantes'])
+        / max(consultas_e['total_estudiantes'], 1),
+        'estudiantes_con_consultas': abs(consultas_a['estudiantes_con_consultas'] - len(consultas_e['consultas_por_estudiante']))
+        / max(len(consultas_e['consultas_por_estudiante']), 1),
+        'estudiantes_sin_interaccion': abs(consultas_a['estudiantes_sin_interaccion'] - consultas_e['estudiantes_sin_interaccion']),
+    }
+
+    resumen_e, resumen_a = exacto['resumen_estadistico_grupo'], aproximado['resumen_estadistico_grupo']
+    cuantiles = [(col, estadistico) for col in resumen_e.columns.levels[0]
+                 for estadistico in ('min', '25%', '50%', '75%', 'max')]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        relativo = ((resumen_a[cuantiles] - resumen_e[cuantiles]).abs() / resumen_e[cuantiles].abs())
+    errores['cuantiles_relativo'] = float(np.nanmax(relativo.to_numpy()))
+
+    for nombre, etiqueta, valor in [('habilidades_mas_frecuentes', 'habilidad', 'frecuencia'),
+                                    ('tipos_apoyo_solicitados', 'tipo_apoyo', 'solicitudes')]:
+        unidos = exacto[nombre].merge(aproximado[nombre], on=etiqueta, how='outer', suffixes=('_e', '_a'))
+        errores[f'{nombre}_absoluto'] = float((unidos[f'{valor}_a'] - unidos[f'{valor}_e']).abs().max())
+        errores[f'{nombre}_mismas_claves'] = set(exacto[nombre][etiqueta]) == set(aproximado[nombre][etiqueta])
+
+    por_estudiante = consultas_e['consultas_por_estudiante'].set_index('id_estudiante')['consultas']
+    estimadas = consultas_a['consultas_por_estudiante'].set_index('id_estudiante')['consultas']
+    reales = por_estudiante.reindex(estimadas.index.astype(por_estudiante.index.dtype), fill_value=0).to_numpy()
+    errores['consultas_absoluto'] = int((estimadas.to_numpy() - reales).max()) if len(estimadas) else 0
+    return errores
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=[1_000_000])
+    parser.add_argument('--filas-por-bloque', type=int, default=200_000)
+    parser.add_argument('--filas-por-estudiante', type=int, default=10)
+    args = parser.parse_args()
+
+    for filas in args.filas:
+        opciones = {'filas_por_estudiante': args.filas_por_estudiante}
+        exacto, t_exacto, b_exacto = agregar(filas, args.filas_por_bloque, False, **opciones)
+        aproximado, t_aproximado, b_aproximado = agregar(filas, args.filas_por_bloque, True, **opciones)
+        print(f'\n{filas} filas: exacto {t_exacto:.2f} s, {b_exacto / 1024 ** 2:.1f} MB de estado; '
+              f'aproximado {t_aproximado:.2f} s, {b_aproximado / 1024 ** 2:.1f} MB de estado')
+        cotas = aproximado['cotas_aproximadas']
+        print(f"{'medida':<45} {'observado':>12} {'cota':>12}")
+        cota_de = {
+            'total_estudiantes': cotas['estudiantes_error_relativo'],
+            'estudiantes_con_consultas': cotas['con_consultas_error_relativo'],
+            'estudiantes_sin_interaccion': cotas['sin_interaccion_error_absoluto'],
+            'cuantiles_relativo': cotas['cuantiles_error_relativo'],
+            'habilidades_mas_frecuentes_absoluto': cotas['habilidades_error_absoluto'],
+            'tipos_apoyo_solicitados_absoluto': cotas['apoyos_error_absoluto'],
+            'consultas_absoluto': cotas['consultas_error_absoluto'],
+        }
+        for medida, valor in errores(exacto, aproximado).items():
+            cota = cota_de.get(medida)
+            print(f"{medida:<45} {valor:>12.4g} {'' if cota is None else f'{cota:.4g}':>12}")
+
+
+if __name__ == '__main__':
+    main()
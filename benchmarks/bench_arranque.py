@@ -0,0 +1,79 @@
+# benchmarks/bench_arranque.py
+"""Mide el arranque en frío: importaciones por etapa y primer pintado de la página, cada uno en un proceso nuevo.
+
+Uso: python benchmarks/bench_arranque.py --repeticiones 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos pesados cuya presencia se reporta al momento del primer pintado
+PESADOS = ['pandas', 'numpy', 'pyarrow', 'matplotlib', 'seaborn']
+
+# Cada etapa se importa después de la anterior: el tiempo es lo que agrega
+IMPORTACIONES = '''
+import json, sys, time
+sys.path.insert(0, {raiz!r})
+tiempos = {{}}
+def etapa(nombre, codigo):
+    inicio = time.perf_counter()
+    exec(codigo, globals())
+    tiempos[nombre] = time.perf_counter() - inicio
+etapa('streamlit', 'import streamlit')
+etapa('app (encabezado)', 'import app')
+etapa('interfaz (pila de análisis)', 'import interfaz')
+etapa('primer gráfico (matplotlib)', 'import graficos; graficos._figura((1, 1))')
+etapa('heatmap (seaborn)', 'import seaborn')
+print(json.dumps(tiempos))
+'''
+
+# Corre app.py con AppTest y anota cuándo se pinta el título y qué módulos pesados había
+PINTADO = '''
+import json, os, sys, time
+os.chdir({raiz!r})
+sys.path.insert(0, {raiz!r})
+inicio = time.perf_counter()
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+marcas = {{}}
+titulo = st.title
+def title(*args, **kwargs):
+    marcas.setdefault('primer_pintado', time.perf_counter() - inicio)
+    marcas.setdefault('cargados', [m for m in {pesados!r} if m in sys.modules])
+    return titulo(*args, **kwargs)
+st.title = title
+AppTest.from_file('app.py', default_timeout=120).run()
+marcas['pagina_completa'] = time.perf_counter() - inicio
+print(json.dumps(marcas))
+'''
+
+
+def en_proceso_nuevo(codigo):
+    salida = subprocess.run([sys.executable, '-c', codigo], capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    importaciones = [en_proceso_nuevo(IMPORTACIONES.format(raiz=RAIZ)) for _ in range(args.repeticiones)]
+    print(f"{'importación':<32} {'mediana (s)':>12}")
+    for nombre in importaciones[0]:
+        print(f'{nombre:<32} {statistics.median(t[nombre] for t in importaciones):>12.3f}')
+
+    pintados = [en_proceso_nuevo(PINTADO.format(raiz=RAIZ, pesados=PESADOS)) for _ in range(args.repeticiones)]
+    print(f"\n{'página (desde el inicio del proceso)':<40} {'mediana (s)':>12}")
+    for nombre in ['primer_pintado', 'pagina_completa']:
+        print(f'{nombre:<40} {statistics.median(p[nombre] for p in pintados):>12.3f}')
+    print(f"cargados al primer pintado: {', '.join(pintados[0]['cargados']) or 'ninguno'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_cubo.py
+"""Compara filtrar el DataFrame y recalcular contra consultar el cubo de indicadores.
+
+Uso: python benchmarks/bench_cubo.py --filas 1000000 --consultas 50
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import CuboIndicadores, PlanAgregacion  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+
+DERIVADOS = ['promedio_notas_grupo', 'materias_mas_reprobaciones', 'correlacion_nota_asistencia']
+
+
+def filtros_al_azar(cubo, consultas, semilla=0):
+    """Filtros con uno o dos valores de entre una y tres dimensiones"""
+    rng = np.random.default_rng(semilla)
+    valores = {dimension: cubo.valores(dimension) for dimension in cubo.dimensiones}
+    filtros = []
+    for _ in range(consultas):
+        dimensiones = rng.choice(cubo.dimensiones, rng.integers(1, 4), replace=False)
+        filtros.append({dimension: list(rng.choice(valores[dimension], min(2, len(valores[dimension])), replace=False))
+                        for dimension in dimensiones})
+    return filtros
+
+
+def con_dataframe(datos, filtros):
+    df, meses = datos
+    mascara = np.ones(len(df), dtype=bool)
+    for dimension, valores in filtros.items():
+        columna = meses if dimension == 'mes' else df[dimension]
+        mascara &= columna.isin(valores).to_numpy()
+    plan = PlanAgregacion(df[mascara])
+    return [getattr(plan, nombre)() for nombre in DERIVADOS]
+
+
+def con_cubo(cubo, filtros):
+    filtrado = cubo.filtrar(**filtros)
+    return [getattr(filtrado, nombre)() for nombre in DERIVADOS]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=[1_000_000])
+    parser.add_argument('--consultas', type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'celdas':>8} {'construir (s)':>13} {'DataFrame (ms)':>14} {'cubo (ms)':>10}")
+    for filas in args.filas:
+        df = AnalizadorEducativo(generar_datos(filas)).limpiar_datos()
+        inicio = time.perf_counter()
+        cubo = CuboIndicadores.construir(df)
+        construir = time.perf_counter() - inicio
+
+        filtros = filtros_al_azar(cubo, args.consultas)
+        tiempos = {}
+        # El mes de cada fila se calcula una vez, fuera del tiempo de las consultas
+        meses = df['timestamp'].dt.strftime('%Y-%m')
+        for nombre, funcion, datos in [('df', con_dataframe, (df, meses)), ('cubo', con_cubo, cubo)]:
+            inicio = time.perf_counter()
+            for filtro in filtros:
+                funcion(datos, filtro)
+            tiempos[nombre] = (time.perf_counter() - inicio) / len(filtros) * 1000
+        print(f"{filas:>10} {len(cubo.celdas):>8} {construir:>13.2f} {tiempos['df']:>14.1f} {tiempos['cubo']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
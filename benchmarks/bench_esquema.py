@@ -0,0 +1,61 @@
+# benchmarks/bench_esquema.py
+"""Compara carga con inferencia de tipos contra el esquema declarado.
+
+Uso: python benchmarks/bench_esquema.py --filas 1000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import PlanAgregacion  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from esquema import leer_csv  # noqa: E402
+
+
+def cargar_con_inferencia(ruta):
+    """Carga y limpieza tal como se hacían antes de declarar el esquema"""
+    df = pd.read_csv(ruta)
+    for col in ['fecha_registro', 'timestamp', 'fecha']:
+        if col in df.columns:
+            df[col] = pd.to_datetime(df[col], errors='coerce')
+    for col in df.select_dtypes(include=['object']).columns:
+        df[col] = df[col].astype(str).str.strip()
+    return df
+
+
+def cargar_con_esquema(ruta):
+    return AnalizadorEducativo(leer_csv(ruta)).limpiar_datos()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, 'datos.csv')
+        generar_datos(args.filas).to_csv(ruta, index=False)
+
+        print(f"{'carga':<12} {'carga (s)':>10} {'bytes/fila':>12} {'memoria (MB)':>13} {'indicadores (s)':>16}")
+        for nombre, cargar in [('inferencia', cargar_con_inferencia), ('esquema', cargar_con_esquema)]:
+            inicio = time.perf_counter()
+            df = cargar(ruta)
+            carga = time.perf_counter() - inicio
+
+            memoria = df.memory_usage(deep=True).sum()
+            inicio = time.perf_counter()
+            PlanAgregacion(df).ejecutar()
+            indicadores = time.perf_counter() - inicio
+            print(f'{nombre:<12} {carga:>10.2f} {memoria / len(df):>12.0f} {memoria / 1024 ** 2:>13.1f} {indicadores:>16.2f}')
+            del df
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# benchmarks/bench_habilidades.py
+"""Compara split/explode/value_counts contra contar_habilidades + top_k (tiempo y memoria pico).
+
+Uso: python benchmarks/bench_habilidades.py --filas 1000000 5000000
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import contar_habilidades, top_k  # noqa: E402
+from bench_plan_agregacion import medir  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+
+
+def con_explode(habilidades):
+    tokens = habilidades.dropna().str.split(',').explode()
+    return tokens.str.strip().str.lower().value_counts().head(10)
+
+
+def con_vocabulario(habilidades):
+    return top_k(contar_habilidades(habilidades), 10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=[1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'camino':<22} {'tiempo (s)':>10} {'pico (MB)':>10}")
+    for filas in args.filas:
+        habilidades = generar_datos(filas)['habilidades']
+        for nombre, funcion, entrada in [('explode', con_explode, habilidades),
+                                         ('vocabulario', con_vocabulario, habilidades),
+                                         ('vocabulario (categ.)', con_vocabulario, habilidades.astype('category'))]:
+            segundos, pico = medir(funcion, entrada)
+            print(f'{filas:>10} {nombre:<22} {segundos:>10.2f} {pico:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
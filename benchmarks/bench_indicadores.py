@@ -0,0 +1,195 @@
+# benchmarks/bench_indicadores.py
+"""Mide la carga del CSV, limpiar_datos y cada uno de los 14 indicadores por separado.
+
+Uso: python benchmarks/bench_indicadores.py --filas 10000 1000000 10000000
+     python benchmarks/bench_indicadores.py --comparar resultados/abc1234.json resultados/def5678.json
+
+Los CSV sintéticos se generan una vez en --datos y se reutilizan. Cada etapa
+registra el mejor tiempo de --repeticiones ejecuciones y el RSS pico del
+proceso durante la etapa. El resultado se guarda en JSON
+(benchmarks/resultados/<commit>.json por defecto) para comparar commits.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from agregacion import INDICADORES  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import escribir_csv  # noqa: E402
+from esquema import leer_csv  # noqa: E402
+from instrumentacion import memoria_rss  # noqa: E402
+
+DIRECTORIO = os.path.dirname(os.path.abspath(__file__))
+DATOS = os.path.join(DIRECTORIO, 'datos')
+RESULTADOS = os.path.join(DIRECTORIO, 'resultados')
+
+# Cociente de tiempo a partir del cual --comparar marca una regresión
+UMBRAL_REGRESION = 1.10
+
+
+class PicoRSS:
+    """RSS pico del proceso dentro del bloque with, muestreando memoria_rss.
+
+    Donde no existe /proc, memoria_rss es ru_maxrss: el pico de todo el
+    proceso y no solo del bloque.
+    """
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.pico = 0
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, daemon=True)
+
+    def _muestrear(self):
+        while not self._detener.wait(self.intervalo):
+            self.pico = max(self.pico, memoria_rss())
+
+    def __enter__(self):
+        self.pico = memoria_rss()
+        self._hilo.start()
+        return self
+
+    def __exit__(self, *excepcion):
+        self._detener.set()
+        self._hilo.join()
+        self.pico = max(self.pico, memoria_rss())
+        return False
+
+    @property
+    def megas(self):
+        return self.pico / 1024 ** 2
+
+
+def medir(funcion, repeticiones, preparar=lambda: ()):
+    """Mejor tiempo de varias ejecuciones y RSS pico de la última; preparar queda fuera del tiempo"""
+    mejor, pico = float('inf'), 0.0
+    for _ in range(repeticiones):
+        argumentos = preparar()
+        gc.collect()
+        with PicoRSS() as rss:
+            inicio = time.perf_counter()
+            funcion(*argumentos)
+            segundos = time.perf_counter() - inicio
+        mejor, pico = min(mejor, segundos), rss.megas
+    return {'segundos': mejor, 'rss_pico_mb': pico}
+
+
+def ruta_datos(filas, directorio=DATOS, semilla=0):
+    """CSV sintético de filas filas, generado solo si no existe"""
+    ruta = os.path.join(directorio, f'sinteticos_{filas}_{semilla}.csv')
+    if not os.path.exists(ruta):
+        os.makedirs(directorio, exist_ok=True)
+        escribir_csv(ruta + '.tmp', filas, semilla)
+        os.replace(ruta + '.tmp', ruta)
+    return ruta
+
+
+def medir_tamano(ruta, repeticiones):
+    """Tiempos de lectura, limpieza y de cada indicador sobre un CSV"""
+    etapas = {'lectura_csv': medir(leer_csv, repeticiones, lambda: (ruta,))}
+    crudo = leer_csv(ruta)
+    etapas['limpiar_datos'] = medir(lambda analizador: analizador.limpiar_datos(), repeticiones,
+                                    lambda: (AnalizadorEducativo(crudo.copy()),))
+    analizador = AnalizadorEducativo(crudo)
+    analizador.limpiar_datos()
+    del crudo
+    for nombre in INDICADORES:
+        etapas[nombre] = medir(getattr(analizador, nombre), repeticiones)
+    return {'filas': len(analizador.df), 'bytes_csv': os.path.getsize(ruta), 'etapas': etapas}
+
+
+def _git(*argumentos):
+    try:
+        return subprocess.run(['git', *argumentos], cwd=RAIZ, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def entorno():
+    """Metadatos de la corrida para poder comparar resultados entre commits y máquinas"""
+    return {
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'cambios_sin_commit': bool(_git('status', '--porcelain', '--untracked-files=no')),
+        'fecha': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'plataforma': platform.platform(),
+        'cpus': os.cpu_count(),
+    }
+
+
+def comparar(base, actual, umbral=UMBRAL_REGRESION):
+    """Imprime el cociente actual/base por etapa y devuelve cuántas etapas empeoraron"""
+    with open(base) as archivo:
+        base = json.load(archivo)
+    with open(actual) as archivo:
+        actual = json.load(archivo)
+    print(f"base {base['commit']} ({base['fecha']}) -> actual {actual['commit']} ({actual['fecha']})")
+    print(f"{'filas':>10} {'etapa':<36} {'base (s)':>9} {'actual (s)':>10} {'cociente':>9} {'RSS (MB)':>17}")
+    regresiones = 0
+    for filas, medicion in actual['tamanos'].items():
+        anteriores = base['tamanos'].get(filas)
+        if anteriores is None:
+            continue
+        for etapa, valores in medicion['etapas'].items():
+            previo = anteriores['etapas'].get(etapa)
+            if previo is None:
+                continue
+            cociente = valores['segundos'] / previo['segundos'] if previo['segundos'] else float('inf')
+            marca = '  <- regresión' if cociente > umbral else ''
+            regresiones += cociente > umbral
+            print(f"{filas:>10} {etapa:<36} {previo['segundos']:>9.3f} {valores['segundos']:>10.3f} "
+                  f"{cociente:>8.2f}x {previo['rss_pico_mb']:>8.0f}->{valores['rss_pico_mb']:<8.0f}{marca}")
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--repeticiones', type=int, default=3)
+    parser.add_argument('--datos', default=DATOS, help='Directorio donde se generan y reutilizan los CSV')
+    parser.add_argument('--salida', default=None, help='JSON de salida (por defecto resultados/<commit>.json)')
+    parser.add_argument('--comparar', nargs='+', metavar='JSON',
+                        help='Compara BASE contra ACTUAL (o contra una corrida nueva si solo se da BASE)')
+    parser.add_argument('--umbral', type=float, default=UMBRAL_REGRESION)
+    args = parser.parse_args()
+
+    if args.comparar and len(args.comparar) == 2:
+        sys.exit(1 if comparar(*args.comparar, umbral=args.umbral) else 0)
+
+    corrida = dict(entorno(), repeticiones=args.repeticiones, tamanos={})
+    print(f"{'filas':>10} {'etapa':<36} {'tiempo (s)':>10} {'RSS pico (MB)':>14}")
+    for filas in args.filas:
+        medicion = medir_tamano(ruta_datos(filas, args.datos), args.repeticiones)
+        corrida['tamanos'][str(filas)] = medicion
+        for etapa, valores in medicion['etapas'].items():
+            print(f"{filas:>10} {etapa:<36} {valores['segundos']:>10.3f} {valores['rss_pico_mb']:>14.0f}")
+
+    salida = args.salida or os.path.join(RESULTADOS, f"{corrida['commit'] or 'sin_commit'}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(salida)), exist_ok=True)
+    with open(salida, 'w') as archivo:
+        json.dump(corrida, archivo, indent=2)
+    print(f'\nResultados en {salida}')
+
+    if args.comparar:
+        print()
+        sys.exit(1 if comparar(args.comparar[0], salida, umbral=args.umbral) else 0)
+
+
+if __name__ == '__main__':
+    main()
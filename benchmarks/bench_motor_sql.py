@@ -0,0 +1,89 @@
+# benchmarks/bench_motor_sql.py
+"""Compara los indicadores en pandas (referencia) contra el motor SQL y verifica que coincidan.
+
+Uso: python benchmarks/bench_motor_sql.py --filas 1000000 --trabajadores 4
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import PlanAgregacion  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import escribir_csv, generar_datos  # noqa: E402
+from esquema import leer_csv  # noqa: E402
+from motor_sql import MotorSQL, diferencias, motor_por_defecto  # noqa: E402
+
+
+def casos_borde(directorio):
+    """CSV chicos que el camino de pandas y el SQL deben resolver igual: solo encabezado y grupo_id vacío"""
+    datos = generar_datos(2_000)
+    solo_encabezado = os.path.join(directorio, 'solo_encabezado.csv')
+    datos.iloc[:0].to_csv(solo_encabezado, index=False)
+    sin_grupo = os.path.join(directorio, 'sin_grupo.csv')
+    datos.assign(grupo_id=None).to_csv(sin_grupo, index=False)
+    return {'solo encabezado': solo_encabezado, 'grupo_id vacío': sin_grupo}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=[1_000_000])
+    parser.add_argument('--motor', choices=['duckdb', 'sqlite'], default=motor_por_defecto())
+    parser.add_argument('--trabajadores', type=int, default=4)
+    parser.add_argument('--escanear', action='store_true', help='Con DuckDB, consulta el CSV sin cargarlo')
+    args = parser.parse_args()
+
+    con_diferencias = False
+    with tempfile.TemporaryDirectory() as directorio:
+        for filas in args.filas:
+            ruta = escribir_csv(os.path.join(directorio, f'datos_{filas}.csv'), filas)
+
+            inicio = time.perf_counter()
+            df = AnalizadorEducativo(leer_csv(ruta)).limpiar_datos()
+            carga_pandas = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            referencia = PlanAgregacion(df).ejecutar()
+            indicadores_pandas = time.perf_counter() - inicio
+            del df
+
+            inicio = time.perf_counter()
+            with MotorSQL.desde_csv(ruta, escanear=args.escanear, motor=args.motor) as motor:
+                carga_sql = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                resultados = motor.ejecutar()
+                indicadores_sql = time.perf_counter() - inicio
+                inicio = time.perf_counter()
+                motor.ejecutar(trabajadores=args.trabajadores)
+                indicadores_paralelo = time.perf_counter() - inicio
+
+            print(f'\n{filas} filas')
+            print(f"{'camino':<28} {'carga (s)':>10} {'indicadores (s)':>16}")
+            print(f"{'pandas':<28} {carga_pandas:>10.2f} {indicadores_pandas:>16.2f}")
+            print(f"{args.motor:<28} {carga_sql:>10.2f} {indicadores_sql:>16.2f}")
+            print(f"{f'{args.motor} ({args.trabajadores} hilos)':<28} {'':>10} {indicadores_paralelo:>16.2f}")
+            encontradas = diferencias(referencia, resultados)
+            for nombre, motivo in encontradas.items():
+                print(f'  distinto: {nombre}: {motivo}')
+            if not encontradas:
+                print('  los 14 indicadores coinciden con pandas')
+            con_diferencias = con_diferencias or bool(encontradas)
+
+        print()
+        for caso, ruta in casos_borde(directorio).items():
+            referencia = PlanAgregacion(AnalizadorEducativo(leer_csv(ruta)).limpiar_datos()).ejecutar()
+            with MotorSQL.desde_csv(ruta, escanear=args.escanear, motor=args.motor) as motor:
+                encontradas = diferencias(referencia, motor.ejecutar())
+            for nombre, motivo in encontradas.items():
+                print(f'  {caso}: distinto: {nombre}: {motivo}')
+            if not encontradas:
+                print(f'  {caso}: los 14 indicadores coinciden con pandas')
+            con_diferencias = con_diferencias or bool(encontradas)
+    if con_diferencias:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
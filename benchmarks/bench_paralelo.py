@@ -0,0 +1,51 @@
+# benchmarks/bench_paralelo.py
+"""Compara el informe en serie contra el pool de hilos y el de procesos (indicadores + gráficos).
+
+Uso: python benchmarks/bench_paralelo.py --filas 1000000 --trabajadores 1 2 4 8
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import PlanAgregacion  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from graficos import renderizar_grafico  # noqa: E402
+from paralelo import informe_en_paralelo, recolectar  # noqa: E402
+
+
+def en_serie(df):
+    resultados = PlanAgregacion(df).ejecutar()
+    return {nombre: renderizar_grafico(nombre, resultado) for nombre, resultado in resultados.items()}
+
+
+def medir(funcion, df):
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion(df)
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=[1_000_000])
+    parser.add_argument('--trabajadores', type=int, nargs='+', default=[2, 4, 8])
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'modo':<10} {'trab.':>5} {'tiempo (s)':>10} {'aceleración':>11}")
+    for filas in args.filas:
+        df = AnalizadorEducativo(generar_datos(filas)).limpiar_datos()
+        base = medir(en_serie, df)
+        print(f"{filas:>10} {'serie':<10} {1:>5} {base:>10.2f} {1:>10.2f}x")
+        for modo, procesos in [('hilos', False), ('procesos', True)]:
+            for trabajadores in args.trabajadores:
+                segundos = medir(lambda df: recolectar(informe_en_paralelo(df, trabajadores=trabajadores, procesos=procesos)), df)
+                print(f'{filas:>10} {modo:<10} {trabajadores:>5} {segundos:>10.2f} {base / segundos:>10.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+# benchmarks/bench_plan_agregacion.py
+"""Compara el camino por método contra PlanAgregacion (tiempo y memoria pico).
+
+Uso: python benchmarks/bench_plan_agregacion.py --filas 100000 1000000
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import INDICADORES, PlanAgregacion  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+
+
+def por_metodo(df):
+    analizador = AnalizadorEducativo(df)
+    return {nombre: getattr(analizador, nombre)() for nombre in INDICADORES}
+
+
+def con_plan(df):
+    return PlanAgregacion(df).ejecutar()
+
+
+def medir(funcion, df):
+    """Devuelve (segundos, MB pico) de una ejecución"""
+    gc.collect()
+    inicio = time.perf_counter()
+    funcion(df)
+    segundos = time.perf_counter() - inicio
+
+    # La memoria se mide en una segunda ejecución para no penalizar el tiempo
+    gc.collect()
+    tracemalloc.start()
+    funcion(df)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return segundos, pico / 1024 ** 2
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, nargs='+', default=[100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'filas':>10} {'camino':<12} {'tiempo (s)':>10} {'pico (MB)':>10}")
+    for filas in args.filas:
+        analizador = AnalizadorEducativo(generar_datos(filas))
+        df = analizador.limpiar_datos()
+        for nombre, funcion in [('por_metodo', por_metodo), ('plan', con_plan)]:
+            segundos, pico = medir(funcion, df)
+            print(f'{filas:>10} {nombre:<12} {segundos:>10.2f} {pico:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
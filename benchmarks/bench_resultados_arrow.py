@@ -0,0 +1,84 @@
+# benchmarks/bench_resultados_arrow.py
+"""Mide lo que cuesta mostrar y exportar las tablas por estudiante: DataFrame completo contra páginas Arrow.
+
+Uso: python benchmarks/bench_resultados_arrow.py --filas 1000000 --repeticiones 20
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from agregacion import PlanAgregacion  # noqa: E402
+from analizador import AnalizadorEducativo  # noqa: E402
+from datos_sinteticos import generar_datos  # noqa: E402
+from resultados_arrow import escribir_ipc, leer_ipc, pagina, tabla_arrow  # noqa: E402
+
+TABLAS = ['asistencia_promedio_estudiante', 'estudiantes_ausencias_recurrentes']
+
+
+def serializar(tabla):
+    """Bytes que st.dataframe envía al navegador (Arrow IPC de la tabla)"""
+    sumidero = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sumidero, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    return sumidero.getvalue().size
+
+
+def por_render(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        enviados = funcion()
+    return (time.perf_counter() - inicio) / repeticiones, enviados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, default=1_000_000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    df = AnalizadorEducativo(generar_datos(args.filas)).limpiar_datos()
+    resultados = PlanAgregacion(df).ejecutar()
+    del df
+
+    print(f"{'tabla':<36} {'filas':>9} {'camino':<22} {'ms/render':>10} {'KB enviados':>12}")
+    for nombre in TABLAS:
+        tabla = resultados[nombre]
+        caminos = [
+            # Lo que hace st.dataframe con un DataFrame: convertirlo entero en cada reejecución
+            ('DataFrame completo', lambda: serializar(pa.Table.from_pandas(tabla))),
+            ('página Arrow (50)', lambda: serializar(pagina(tabla_arrow(tabla), 0))),
+        ]
+        for camino, funcion in caminos:
+            segundos, enviados = por_render(funcion, args.repeticiones)
+            print(f'{nombre:<36} {len(tabla):>9} {camino:<22} {segundos * 1000:>10.2f} {enviados / 1024:>12.1f}')
+
+    print(f"\n{'exportación':<24} {'MB':>8} {'escritura (s)':>14} {'lectura (s)':>12}")
+    with tempfile.TemporaryDirectory() as directorio:
+        tabla = resultados['asistencia_promedio_estudiante']
+        for formato, compresion in [('parquet', 'snappy'), ('arrow', None), ('arrow', 'lz4'), ('arrow', 'zstd')]:
+            ruta = os.path.join(directorio, f'{formato}_{compresion}')
+            inicio = time.perf_counter()
+            if formato == 'parquet':
+                tabla.to_parquet(ruta, compression=compresion)
+            else:
+                escribir_ipc(tabla, ruta, compresion)
+            escritura = time.perf_counter() - inicio
+            inicio = time.perf_counter()
+            if formato == 'parquet':
+                pq.read_table(ruta)
+            else:
+                leer_ipc(ruta)
+            lectura = time.perf_counter() - inicio
+            etiqueta = f'{formato} ({compresion or "sin comprimir"})'
+            print(f'{etiqueta:<24} {os.path.getsize(ruta) / 1024 ** 2:>8.2f} {escritura:>14.3f} {lectura:>12.3f}')
+
+
+if __name__ == '__main__':
+    main()
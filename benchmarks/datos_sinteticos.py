@@ -0,0 +1,170 @@
+# benchmarks/datos_sinteticos.py
+"""Genera datos sintéticos con el esquema y las distribuciones de datos_educativos.csv.
+
+Uso: python benchmarks/datos_sinteticos.py --filas 50000000 --salida datos_50M.csv
+
+Las frecuencias de tipo_usuario, grupo_id, materia, estado_asistencia y
+tipo_apoyo, el vocabulario de habilidades y cuántas tiene cada perfil, las
+notas, la asistencia, las fechas y las horas de acceso salen de la muestra.
+Los datos se generan por bloques, así que el CSV puede tener decenas de
+millones de filas sin tenerlas todas en memoria.
+"""
+import argparse
+import functools
+import os
+
+import numpy as np
+import pandas as pd
+
+MUESTRA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datos_educativos.csv')
+FILAS_POR_BLOQUE = 1_000_000
+
+# Columnas categóricas que se muestrean con las frecuencias de la muestra
+CATEGORICAS = ['tipo_usuario', 'grupo_id', 'materia', 'estado_asistencia', 'tipo_apoyo']
+
+# Listas de habilidades distintas: en los datos reales los perfiles se repiten
+COMBINACIONES_HABILIDADES = 2000
+
+
+def _frecuencias(serie):
+    conteo = serie.value_counts(normalize=True)
+    return conteo.index.to_numpy(), conteo.to_numpy()
+
+
+@functools.lru_cache(maxsize=None)
+def perfil_muestra(ruta=MUESTRA):
+    """Distribuciones empíricas de la muestra que reproduce el generador"""
+    df = pd.read_csv(ruta)
+    fechas = pd.to_datetime(df['fecha_registro'])
+    timestamps = pd.to_datetime(df['timestamp'])
+    habilidades = df['habilidades'].dropna().str.split(',')
+    partes_nombre = df['nombre'].str.split(n=1)
+    return {
+        'categorias': {col: _frecuencias(df[col]) for col in CATEGORICAS},
+        'habilidades': _frecuencias(habilidades.explode().str.strip()),
+        'habilidades_por_perfil': _frecuencias(habilidades.str.len()),
+        'nota': df['nota'].dropna().to_numpy(),
+        'asistencia': df['asistencia'].dropna().to_numpy(),
+        'fecha_minima': fechas.min().to_datetime64(),
+        'dias_registro': (fechas.max() - fechas.min()).days,
+        'dias_hasta_acceso': _frecuencias((timestamps.dt.normalize() - fechas).dt.days),
+        'hora_acceso': _frecuencias(timestamps.dt.hour),
+        'nombres': partes_nombre.str[0].unique(),
+        'apellidos': partes_nombre.str[1].unique(),
+    }
+
+
+def _suavizar(rng, valores, filas, decimales):
+    """Remuestrea valores con ruido de núcleo gaussiano, dentro del rango observado"""
+    ancho = 1.06 * valores.std() * len(valores) ** -0.2
+    muestra = rng.choice(valores, filas) + rng.normal(0, ancho, filas)
+    return muestra.clip(valores.min(), valores.max()).round(decimales)
+
+
+def _elegir(rng, frecuencias, filas):
+    valores, probabilidades = frecuencias
+    return valores[rng.choice(len(valores), filas, p=probabilidades)]
+
+
+class _Poblacion:
+    """Atributos fijos de cada estudiante y de los perfiles de habilidades, comunes a todos los bloques"""
+
+    def __init__(self, perfil, estudiantes, grupos, semilla):
+        rng = np.random.default_rng([semilla, 0])
+        self.estudiantes = estudiantes
+        nombres, apellidos = perfil['nombres'], perfil['apellidos']
+        self.nombre = rng.integers(0, len(nombres), estudiantes)
+        self.apellido = rng.integers(0, len(apellidos), estudiantes)
+        self.nombres_completos = np.array([[f'{n} {a}' for a in apellidos] for n in nombres], dtype=object)
+        self.emails = np.array([[f'{n}.{a}@correo.com'.lower() for a in apellidos] for n in nombres], dtype=object)
+        self.telefono = rng.integers(3_000_000_000, 3_999_999_999, estudiantes)
+        self.direccion = rng.integers(1, 100, (estudiantes, 3))
+        self.dia_registro = rng.integers(0, perfil['dias_registro'] + 1, estudiantes)
+
+        valores, probabilidades = perfil['categorias']['grupo_id']
+        if grupos is not None:
+            # Más grupos que en la muestra: se repite su patrón de tamaños
+            valores = np.arange(1, grupos + 1)
+            probabilidades = np.resize(probabilidades, grupos) / np.resize(probabilidades, grupos).sum()
+        self.grupos = (valores, probabilidades)
+
+        vocabulario, pesos = perfil['habilidades']
+        cantidades = _elegir(rng, perfil['habilidades_por_perfil'], COMBINACIONES_HABILIDADES)
+        self.combinaciones = np.array(
+            [', '.join(rng.choice(vocabulario, int(k), replace=False, p=pesos)) for k in cantidades], dtype=object)
+
+
+def _bloque(perfil, poblacion, filas, semilla, indice):
+    rng = np.random.default_rng([semilla, indice + 1])
+    ids = rng.integers(0, poblacion.estudiantes, filas)
+    nombre, apellido = poblacion.nombre[ids], poblacion.apellido[ids]
+    direccion = poblacion.direccion[ids]
+
+    fecha_registro = perfil['fecha_minima'] + poblacion.dia_registro[ids].astype('timedelta64[D]')
+    minutos = (_elegir(rng, perfil['dias_hasta_acceso'], filas) * 24 * 60
+               + _elegir(rng, perfil['hora_acceso'], filas) * 60 + rng.integers(0, 60, filas))
+    timestamp = fecha_registro.astype('datetime64[s]') + (minutos * 60).astype('timedelta64[s]')
+
+    categorias = {col: _elegir(rng, perfil['categorias'][col], filas)
+                  for col in ['tipo_usuario', 'materia', 'estado_asistencia', 'tipo_apoyo']}
+    return pd.DataFrame({
+        'id_estudiante': ids + 1,
+        'nombre': poblacion.nombres_completos[nombre, apellido],
+        'email': poblacion.emails[nombre, apellido],
+        'telefono': np.char.add('+57', poblacion.telefono[ids].astype(str)),
+        'direccion': ('Calle ' + pd.Series(direccion[:, 0]).astype(str) + ' #' + pd.Series(direccion[:, 1]).astype(str)
+                      + '-' + pd.Series(direccion[:, 2]).astype(str)).to_numpy(),
+        'tipo_usuario': categorias['tipo_usuario'],
+        'fecha_registro': np.datetime_as_string(fecha_registro, unit='D'),
+        'timestamp': np.char.replace(np.datetime_as_string(timestamp, unit='s'), 'T', ' '),
+        'grupo_id': _elegir(rng, poblacion.grupos, filas),
+        'materia': categorias['materia'],
+        'nota': _suavizar(rng, perfil['nota'], filas, 2),
+        'asistencia': _suavizar(rng, perfil['asistencia'], filas, 1),
+        'estado_asistencia': categorias['estado_asistencia'],
+        'habilidades': poblacion.combinaciones[rng.integers(0, len(poblacion.combinaciones), filas)],
+        'tipo_apoyo': categorias['tipo_apoyo'],
+    })
+
+
+def bloques(filas, semilla=0, filas_por_bloque=FILAS_POR_BLOQUE, filas_por_estudiante=10, grupos=None,
+            muestra=MUESTRA):
+    """Genera los datos bloque a bloque (DataFrames de hasta filas_por_bloque filas).
+
+    filas_por_estudiante fija cuántos registros tiene en promedio cada
+    id_estudiante (la muestra tiene uno por estudiante, lo que dejaría
+    vacíos los indicadores de ausencias recurrentes). grupos, si se indica,
+    reemplaza los grupos de la muestra por grupo_id 1..grupos.
+    """
+    perfil = perfil_muestra(muestra)
+    poblacion = _Poblacion(perfil, max(filas // filas_por_estudiante, 1), grupos, semilla)
+    for indice, inicio in enumerate(range(0, filas, filas_por_bloque)):
+        yield _bloque(perfil, poblacion, min(filas_por_bloque, filas - inicio), semilla, indice)
+
+
+def generar_datos(filas, semilla=0, **opciones):
+    """Genera un DataFrame sintético con las columnas de datos_educativos.csv"""
+    return pd.concat(bloques(filas, semilla, **opciones), ignore_index=True)
+
+
+def escribir_csv(ruta, filas, semilla=0, **opciones):
+    """Escribe el CSV sintético bloque a bloque, con memoria acotada por el tamaño del bloque"""
+    for indice, bloque in enumerate(bloques(filas, semilla, **opciones)):
+        bloque.to_csv(ruta, mode='w' if indice == 0 else 'a', header=indice == 0, index=False)
+    return ruta
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--filas', type=int, default=1_000_000, help='Entre 10 mil y 50 millones')
+    parser.add_argument('--salida', default='datos_sinteticos.csv')
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--filas-por-estudiante', type=int, default=10)
+    parser.add_argument('--grupos', type=int, default=None)
+    args = parser.parse_args()
+    escribir_csv(args.salida, args.filas, args.semilla,
+                 filas_por_estudiante=args.filas_por_estudiante, grupos=args.grupos)
+
+
+if __name__ == '__main__':
+    main()
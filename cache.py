@@ -0,0 +1,111 @@
+# cache.py
+import hashlib
+import sys
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+def huella_archivo(archivo):
+    """Hash del contenido de un archivo en memoria (BytesIO), sin copiarlo"""
+    with archivo.getbuffer() as contenido:
+        return hashlib.blake2b(contenido, digest_size=16).hexdigest()
+
+
+def huella_ruta(ruta, bloque=8 * 1024 ** 2):
+    """Hash de un archivo en disco leído por bloques; coincide con huella_archivo"""
+    hash_ = hashlib.blake2b(digest_size=16)
+    with open(ruta, 'rb') as archivo:
+        for parte in iter(lambda: archivo.read(bloque), b''):
+            hash_.update(parte)
+    return hash_.hexdigest()
+
+
+def tamaño_aproximado(valor):
+    """Bytes aproximados que ocupa un valor cacheado"""
+    if isinstance(valor, pd.DataFrame):
+        return int(valor.memory_usage(index=True, deep=True).sum())
+    if isinstance(valor, pd.Series):
+        return int(valor.memory_usage(index=True, deep=True))
+    if isinstance(valor, (bytes, bytearray)):
+        return len(valor)
+    if isinstance(valor, dict):
+        return sum(tamaño_aproximado(v) for v in valor.values())
+    if isinstance(valor, (list, tuple)):
+        return sum(tamaño_aproximado(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+class CacheLRU:
+    """Caché LRU acotada por número de entradas y por bytes aproximados.
+
+    Es segura entre hilos: si varias sesiones piden la misma clave a la vez,
+    solo una calcula el valor y las demás reciben el mismo resultado.
+    """
+
+    def __init__(self, max_entradas=32, max_bytes=2 * 1024 ** 3):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._candado = threading.Lock()
+        self._en_curso = {}
+
+    def __contains__(self, clave):
+        with self._candado:
+            return clave in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+    @property
+    def bytes_usados(self):
+        return self._bytes
+
+    def buscar(self, clave):
+        """Devuelve (encontrado, valor) y marca la entrada como usada"""
+        with self._candado:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                return True, self._entradas[clave][0]
+        return False, None
+
+    def obtener(self, clave, calcular):
+        """Devuelve el valor cacheado o lo calcula una sola vez y lo guarda"""
+        encontrado, valor = self.buscar(clave)
+        if encontrado:
+            return valor
+
+        with self._candado:
+            candado_clave = self._en_curso.setdefault(clave, threading.Lock())
+        try:
+            with candado_clave:
+                encontrado, valor = self.buscar(clave)
+                if not encontrado:
+                    valor = calcular()
+                    self.guardar(clave, valor)
+                return valor
+        finally:
+            with self._candado:
+                self._en_curso.pop(clave, None)
+
+    def guardar(self, clave, valor):
+        """Guarda un valor y descarta los menos usados si se supera el límite"""
+        tamaño = tamaño_aproximado(valor)
+        with self._candado:
+            if clave in self._entradas:
+                self._bytes -= self._entradas.pop(clave)[1]
+            # Un valor más grande que la caché completa no se guarda
+            if tamaño > self.max_bytes:
+                return
+            self._entradas[clave] = (valor, tamaño)
+            self._bytes += tamaño
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                _, (_, tamaño_descartado) = self._entradas.popitem(last=False)
+                self._bytes -= tamaño_descartado
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+            self._bytes = 0
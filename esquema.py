@@ -0,0 +1,102 @@
+# esquema.py
+import pandas as pd
+
+from instrumentacion import medir
+
+# Tipos declarados para las columnas documentadas del CSV.
+# id_estudiante se deja a la inferencia porque puede ser numérico o alfanumérico.
+TIPOS_COLUMNAS = {
+    'nombre': 'object',
+    'email': 'object',
+    'telefono': 'object',
+    'direccion': 'object',
+    'tipo_usuario': 'category',
+    'grupo_id': 'category',
+    'materia': 'category',
+    'estado_asistencia': 'category',
+    'habilidades': 'category',
+    'tipo_apoyo': 'category',
+    'nota': 'float32',
+    'asistencia': 'float32',
+}
+
+FORMATOS_FECHA = {
+    'fecha_registro': '%Y-%m-%d',
+    'timestamp': '%Y-%m-%d %H:%M:%S',
+}
+
+# Los numéricos se convierten después de leer para tolerar valores no numéricos
+_TIPOS_LECTURA = {col: tipo for col, tipo in TIPOS_COLUMNAS.items() if tipo != 'float32'}
+
+
+def leer_csv(archivo, **opciones):
+    """Lee el CSV con los tipos declarados para las columnas conocidas"""
+    if 'chunksize' in opciones:
+        return pd.read_csv(archivo, dtype=_TIPOS_LECTURA, **opciones)
+    with medir('lectura_csv') as medicion:
+        df = pd.read_csv(archivo, dtype=_TIPOS_LECTURA, **opciones)
+        medicion['filas'] = len(df)
+    return df
+
+
+def _convertir_fecha(serie, formato):
+    """Convierte con formato fijo y usa la inferencia solo para las filas que fallan"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie
+    fechas = pd.to_datetime(serie, format=formato, errors='coerce')
+    fallidas = fechas.isna() & serie.notna()
+    if fallidas.any():
+        fechas[fallidas] = pd.to_datetime(serie[fallidas], errors='coerce')
+    return fechas
+
+
+def _limpiar_categoria(serie):
+    """Quita espacios de las categorías y ordena numéricamente las que son números.
+
+    Solo se convierten en números si todas las categorías lo son. Lo leído
+    por partes (bloques, partes del almacén) decide en cada parte, así que
+    los agregados igualan el tipo de las claves al combinarlas.
+    """
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype('category')
+    categorias = serie.cat.categories
+    if categorias.dtype == object:
+        limpias = categorias.str.strip()
+        if limpias.is_unique:
+            serie = serie.cat.rename_categories(limpias)
+        else:
+            serie = serie.astype(object).str.strip().astype('category')
+        numericas = pd.to_numeric(serie.cat.categories, errors='coerce')
+        if len(numericas) and numericas.notna().all() and numericas.is_unique:
+            serie = serie.cat.rename_categories(numericas).cat.reorder_categories(numericas.sort_values())
+        elif not serie.cat.categories.is_monotonic_increasing:
+            # Mismo orden que read_csv, que ordena las categorías leídas como texto
+            serie = serie.cat.reorder_categories(serie.cat.categories.sort_values())
+    return serie
+
+
+def limpiar_categorias(df):
+    """Aplica la limpieza de categorías a las columnas categóricas de un DataFrame ya tipado (por ejemplo, leído de Arrow)"""
+    for col, tipo in TIPOS_COLUMNAS.items():
+        if tipo == 'category' and col in df.columns and isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = _limpiar_categoria(df[col])
+    return df
+
+
+def aplicar_esquema(df):
+    """Convierte las columnas declaradas a su tipo; las demás no se modifican"""
+    for col, formato in FORMATOS_FECHA.items():
+        if col in df.columns:
+            df[col] = _convertir_fecha(df[col], formato)
+
+    for col, tipo in TIPOS_COLUMNAS.items():
+        if col not in df.columns:
+            continue
+        if tipo == 'category':
+            df[col] = _limpiar_categoria(df[col])
+        elif tipo == 'float32':
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype('float32')
+        elif df[col].dtype == object:
+            # A diferencia de astype(str), conserva los nulos como nulos
+            df[col] = df[col].str.strip()
+    return df
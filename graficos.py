@@ -0,0 +1,168 @@
+# graficos.py
+import contextvars
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from instrumentacion import medir
+
+
+# Con más categorías que estas, el gráfico se reagrupa o muestra solo las principales
+MAX_BARRAS = 104
+MAX_GRUPOS = 30
+MAX_PORCIONES = 8
+
+
+def _figura(figsize):
+    """Figura con lienzo Agg propio, fuera de pyplot: se puede dibujar desde cualquier hilo"""
+    # matplotlib se importa con el primer gráfico, no al cargar la página
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.subplots()
+
+
+def _a_png(fig):
+    """Renderiza la figura a PNG; al no registrarse en pyplot se libera con la figura"""
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def _reagrupar_semanas(usuarios_semana):
+    """Reagrupa las semanas 'AAAA-Sww' por mes (o por año si aún son demasiadas barras)"""
+    lunes = pd.to_datetime(usuarios_semana['semana'].str.replace('-S', '-W') + '-1', format='%G-W%V-%u')
+    periodos = lunes.dt.to_period('M')
+    nombre = 'Mes'
+    if periodos.nunique() > MAX_BARRAS:
+        periodos, nombre = lunes.dt.to_period('Y'), 'Año'
+    return nombre, usuarios_semana['usuarios_nuevos'].groupby(periodos.astype(str)).sum()
+
+
+def _porciones(etiquetas, valores):
+    """Las porciones principales de un gráfico de torta; el resto se junta en 'otros'"""
+    etiquetas, valores = list(etiquetas), list(valores)
+    if len(valores) > MAX_PORCIONES:
+        principales = MAX_PORCIONES - 1
+        etiquetas = etiquetas[:principales] + ['otros']
+        valores = valores[:principales] + [sum(valores[principales:])]
+    return etiquetas, valores
+
+
+def grafico_usuarios_semana(usuarios_semana):
+    fig, ax = _figura((10, 4))
+    if len(usuarios_semana) > MAX_BARRAS:
+        periodo, por_periodo = _reagrupar_semanas(usuarios_semana)
+        ax.bar(por_periodo.index, por_periodo.values)
+        ax.set_title(f'Usuarios Nuevos por {periodo}')
+        ax.set_xlabel(periodo)
+    else:
+        ax.bar(usuarios_semana['semana'], usuarios_semana['usuarios_nuevos'])
+        ax.set_title('Usuarios Nuevos por Semana')
+        ax.set_xlabel('Semana')
+    ax.set_ylabel('Usuarios Nuevos')
+    ax.tick_params(axis='x', rotation=45)
+    return _a_png(fig)
+
+
+def grafico_tipos_usuario(tipo_usuario):
+    fig, ax = _figura((8, 6))
+    etiquetas, valores = _porciones(tipo_usuario['tipo'], tipo_usuario['cantidad'])
+    ax.pie(valores, labels=etiquetas, autopct='%1.1f%%')
+    ax.set_title('Distribución de Tipos de Usuario')
+    return _a_png(fig)
+
+
+def grafico_habilidades(habilidades):
+    fig, ax = _figura((10, 6))
+    ax.barh(habilidades['habilidad'], habilidades['frecuencia'])
+    ax.set_title('Top 10 Habilidades Más Frecuentes')
+    ax.set_xlabel('Frecuencia')
+    return _a_png(fig)
+
+
+def grafico_horarios(horarios):
+    fig, ax = _figura((8, 6))
+    ax.bar(horarios['franja_horaria'], horarios['accesos'])
+    ax.set_title('Accesos por Franja Horaria')
+    ax.set_ylabel('Número de Accesos')
+    return _a_png(fig)
+
+
+def grafico_promedio_grupo(promedio_notas):
+    fig, ax = _figura((10, 6))
+    titulo = 'Promedio de Notas por Grupo'
+    if len(promedio_notas) > MAX_GRUPOS:
+        # La tabla viene ordenada por promedio: se dibujan los mejores grupos
+        titulo += f' (top {MAX_GRUPOS} de {len(promedio_notas)})'
+        promedio_notas = promedio_notas.head(MAX_GRUPOS)
+    ax.bar(promedio_notas['grupo_id'].astype(str), promedio_notas['promedio_nota'])
+    ax.set_title(titulo)
+    ax.set_xlabel('Grupo')
+    ax.set_ylabel('Promedio de Nota')
+    ax.tick_params(axis='x', rotation=45)
+    return _a_png(fig)
+
+
+def grafico_apoyos(apoyos):
+    fig, ax = _figura((8, 6))
+    ax.pie(apoyos['solicitudes'], labels=apoyos['tipo_apoyo'], autopct='%1.1f%%')
+    ax.set_title('Top 3 Tipos de Apoyo Solicitados')
+    return _a_png(fig)
+
+
+def grafico_solicitudes_mes(solicitudes_mes):
+    fig, ax = _figura((10, 4))
+    ax.plot(solicitudes_mes['mes'], solicitudes_mes['solicitudes'], marker='o')
+    ax.set_title('Tendencia de Solicitudes por Mes')
+    ax.set_xlabel('Mes')
+    ax.set_ylabel('Solicitudes')
+    ax.tick_params(axis='x', rotation=45)
+    return _a_png(fig)
+
+
+def grafico_correlacion(corr_matrix):
+    import seaborn as sns  # solo lo usa este heatmap
+    fig, ax = _figura((6, 4))
+    sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0, ax=ax)
+    ax.set_title('Matriz de Correlación')
+    return _a_png(fig)
+
+
+# Indicador del que sale cada gráfico del informe
+GRAFICOS = {
+    'usuarios_nuevos_semana': grafico_usuarios_semana,
+    'tipo_usuario_mas_registrado': grafico_tipos_usuario,
+    'habilidades_mas_frecuentes': grafico_habilidades,
+    'horarios_acceso_familiares': grafico_horarios,
+    'promedio_notas_grupo': grafico_promedio_grupo,
+    'tipos_apoyo_solicitados': grafico_apoyos,
+    'frecuencia_solicitudes_mes': grafico_solicitudes_mes,
+}
+
+
+def renderizar_grafico(nombre, resultado):
+    """PNG del gráfico de un resultado, o None si ese resultado no tiene gráfico"""
+    if nombre == 'matriz_correlacion':
+        # El heatmap acompaña a la correlación nota-asistencia
+        if {'nota', 'asistencia'} <= set(resultado.columns):
+            with medir(nombre, 'grafico', filas=len(resultado)):
+                return grafico_correlacion(resultado)
+        return None
+    if nombre in GRAFICOS and not resultado.empty:
+        with medir(nombre, 'grafico', filas=len(resultado)):
+            return GRAFICOS[nombre](resultado)
+    return None
+
+
+def renderizar_graficos(resultados, trabajadores=None):
+    """Genera el PNG de cada gráfico del informe a partir de los resultados, en paralelo"""
+    nombres = [nombre for nombre in list(GRAFICOS) + ['matriz_correlacion'] if nombre in resultados]
+    with ThreadPoolExecutor(trabajadores) as pool:
+        # Cada tarea corre en una copia del contexto de quien llama, con su traza activa
+        futuros = [pool.submit(contextvars.copy_context().run, renderizar_grafico, nombre, resultados[nombre])
+                   for nombre in nombres]
+        pngs = {nombre: futuro.result() for nombre, futuro in zip(nombres, futuros)}
+        return {nombre: png for nombre, png in pngs.items() if png is not None}
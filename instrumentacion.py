@@ -0,0 +1,242 @@
+# instrumentacion.py
+"""Tiempos, filas y memoria por etapa y por análisis, y perfilado opcional de una ejecución.
+
+Las funciones instrumentadas llaman a medir(), que no hace nada salvo que
+haya una Traza activa (with trazar(Traza()): ...). La traza activa se guarda
+en una ContextVar, así que cada sesión del dashboard tiene la suya; los
+pools la propagan a sus tareas copiando el contexto.
+"""
+import contextlib
+import contextvars
+import cProfile
+import io
+import json
+import marshal
+import os
+import pstats
+import resource
+import sys
+import threading
+import time
+from collections import Counter
+
+import pandas as pd
+
+_TRAZA = contextvars.ContextVar('traza', default=None)
+
+_STATM = '/proc/self/statm'
+
+# Funciones donde un hilo está bloqueado esperando (el muestreo las descarta)
+_EN_ESPERA = {('thread.py', '_worker'), ('threading.py', 'wait'), ('threading.py', '_wait_for_tstate_lock')}
+
+
+def memoria_rss():
+    """RSS actual del proceso en bytes (el pico, ru_maxrss, donde no existe /proc)"""
+    if os.path.exists(_STATM):
+        with open(_STATM) as archivo:
+            return int(archivo.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    # ru_maxrss está en KB en Linux y en bytes en macOS
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maximo if sys.platform == 'darwin' else maximo * 1024
+
+
+class Traza:
+    """Eventos medidos durante una ejecución: etapa, categoría, tiempo, filas y memoria"""
+
+    def __init__(self):
+        self.origen = time.perf_counter()
+        self.eventos = []
+        self._bloqueo = threading.Lock()
+
+    def registrar(self, evento):
+        with self._bloqueo:
+            self.eventos.append(evento)
+
+    def agregar(self, eventos):
+        """Incorpora eventos medidos en otro proceso (perf_counter es monotónico en todo el sistema)"""
+        with self._bloqueo:
+            self.eventos.extend(eventos)
+
+    def tabla(self):
+        """DataFrame con un evento por fila, en orden de inicio"""
+        columnas = ['etapa', 'categoria', 'inicio_s', 'segundos', 'filas', 'memoria_mb', 'hilo', 'proceso']
+        filas = [{
+            'etapa': e['nombre'],
+            'categoria': e['categoria'],
+            'inicio_s': round(e['inicio'] - self.origen, 4),
+            'segundos': round(e['duracion'], 4),
+            'filas': e['filas'],
+            'memoria_mb': round(e['memoria'] / 1024 ** 2, 1),
+            'hilo': e['hilo'],
+            'proceso': e['proceso'],
+        } for e in sorted(self.eventos, key=lambda e: e['inicio'])]
+        return pd.DataFrame(filas, columns=columnas)
+
+    def a_json(self):
+        """Eventos en JSON, con tiempos relativos al inicio de la traza"""
+        return json.dumps(self.tabla().to_dict(orient='records'), ensure_ascii=False, indent=2)
+
+    def a_chrome(self):
+        """Eventos en formato Chrome trace (chrome://tracing, Perfetto)"""
+        eventos = []
+        hilos = {}
+        for e in self.eventos:
+            hilos[(e['proceso'], e['id_hilo'])] = e['hilo']
+            eventos.append({
+                'name': e['nombre'],
+                'cat': e['categoria'],
+                'ph': 'X',
+                'ts': (e['inicio'] - self.origen) * 1e6,
+                'dur': e['duracion'] * 1e6,
+                'pid': e['proceso'],
+                'tid': e['id_hilo'],
+                'args': {'filas': e['filas'], 'memoria_mb': round(e['memoria'] / 1024 ** 2, 1)},
+            })
+        for (proceso, id_hilo), hilo in hilos.items():
+            eventos.append({'name': 'thread_name', 'ph': 'M', 'pid': proceso, 'tid': id_hilo,
+                            'args': {'name': hilo}})
+        return json.dumps({'traceEvents': eventos, 'displayTimeUnit': 'ms'})
+
+
+def traza_activa():
+    return _TRAZA.get()
+
+
+@contextlib.contextmanager
+def trazar(traza):
+    """Activa la traza en el contexto actual; con None no se mide nada"""
+    token = _TRAZA.set(traza)
+    try:
+        yield traza
+    finally:
+        _TRAZA.reset(token)
+
+
+@contextlib.contextmanager
+def medir(nombre, categoria='etapa', filas=None):
+    """Registra tiempo, filas y variación de RSS del bloque en la traza activa.
+
+    Entrega un diccionario donde el bloque puede fijar 'filas' si solo las
+    conoce al terminar. La variación de memoria es la del proceso: con
+    varias tareas a la vez incluye lo que asignan las demás.
+    """
+    traza = _TRAZA.get()
+    datos = {'filas': filas}
+    if traza is None:
+        yield datos
+        return
+    memoria = memoria_rss()
+    inicio = time.perf_counter()
+    try:
+        yield datos
+    finally:
+        hilo = threading.current_thread()
+        traza.registrar({
+            'nombre': nombre,
+            'categoria': categoria,
+            'inicio': inicio,
+            'duracion': time.perf_counter() - inicio,
+            'filas': datos['filas'],
+            'memoria': memoria_rss() - memoria,
+            'hilo': hilo.name,
+            'id_hilo': hilo.ident,
+            'proceso': os.getpid(),
+        })
+
+
+class _PerfilCProfile:
+    """cProfile de la ejecución; solo ve el hilo que lo activa"""
+
+    extension = 'prof'
+
+    def __init__(self):
+        self.perfil = cProfile.Profile()
+
+    def iniciar(self):
+        self.perfil.enable()
+
+    def detener(self):
+        self.perfil.disable()
+
+    def texto(self, limite=40):
+        salida = io.StringIO()
+        pstats.Stats(self.perfil, stream=salida).sort_stats('cumulative').print_stats(limite)
+        return salida.getvalue()
+
+    def exportar(self):
+        """Estadísticas en el formato de dump_stats (pstats, snakeviz, gprof2dot)"""
+        self.perfil.create_stats()
+        return marshal.dumps(self.perfil.stats)
+
+
+class _PerfilMuestreo:
+    """Muestrea las pilas de todos los hilos del proceso a intervalos fijos (salvo los que esperan)"""
+
+    extension = 'txt'
+
+    def __init__(self, intervalo=0.005):
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self.muestras = 0
+        self._detener = threading.Event()
+        self._hilo = threading.Thread(target=self._muestrear, name='perfil-muestreo', daemon=True)
+
+    def _muestrear(self):
+        propio = threading.get_ident()
+        while not self._detener.wait(self.intervalo):
+            for id_hilo, marco in sys._current_frames().items():
+                if id_hilo == propio or (os.path.basename(marco.f_code.co_filename), marco.f_code.co_name) in _EN_ESPERA:
+                    continue
+                pila = []
+                while marco is not None:
+                    codigo = marco.f_code
+                    pila.append(f'{codigo.co_name} ({os.path.basename(codigo.co_filename)}:{codigo.co_firstlineno})')
+                    marco = marco.f_back
+                self.pilas[tuple(reversed(pila))] += 1
+            self.muestras += 1
+
+    def iniciar(self):
+        self._hilo.start()
+
+    def detener(self):
+        self._detener.set()
+        self._hilo.join()
+
+    def texto(self, limite=40):
+        propias, acumuladas = Counter(), Counter()
+        for pila, veces in self.pilas.items():
+            propias[pila[-1]] += veces
+            for funcion in set(pila):
+                acumuladas[funcion] += veces
+        total = sum(self.pilas.values()) or 1
+        lineas = [f'{self.muestras} muestras cada {self.intervalo * 1000:.0f} ms', '',
+                  f"{'propias %':>9} {'acumuladas %':>12}  función"]
+        for funcion, veces in acumuladas.most_common(limite):
+            lineas.append(f'{100 * propias[funcion] / total:>9.1f} {100 * veces / total:>12.1f}  {funcion}')
+        return '\n'.join(lineas)
+
+    def exportar(self):
+        """Pilas colapsadas (una por línea con su conteo), para flamegraph.pl o speedscope"""
+        return '\n'.join(f"{';'.join(pila)} {veces}" for pila, veces in self.pilas.most_common()).encode()
+
+
+PERFILADORES = {'cProfile': _PerfilCProfile, 'muestreo': _PerfilMuestreo}
+
+
+@contextlib.contextmanager
+def perfilar(modo):
+    """Perfila el bloque con 'cProfile' o 'muestreo'; con None no hace nada.
+
+    Entrega el perfilador, cuyo texto() resume las funciones más costosas y
+    exportar() devuelve los bytes para herramientas externas. Los procesos
+    hijos del pool no quedan incluidos.
+    """
+    if modo is None:
+        yield None
+        return
+    perfil = PERFILADORES[modo]()
+    perfil.iniciar()
+    try:
+        yield perfil
+    finally:
+        perfil.detener()
@@ -0,0 +1,623 @@
+# interfaz.py
+"""Informe del dashboard: carga del archivo, secciones, trabajos y diagnóstico.
+
+app.py lo importa después de pintar el encabezado, así que pandas, pyarrow
+y el resto de la pila de análisis se cargan con la página ya visible.
+"""
+import streamlit as st
+import os
+import tempfile
+import uuid
+from agregacion import CuboIndicadores, columnas_necesarias
+from aproximado import ALFA_CUANTILES, DESVIACIONES_HLL, HyperLogLog, probabilidad_cota
+from almacen import AlmacenColumnar, nombre_dataset
+from analizador import AnalizadorEducativo
+from cache import CacheLRU, huella_archivo
+from esquema import leer_csv
+from graficos import renderizar_grafico, renderizar_graficos
+from instrumentacion import PERFILADORES, Traza, perfilar, traza_activa, trazar
+from lote import DIRECTORIO_LOTE, cargar_resultados, guardar_resultados, listar_resultados
+from paralelo import informe_en_paralelo, trabajadores_por_defecto
+from resultados_arrow import FILAS_POR_PAGINA, empaquetar, pagina, paginas, tabla_arrow
+from trabajos import CANCELADO, EN_COLA, TERMINADO, GestorTrabajos
+
+def mostrar_informacion_dataset(resultados, graficos):
+    # Mostrar información básica del dataset
+    informacion = resultados['informacion_dataset']
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("Total Registros", informacion['registros'])
+    with col2:
+        st.metric("Columnas", len(informacion['columnas']))
+    with col3:
+        st.metric("Valores Nulos", informacion['nulos'])
+
+def mostrar_tabla_y_grafico(nombre):
+    """Sección con la tabla del indicador a la izquierda y su gráfico a la derecha"""
+    def mostrar(resultados, graficos):
+        tabla = resultados[nombre]
+        if not tabla.empty:
+            col1, col2 = st.columns([1, 2])
+            with col1:
+                st.dataframe(tabla_arrow(tabla), use_container_width=True)
+            with col2:
+                st.image(graficos[nombre], use_container_width=True)
+    return mostrar
+
+def mostrar_hoja_vida(resultados, graficos):
+    hoja_vida = resultados['hoja_vida_completa']
+    if not hoja_vida.empty:
+        st.dataframe(tabla_arrow(hoja_vida), use_container_width=True)
+
+@st.fragment
+def mostrar_tabla_paginada(tabla, clave, filas_por_pagina=FILAS_POR_PAGINA):
+    """Tabla por páginas: cambiar de página solo vuelve a ejecutar este fragmento y envía esas filas"""
+    tabla = tabla_arrow(tabla)
+    total = paginas(tabla.num_rows, filas_por_pagina)
+    numero = 1
+    if total > 1:
+        numero = st.number_input(f"Página (de {total})", min_value=1, max_value=total, value=1, key=f"pagina_{clave}")
+    st.dataframe(pagina(tabla, numero - 1, filas_por_pagina), use_container_width=True)
+    if total > 1:
+        inicio = (numero - 1) * filas_por_pagina
+        st.caption(f"Filas {inicio + 1} a {min(inicio + filas_por_pagina, tabla.num_rows)} de {tabla.num_rows}")
+
+def mostrar_consultas_familiares(resultados, graficos):
+    consultas = resultados['consultas_familiares']
+    if consultas:
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            # En modo aproximado la tabla trae solo los estudiantes con más consultas
+            con_consultas = consultas.get('estudiantes_con_consultas', len(consultas['consultas_por_estudiante']))
+            st.metric("Estudiantes con consultas", con_consultas)
+        with col2:
+            st.metric("Estudiantes sin interacción", consultas['estudiantes_sin_interaccion'])
+        with col3:
+            st.metric("Total estudiantes", consultas['total_estudiantes'])
+        
+        if not consultas['consultas_por_estudiante'].empty:
+            mostrar_tabla_paginada(consultas['consultas_por_estudiante'], 'consultas', 10)
+
+def mostrar_reprobaciones(resultados, graficos):
+    reprobaciones = resultados['materias_mas_reprobaciones']
+    if not reprobaciones.empty:
+        st.dataframe(pagina(tabla_arrow(reprobaciones), 0, 10), use_container_width=True)
+
+def mostrar_asistencia(resultados, graficos):
+    asistencia = resultados['asistencia_promedio_estudiante']
+    if not asistencia.empty:
+        mostrar_tabla_paginada(asistencia, 'asistencia', 15)
+
+def mostrar_ausencias(resultados, graficos):
+    ausencias = resultados['estudiantes_ausencias_recurrentes']
+    if not ausencias.empty:
+        mostrar_tabla_paginada(ausencias, 'ausencias')
+    else:
+        st.info("No se encontraron estudiantes con más de 3 ausencias")
+
+def mostrar_resumen_grupo(resultados, graficos):
+    resumen_grupo = resultados['resumen_estadistico_grupo']
+    if not resumen_grupo.empty:
+        st.dataframe(tabla_arrow(resumen_grupo), use_container_width=True)
+
+def mostrar_correlacion(resultados, graficos):
+    correlacion = resultados['correlacion_nota_asistencia']
+    if correlacion is not None:
+        st.metric("Coeficiente de Correlación", correlacion)
+        
+        # Heatmap de correlación
+        if 'matriz_correlacion' in graficos:
+            st.image(graficos['matriz_correlacion'], use_container_width=True)
+
+# Etiquetas de los filtros del cubo de indicadores
+ETIQUETAS_FILTRO = {'grupo_id': "Grupo", 'materia': "Materia", 'tipo_usuario': "Tipo de usuario", 'mes': "Mes"}
+
+def mostrar_cubo(resultados, graficos):
+    """Indicadores filtrados por grupo, materia, tipo de usuario y mes, calculados desde el cubo"""
+    celdas = resultados.get('cubo')
+    if celdas is None or celdas.empty:
+        st.info("Este informe no tiene cubo de indicadores; vuelve a procesar el archivo para filtrarlo")
+        return
+    cubo = CuboIndicadores(celdas)
+    filtros = {}
+    columnas = st.columns(len(cubo.dimensiones))
+    for columna, dimension in zip(columnas, cubo.dimensiones):
+        with columna:
+            elegidos = st.multiselect(ETIQUETAS_FILTRO.get(dimension, dimension), cubo.valores(dimension),
+                                      key=f"filtro_cubo_{dimension}")
+        if elegidos:
+            filtros[dimension] = elegidos
+    
+    filtrado = cubo.filtrar(**filtros)
+    if filtrado.celdas.empty:
+        st.info("Ningún registro cumple los filtros elegidos")
+        return
+    metricas = filtrado.metricas().iloc[0]
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Registros", int(metricas['registros']))
+    with col2:
+        if 'promedio_nota' in metricas:
+            st.metric("Promedio de notas", f"{metricas['promedio_nota']:.2f}")
+    with col3:
+        if 'porcentaje_reprobacion' in metricas:
+            st.metric("Reprobación", f"{metricas['porcentaje_reprobacion']:.1f}%")
+    with col4:
+        if 'promedio_asistencia' in metricas:
+            st.metric("Asistencia promedio", f"{metricas['promedio_asistencia']:.1f}%")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.dataframe(filtrado.promedio_notas_grupo(), use_container_width=True)
+    with col2:
+        st.dataframe(filtrado.materias_mas_reprobaciones(), use_container_width=True)
+    if 'mes' in cubo.dimensiones:
+        st.dataframe(filtrado.metricas(['mes']), use_container_width=True)
+
+# Secciones del informe en orden: (título, resultados que necesita, función que la muestra)
+SECCIONES = [
+    ("📋 Información del Dataset", ('informacion_dataset',), mostrar_informacion_dataset),
+    ("👥 Usuarios Nuevos por Semana", ('usuarios_nuevos_semana',), mostrar_tabla_y_grafico('usuarios_nuevos_semana')),
+    ("🎯 Distribución de Tipos de Usuario", ('tipo_usuario_mas_registrado',), mostrar_tabla_y_grafico('tipo_usuario_mas_registrado')),
+    ("📄 Estado de Hojas de Vida", ('hoja_vida_completa',), mostrar_hoja_vida),
+    ("🛠️ Top 10 Habilidades Más Frecuentes", ('habilidades_mas_frecuentes',), mostrar_tabla_y_grafico('habilidades_mas_frecuentes')),
+    ("👨‍👩‍👧‍👦 Consultas Familiares a Perfiles", ('consultas_familiares',), mostrar_consultas_familiares),
+    ("🕒 Horarios de Acceso de Familiares", ('horarios_acceso_familiares',), mostrar_tabla_y_grafico('horarios_acceso_familiares')),
+    ("📈 Promedio de Notas por Grupo", ('promedio_notas_grupo',), mostrar_tabla_y_grafico('promedio_notas_grupo')),
+    ("📚 Materias con Más Reprobaciones", ('materias_mas_reprobaciones',), mostrar_reprobaciones),
+    ("✅ Asistencia Promedio por Estudiante", ('asistencia_promedio_estudiante',), mostrar_asistencia),
+    ("⚠️ Estudiantes con Ausencias Recurrentes", ('estudiantes_ausencias_recurrentes',), mostrar_ausencias),
+    ("🆕 Tipos de Apoyo Más Solicitados", ('tipos_apoyo_solicitados',), mostrar_tabla_y_grafico('tipos_apoyo_solicitados')),
+    ("📅 Frecuencia de Solicitudes por Mes", ('frecuencia_solicitudes_mes',), mostrar_tabla_y_grafico('frecuencia_solicitudes_mes')),
+    ("📊 Resumen Estadístico por Grupo", ('resumen_estadistico_grupo',), mostrar_resumen_grupo),
+    ("🔗 Correlación entre Nota y Asistencia", ('correlacion_nota_asistencia', 'matriz_correlacion'), mostrar_correlacion),
+    ("🔎 Indicadores Filtrados", ('cubo',), mostrar_cubo),
+]
+
+# Resultados que usa el resumen ejecutivo (se calculan aunque su sección no se muestre)
+RESULTADOS_RESUMEN = ('informacion_dataset', 'tipo_usuario_mas_registrado', 'correlacion_nota_asistencia')
+
+def mostrar_informe(resultados, graficos=None):
+    """Muestra en la página los indicadores y gráficos ya calculados"""
+    if graficos is None:
+        graficos = renderizar_graficos(resultados)
+    st.header("📊 Informe Completo de Analytics Educativo")
+    for titulo, _, mostrar in SECCIONES:
+        st.subheader(titulo)
+        mostrar(resultados, graficos)
+
+def mostrar_informe_progresivo(eventos, secciones=SECCIONES):
+    """Muestra cada sección apenas terminan sus resultados (en el orden del informe).
+    
+    eventos genera (nombre, resultado, png o None), como
+    paralelo.informe_en_paralelo; devuelve los resultados y gráficos recibidos.
+    """
+    st.header("📊 Informe Completo de Analytics Educativo")
+    huecos = []
+    for titulo, _, _ in secciones:
+        st.subheader(titulo)
+        huecos.append(st.empty())
+        huecos[-1].caption("⏳ Calculando...")
+    
+    resultados, graficos = {}, {}
+    pendientes = list(range(len(secciones)))
+    for nombre, resultado, grafico in eventos:
+        resultados[nombre] = resultado
+        if grafico is not None:
+            graficos[nombre] = grafico
+        for indice in list(pendientes):
+            _, requeridos, mostrar = secciones[indice]
+            if all(requerido in resultados for requerido in requeridos):
+                with huecos[indice].container():
+                    mostrar(resultados, graficos)
+                pendientes.remove(indice)
+    return resultados, graficos
+
+def mostrar_resumen_ejecutivo(resultados):
+    """Muestra las métricas clave del informe"""
+    st.subheader("📋 Resumen Ejecutivo")
+    informacion = resultados['informacion_dataset']
+    
+    # Métricas clave
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if 'tipo_usuario' in informacion['columnas']:
+            tipos = resultados['tipo_usuario_mas_registrado']
+            total_estudiantes = int(tipos.loc[tipos['tipo'] == 'estudiante', 'cantidad'].sum())
+            st.metric("Total Estudiantes", total_estudiantes)
+    
+    with col2:
+        if informacion['promedio_nota'] is not None:
+            st.metric("Promedio General", f"{informacion['promedio_nota']:.2f}")
+    
+    with col3:
+        if informacion['promedio_asistencia'] is not None:
+            st.metric("Asistencia Promedio", f"{informacion['promedio_asistencia']:.1f}%")
+    
+    with col4:
+        correlacion = resultados['correlacion_nota_asistencia']
+        if correlacion:
+            st.metric("Correlación Nota-Asistencia", f"{correlacion:.2f}")
+
+@st.cache_resource
+def obtener_cache():
+    """Caché de datos, resultados y gráficos compartida entre sesiones y reejecuciones"""
+    # Resultados y gráficos se guardan por sección: el límite real son los bytes
+    return CacheLRU(max_entradas=512)
+
+def huella_subida(archivo):
+    """Hash del archivo subido, calculado una sola vez por archivo en la sesión"""
+    huellas = st.session_state.setdefault('huellas', {})
+    if archivo.file_id not in huellas:
+        huellas[archivo.file_id] = huella_archivo(archivo)
+    return huellas[archivo.file_id]
+
+@st.cache_resource
+def obtener_trabajos():
+    """Trabajos de carga y análisis en segundo plano, compartidos entre sesiones"""
+    return GestorTrabajos()
+
+# Tiempo que se espera a un trabajo antes de mostrar su progreso (los rápidos no parpadean)
+ESPERA_TRABAJO = 0.5
+
+def solicitante():
+    """Identificador de la sesión ante los trabajos compartidos: cancelar solo retira a esta sesión"""
+    return st.session_state.setdefault('solicitante', uuid.uuid4().hex)
+
+@st.fragment(run_every=1.0)
+def mostrar_progreso(trabajo, descripcion, parcial=None):
+    """Progreso de un trabajo en curso; al terminar vuelve a ejecutar la página para mostrar el resultado.
+    
+    parcial, si se da, muestra debajo lo que el trabajo ya dejó listo.
+    """
+    if not trabajo.activo or trabajo.retirado(solicitante()):
+        st.rerun()
+    etapa = trabajo.etapa or ('en cola' if trabajo.estado == EN_COLA else 'iniciando')
+    detalle = f"{descripcion}: {etapa} · {trabajo.etapas} etapas · {trabajo.segundos:.0f} s"
+    if trabajo.progreso is None:
+        st.caption(f"⏳ {detalle}")
+    else:
+        st.progress(trabajo.progreso, text=detalle)
+    if st.button("⏹️ Cancelar", key=f"cancelar_{descripcion}"):
+        # Si otras sesiones esperan el mismo trabajo, sigue corriendo para ellas
+        trabajo.cancelar(solicitante())
+        st.rerun()
+    if parcial is not None:
+        parcial()
+
+def trabajo_en_segundo_plano(clave, funcion, descripcion, total=None, reintentar=False, parcial=None):
+    """Inicia o retoma el trabajo de la clave; devuelve el trabajo si terminó y, si no, muestra su estado.
+    
+    Con el diagnóstico activo el trabajo corre en esta ejecución, para
+    medirlo y perfilarlo. parcial se pasa a mostrar_progreso.
+    """
+    gestor = obtener_trabajos()
+    trabajo = gestor.iniciar(clave, funcion, total, reintentar=reintentar, en_linea=traza_activa() is not None,
+                             solicitante=solicitante())
+    trabajo.esperar(ESPERA_TRABAJO)
+    if trabajo.estado == TERMINADO:
+        return trabajo
+    if trabajo.activo and not trabajo.retirado(solicitante()):
+        mostrar_progreso(trabajo, descripcion, parcial)
+        return None
+    if trabajo.activo or trabajo.estado == CANCELADO:
+        st.warning(f"{descripcion}: cancelado")
+    else:
+        st.error(f"Error al procesar el archivo: {str(trabajo.error)}")
+    if st.button("🔁 Reintentar", key=f"reintentar_{descripcion}"):
+        gestor.iniciar(clave, funcion, total, reintentar=True, solicitante=solicitante())
+        st.rerun()
+    return None
+
+def exportar_resultados(resultados):
+    """Zip con los resultados en Arrow IPC comprimido, en el formato de lote.py --formato arrow"""
+    with tempfile.TemporaryDirectory() as directorio:
+        guardar_resultados(resultados, directorio, 'arrow')
+        return empaquetar(directorio)
+
+def cargar_datos(archivo, huella, cache):
+    """DataFrame limpio del archivo subido, cacheado por contenido"""
+    def cargar():
+        archivo.seek(0)
+        return AnalizadorEducativo(leer_csv(archivo)).limpiar_datos()
+    return cache.obtener(('datos', huella), cargar)
+
+def ingerir_en_almacen(archivo, huella, dataset, forzar=False):
+    """Anexa el archivo subido al almacén columnar del dataset elegido (una vez por contenido)"""
+    almacen = AlmacenColumnar(os.path.join('resultados', 'almacen', nombre_dataset(dataset)))
+    limpiar = lambda df: AnalizadorEducativo(df).limpiar_datos()
+    anexadas = obtener_cache().obtener(('ingesta', huella, almacen.directorio),
+                                       lambda: almacen.ingerir(archivo, limpiar, forzar))
+    return AlmacenColumnar(almacen.directorio), anexadas
+
+def cargar_almacen(almacen):
+    """Columnas que usan los indicadores, leídas del almacén mapeado en memoria"""
+    return obtener_cache().obtener(('datos', almacen.version), lambda: almacen.leer(columnas_necesarias()))
+
+def calcular_resultados(clave, calcular, cache):
+    """Resultados del análisis cacheados por contenido y parámetros"""
+    return cache.obtener(('resultados',) + clave, calcular)
+
+def eventos_informe(clave, nombres, graficar, calcular_faltantes, cache):
+    """Resultados y gráficos pedidos: primero los cacheados y luego los que faltan.
+    
+    Cada resultado y cada gráfico se cachea por separado, así que elegir
+    otra sección solo calcula y dibuja lo nuevo. calcular_faltantes(nombres,
+    graficar) genera (nombre, resultado, png o None) para los no cacheados.
+    """
+    faltantes = []
+    for nombre in nombres:
+        encontrado, resultado = cache.buscar(('resultado',) + clave + (nombre,))
+        if not encontrado:
+            faltantes.append(nombre)
+            continue
+        grafico = None
+        if nombre in graficar:
+            grafico = cache.obtener(('grafico',) + clave + (nombre,), lambda: renderizar_grafico(nombre, resultado))
+        yield nombre, resultado, grafico
+    
+    if faltantes:
+        for nombre, resultado, grafico in calcular_faltantes(faltantes, [n for n in faltantes if n in graficar]):
+            cache.guardar(('resultado',) + clave + (nombre,), resultado)
+            if nombre in graficar:
+                cache.guardar(('grafico',) + clave + (nombre,), grafico)
+            yield nombre, resultado, grafico
+
+def mostrar_analisis(clave, calcular, df_completo, trabajadores, reintentar=False):
+    """Informe con las secciones elegidas; con df_completo los indicadores se calculan por separado.
+    
+    El cálculo corre en un trabajo en segundo plano que deja resultados y
+    gráficos en la caché; la página los muestra cuando termina.
+    """
+    titulos = [titulo for titulo, _, _ in SECCIONES]
+    elegidas = st.multiselect(
+        "Secciones del informe", titulos, default=titulos[:3],
+        help="Solo se calculan y dibujan las secciones elegidas"
+    )
+    secciones = [seccion for seccion in SECCIONES if seccion[0] in elegidas]
+    graficar = [nombre for _, requeridos, _ in secciones for nombre in requeridos]
+    nombres = list(dict.fromkeys(graficar + list(RESULTADOS_RESUMEN)))
+    cache = obtener_cache()
+    
+    if df_completo is not None:
+        # Solo los indicadores pedidos, en paralelo y con su gráfico
+        def calcular_faltantes(faltantes, graficar):
+            return informe_en_paralelo(df_completo, faltantes, trabajadores, graficar=graficar)
+    else:
+        def calcular_faltantes(faltantes, graficar):
+            resultados = calcular_resultados(clave, calcular, cache)
+            for nombre in faltantes:
+                # Los informes de lote.py anteriores al cubo no lo incluyen
+                resultado = resultados.get(nombre)
+                grafico = renderizar_grafico(nombre, resultado) if nombre in graficar and resultado is not None else None
+                yield nombre, resultado, grafico
+    
+    def informe(trabajo):
+        for nombre, _, _ in eventos_informe(clave, nombres, graficar, calcular_faltantes, cache):
+            trabajo.avanzar(nombre)
+    
+    def secciones_listas():
+        # Mientras el trabajo corre, cada sección aparece cuando sus resultados llegan a la caché
+        sin_calcular = lambda faltantes, graficar: ()
+        mostrar_informe_progresivo(eventos_informe(clave, nombres, graficar, sin_calcular, cache), secciones)
+    
+    trabajo = trabajo_en_segundo_plano(('informe',) + clave + (tuple(nombres), tuple(graficar)), informe,
+                                       "Análisis", total=len(nombres), reintentar=reintentar,
+                                       parcial=secciones_listas)
+    if trabajo is None:
+        return
+    
+    # Todo quedó en la caché (si algo se descartó entretanto, se recalcula aquí)
+    resultados, _ = mostrar_informe_progresivo(
+        eventos_informe(clave, nombres, graficar, calcular_faltantes, cache), secciones)
+    
+    # Guardar resultados
+    if not os.path.exists('resultados'):
+        os.makedirs('resultados')
+    
+    mostrar_resumen_ejecutivo(resultados)
+    # El zip se arma solo al hacer clic
+    st.download_button(
+        "📦 Exportar resultados (Arrow IPC)", lambda: exportar_resultados(resultados), "resultados_arrow.zip",
+        "application/zip", on_click="ignore",
+        help="Una tabla .arrow comprimida por resultado y manifiesto.json con los demás valores; "
+             "se leen con pyarrow.ipc mapeando el archivo en memoria"
+    )
+
+def mostrar_diagnostico(traza, perfil):
+    """Panel con lo medido en esta ejecución y, si se pidió, el perfil"""
+    with st.expander("🩺 Diagnóstico de rendimiento", expanded=True):
+        tabla = traza.tabla()
+        if tabla.empty:
+            st.write("No hubo etapas medidas: todo salió de la caché en esta ejecución.")
+        else:
+            por_categoria = tabla.groupby('categoria')['segundos'].sum()
+            columnas = st.columns(len(por_categoria))
+            for columna, (categoria, segundos) in zip(columnas, por_categoria.items()):
+                columna.metric(f"Tiempo en {categoria}", f"{segundos:.2f} s")
+            st.dataframe(tabla.sort_values('segundos', ascending=False), use_container_width=True)
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button("Exportar JSON", traza.a_json(), "traza.json", "application/json", on_click="ignore")
+        with col2:
+            st.download_button("Exportar Chrome trace", traza.a_chrome(), "traza_chrome.json", "application/json",
+                               on_click="ignore", help="Se abre en chrome://tracing o ui.perfetto.dev")
+        
+        if perfil is not None:
+            st.code(perfil.texto())
+            st.download_button("Descargar perfil", perfil.exportar(), f"perfil.{perfil.extension}", on_click="ignore")
+
+def mostrar_pagina():
+    """Opciones de la barra lateral, el contenido y, si se pidió, el diagnóstico"""
+    # Resultados calculados con lote.py
+    precalculados = listar_resultados()
+    trabajadores = st.sidebar.number_input(
+        "Trabajadores en paralelo", min_value=1, max_value=64, value=trabajadores_por_defecto(),
+        help="Hilos que calculan los indicadores y dibujan los gráficos a la vez"
+    )
+    diagnostico = st.sidebar.checkbox(
+        "Diagnóstico de rendimiento",
+        help="Mide tiempo, filas y memoria de cada etapa, análisis y gráfico de esta ejecución"
+    )
+    perfilador = None
+    if diagnostico:
+        perfilador = st.sidebar.selectbox(
+            "Perfilador", [None] + list(PERFILADORES), format_func=lambda modo: modo or "(ninguno)",
+            help="cProfile solo ve el hilo principal, así que calcula sin pool; el muestreo ve todos los hilos"
+        )
+        if perfilador == 'cProfile':
+            trabajadores = 0
+    
+    traza = Traza() if diagnostico else None
+    with trazar(traza), perfilar(perfilador) as perfil:
+        mostrar_contenido(precalculados, trabajadores)
+    if diagnostico:
+        mostrar_diagnostico(traza, perfil)
+
+def mostrar_contenido(precalculados, trabajadores):
+    """Carga del archivo (o informe precalculado) y el análisis elegido"""
+    # Subir archivo
+    uploaded_file = st.file_uploader("Sube tu archivo CSV", type=['csv'])
+    
+    if uploaded_file is None and precalculados:
+        elegido = st.sidebar.selectbox(
+            "Informe precalculado", ["(ninguno)"] + list(precalculados),
+            help=f"Resultados generados con lote.py en {DIRECTORIO_LOTE}"
+        )
+        if elegido != "(ninguno)":
+            lote = precalculados[elegido]
+            aproximado = " (modo aproximado)" if lote.get('aproximado') else ""
+            st.info(f"Resultados precalculados de `{lote['archivo']}` ({lote['filas']} registros){aproximado}")
+            mostrar_analisis((lote['huella'], 'lote'), lambda: cargar_resultados(lote['directorio']), None, trabajadores)
+            return
+    
+    if uploaded_file is not None:
+        modo_bloques = st.checkbox(
+            "Procesar por bloques (archivos grandes)",
+            help="Lee el CSV por partes y acumula agregados sin cargar el archivo completo en memoria"
+        )
+        usar_almacen = not modo_bloques and st.checkbox(
+            "Guardar en el almacén local (resultados/almacen)",
+            help="Anexa solo las filas nuevas a un almacén columnar del dataset y analiza el historial completo"
+        )
+        try:
+            huella = huella_subida(uploaded_file)
+            df_completo = None
+            lote = next((m for m in precalculados.values() if m['huella'] == huella), None)
+            if modo_bloques:
+                filas_por_bloque = st.number_input("Filas por bloque", min_value=10_000, value=200_000, step=50_000)
+                aproximado = st.checkbox(
+                    "Modo aproximado (memoria constante)",
+                    help="Estima estudiantes distintos, consultas, habilidades, tipos de apoyo y cuartiles con bocetos de tamaño fijo"
+                )
+                if aproximado:
+                    st.caption(
+                        f"Cuartiles, mínimos y máximos por grupo con error relativo ≤ {ALFA_CUANTILES:.0%}; "
+                        f"estudiantes distintos con error relativo ≤ {HyperLogLog().cota_relativa():.1%} "
+                        f"(probabilidad {probabilidad_cota(DESVIACIONES_HLL):.1%}); "
+                        "habilidades, tipos de apoyo y consultas nunca subestimadas. "
+                        "La tabla de consultas muestra solo los estudiantes con más consultas."
+                    )
+                clave = (huella, 'aproximado' if aproximado else 'bloques')
+                
+                def calcular():
+                    uploaded_file.seek(0)
+                    return AnalizadorEducativo.agregar_por_bloques(uploaded_file, filas_por_bloque, aproximado).finalizar()
+            elif lote is not None and not usar_almacen:
+                # El mismo archivo ya se procesó con lote.py
+                aproximado = " (modo aproximado)" if lote.get('aproximado') else ""
+                st.info(f"Se usan los resultados precalculados en `{lote['directorio']}`{aproximado}")
+                clave = (huella, 'lote')
+                calcular = lambda: cargar_resultados(lote['directorio'])
+            else:
+                if usar_almacen:
+                    dataset = st.text_input(
+                        "Dataset del almacén", value=nombre_dataset(uploaded_file.name),
+                        help="Los archivos del mismo dataset se acumulan; usa otro nombre para datos de otro origen"
+                    )
+                    forzar = st.checkbox(
+                        "Anexar aunque no comparta filas con el almacén",
+                        help="Para exports que traen solo las filas nuevas; si no, un archivo sin filas en común se rechaza"
+                    )
+                    almacen, anexadas = ingerir_en_almacen(uploaded_file, huella, dataset, forzar)
+                    st.info(f"{anexadas} filas nuevas anexadas al almacén `{almacen.directorio}`")
+                    clave = (almacen.version, 'almacen')
+                    df = cargar_almacen(almacen)
+                    # El almacén mantiene los agregados al día con cada anexado
+                    calcular = lambda: almacen.estado().finalizar()
+                else:
+                    # Leer el archivo CSV en segundo plano (se reutiliza entre reejecuciones)
+                    clave = (huella, 'completo')
+                    cache = obtener_cache()
+                    encontrado, df = cache.buscar(('datos', huella))
+                    if not encontrado:
+                        carga = trabajo_en_segundo_plano(
+                            ('carga', huella), lambda trabajo: cargar_datos(uploaded_file, huella, cache),
+                            "Carga del archivo")
+                        if carga is None:
+                            return
+                        # El trabajo suelta el DataFrame al entregarlo: fuera de esta ejecución solo
+                        # lo retiene la caché, dentro de su límite (y si lo descarta, se vuelve a cargar)
+                        encontrado, df = obtener_trabajos().entregar(('carga', huella))
+                        if not encontrado:
+                            # Otra sesión lo recibió primero: está en la caché o hay que cargarlo de nuevo
+                            encontrado, df = cache.buscar(('datos', huella))
+                            if not encontrado:
+                                st.rerun()
+                    df_completo = df
+                    calcular = None
+                st.success(f"Archivo cargado exitosamente: {len(df)} registros, {len(df.columns)} columnas")
+                
+                # Mostrar vista previa
+                with st.expander("Vista previa de los datos"):
+                    st.dataframe(df.head())
+                    st.write("**Información del dataset:**")
+                    st.write(f"- Columnas: {list(df.columns)}")
+                    st.write(f"- Tipos de datos: {df.dtypes.to_dict()}")
+            
+            # Generar análisis (el informe sigue visible en las siguientes reejecuciones)
+            # Un nuevo clic retoma el trabajo en curso o terminado, o reintenta uno cancelado
+            reintentar = st.button("🚀 Generar Análisis Completo", type="primary")
+            if reintentar:
+                st.session_state['analisis'] = clave
+            
+            if st.session_state.get('analisis') == clave:
+                mostrar_analisis(clave, calcular, df_completo, trabajadores, reintentar)
+        
+        except Exception as e:
+            st.error(f"Error al procesar el archivo: {str(e)}")
+    
+    else:
+        st.info("""
+        ### 📝 Formato esperado del CSV:
+        
+        El archivo CSV debería contener columnas como:
+        - `id_estudiante`, `nombre`, `email`, `tipo_usuario` (estudiante/docente/familiar)
+        - `fecha_registro`, `timestamp`, `grupo_id`, `materia`
+        - `nota` (numérica), `asistencia` (porcentaje), `estado_asistencia` (presente/ausente)
+        - `habilidades` (separadas por comas), `tipo_apoyo`
+        
+        ### 🎯 Ejemplo de estructura:
+        ```
+        id_estudiante,nombre,tipo_usuario,nota,asistencia,materia,habilidades,timestamp
+        1,Juan Pérez,estudiante,4.2,95,Matemáticas,"python,matemáticas,análisis",2024-01-15
+        2,María López,estudiante,3.8,88,Ciencias,"ciencias,investigación",2024-01-16
+        ```
+        ### 🔗 Análisis que realiza:
+        1. Cuenta cuántos usuarios nuevos se registran cada semana y lo muestra claramente en una tabla.
+        2. Identifica qué tipo de usuario se registra más y mostrar porcentajes por categoría.
+        3. Analiza cuántos estudiantes completan su hoja de vida y calcula proporciones de completitud.
+        4. Encuentra las habilidades más comunes en perfiles y muestra las diez más mencionadas.
+        5. Cuenta cuántos familiares revisan el perfil del estudiante y detecta sin interacción.
+        6. Analiza a qué horas del día los familiares ingresan con más frecuencia.
+        7. Calcula el promedio general de notas por grupo y ordenar de mayor a menor.
+        8. Detecta materias con más reprobados y muestra porcentaje de estudiantes con nota baja.
+        9. Calcula el promedio de asistencia por estudiante y muestra su porcentaje total.
+        10. Identifica estudiantes con más de tres ausencias y muestra lista correspondiente.
+        11. Contar qué tipos de apoyo se piden más y muestra los tres principales.
+        12. Analiza cuántas solicitudes se hacen cada mes para ver su frecuencia.
+        13. Genera un resumen estadístico de notas y asistencia agrupado por cada grupo.
+        14. Analiza la relación entre notas y asistencia usando correlación y visualización gráfica."""
+)
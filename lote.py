@@ -0,0 +1,221 @@
+# lote.py
+"""Calcula los indicadores de todos los CSV de un directorio, sin Streamlit.
+
+Uso: python lote.py datos/ --salida resultados/lote --procesos 8
+
+Cada archivo se procesa en un proceso del pool y sus resultados quedan en
+<salida>/<dataset>/: una tabla Parquet (o, con --formato arrow, Arrow IPC
+comprimido) por resultado tabular y un manifiesto JSON con los valores
+escalares, la huella del CSV y los tiempos.
+El dashboard carga esos resultados en lugar de recalcularlos.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from agregacion import PlanAgregacion
+from almacen import nombre_dataset
+from analizador import AnalizadorEducativo
+from cache import huella_ruta
+from esquema import leer_csv
+from instrumentacion import Traza, trazar
+from paralelo import trabajadores_por_defecto
+from resultados_arrow import escribir_ipc, leer_ipc
+
+DIRECTORIO_LOTE = os.path.join('resultados', 'lote')
+MANIFIESTO = 'manifiesto.json'
+TRAZA = 'traza_chrome.json'
+RESUMEN_LOTE = 'resumen_lote.json'
+# Extensión de las tablas de resultados según el formato
+FORMATOS = {'parquet': 'parquet', 'arrow': 'arrow'}
+
+
+def _separar(valor, ruta, tablas):
+    """Valor apto para JSON; las tablas se apartan en tablas con su ruta como nombre"""
+    if isinstance(valor, pd.DataFrame):
+        tablas[ruta] = valor
+        return {'__tabla__': ruta}
+    if isinstance(valor, dict):
+        return {clave: _separar(v, f'{ruta}.{clave}', tablas) for clave, v in valor.items()}
+    if isinstance(valor, np.generic):
+        return valor.item()
+    return valor
+
+
+def _unir(valor, directorio, formato):
+    if isinstance(valor, dict):
+        if '__tabla__' in valor:
+            ruta = os.path.join(directorio, f"{valor['__tabla__']}.{FORMATOS[formato]}")
+            if formato == 'arrow':
+                return leer_ipc(ruta).to_pandas()
+            return pd.read_parquet(ruta)
+        return {clave: _unir(v, directorio, formato) for clave, v in valor.items()}
+    return valor
+
+
+def leer_manifiesto(directorio):
+    ruta = os.path.join(directorio, MANIFIESTO)
+    if not os.path.exists(ruta):
+        return None
+    with open(ruta, 'r') as archivo:
+        manifiesto = json.load(archivo)
+    manifiesto['directorio'] = directorio
+    return manifiesto
+
+
+def guardar_resultados(resultados, directorio, formato='parquet', **metadatos):
+    """Guarda cada tabla en Parquet o Arrow IPC y el resto en el manifiesto (que se escribe al final)"""
+    os.makedirs(directorio, exist_ok=True)
+    tablas = {}
+    valores = {nombre: _separar(valor, nombre, tablas) for nombre, valor in resultados.items()}
+    for nombre, tabla in tablas.items():
+        ruta = os.path.join(directorio, f'{nombre}.{FORMATOS[formato]}')
+        if formato == 'arrow':
+            escribir_ipc(tabla, ruta)
+        else:
+            tabla.to_parquet(ruta)
+
+    ruta = os.path.join(directorio, MANIFIESTO)
+    with open(ruta + '.tmp', 'w') as archivo:
+        json.dump(dict(metadatos, formato=formato, resultados=valores), archivo, ensure_ascii=False)
+    os.replace(ruta + '.tmp', ruta)
+
+
+def cargar_resultados(directorio):
+    """Diccionario de resultados guardado por guardar_resultados"""
+    manifiesto = leer_manifiesto(directorio)
+    return _unir(manifiesto['resultados'], directorio, manifiesto.get('formato', 'parquet'))
+
+
+def listar_resultados(salida=DIRECTORIO_LOTE):
+    """Manifiestos de los resultados precalculados, por nombre de dataset"""
+    manifiestos = {}
+    for directorio in sorted(glob.glob(os.path.join(salida, '*', ''))):
+        manifiesto = leer_manifiesto(directorio.rstrip(os.sep))
+        if manifiesto is not None:
+            manifiestos[os.path.basename(directorio.rstrip(os.sep))] = manifiesto
+    return manifiestos
+
+
+def procesar_archivo(ruta, salida=DIRECTORIO_LOTE, filas_por_bloque=None, forzar=False, traza=False,
+                     aproximado=False, formato='parquet'):
+    """Calcula y guarda los resultados de un CSV; devuelve filas, bytes y tiempos por etapa.
+    
+    Con traza, cada etapa y cada indicador se mide y la traza queda en
+    <directorio>/traza_chrome.json. aproximado (solo por bloques) usa los
+    bocetos de AgregadosParciales. formato es el de las tablas guardadas
+    ('parquet' o 'arrow').
+    """
+    traza = Traza() if traza else None
+    with trazar(traza):
+        estadisticas = _procesar_archivo(ruta, salida, filas_por_bloque, forzar, aproximado, formato)
+    if traza is not None and not estadisticas['omitido']:
+        with open(os.path.join(estadisticas['directorio'], TRAZA), 'w') as archivo:
+            archivo.write(traza.a_chrome())
+    return estadisticas
+
+
+def _procesar_archivo(ruta, salida, filas_por_bloque, forzar, aproximado, formato):
+    inicio = time.perf_counter()
+    huella = huella_ruta(ruta)
+    directorio = os.path.join(salida, nombre_dataset(ruta))
+    estadisticas = {'archivo': ruta, 'directorio': directorio, 'bytes': os.path.getsize(ruta)}
+
+    previo = leer_manifiesto(directorio)
+    if (previo is not None and previo['huella'] == huella and previo.get('aproximado', False) == aproximado
+            and previo.get('formato', 'parquet') == formato and not forzar):
+        return dict(estadisticas, filas=previo['filas'], segundos=time.perf_counter() - inicio, tiempos={}, omitido=True)
+
+    tiempos = {}
+    marca = time.perf_counter()
+    if filas_por_bloque:
+        resultados = AnalizadorEducativo.agregar_por_bloques(ruta, filas_por_bloque, aproximado).finalizar()
+        tiempos['lectura_y_agregacion'] = time.perf_counter() - marca
+    else:
+        df = leer_csv(ruta)
+        tiempos['lectura'] = time.perf_counter() - marca
+        marca = time.perf_counter()
+        df = AnalizadorEducativo(df).limpiar_datos()
+        tiempos['limpieza'] = time.perf_counter() - marca
+        marca = time.perf_counter()
+        # El informe guardado lleva el cubo para los indicadores filtrados del dashboard
+        resultados = PlanAgregacion(df).ejecutar(cubo=True)
+        tiempos['indicadores'] = time.perf_counter() - marca
+
+    marca = time.perf_counter()
+    filas = resultados['informacion_dataset']['registros']
+    guardar_resultados(resultados, directorio, formato, archivo=os.path.basename(ruta), huella=huella,
+                       filas=filas, tiempos=tiempos, aproximado=aproximado)
+    tiempos['escritura'] = time.perf_counter() - marca
+    return dict(estadisticas, filas=filas, segundos=time.perf_counter() - inicio, tiempos=tiempos, omitido=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('directorio', help='Directorio con los CSV')
+    parser.add_argument('--salida', default=DIRECTORIO_LOTE)
+    parser.add_argument('--procesos', type=int, default=trabajadores_por_defecto())
+    parser.add_argument('--filas-por-bloque', type=int, default=None,
+                        help='Procesa cada CSV por bloques (para archivos que no caben en memoria)')
+    parser.add_argument('--aproximado', action='store_true',
+                        help='Con --filas-por-bloque, estima con bocetos de memoria constante (ver aproximado.py)')
+    parser.add_argument('--formato', choices=list(FORMATOS), default='parquet',
+                        help='Formato de las tablas de resultados (arrow: IPC comprimido con zstd, se lee mapeado en memoria)')
+    parser.add_argument('--forzar', action='store_true', help='Recalcula aunque el CSV no haya cambiado')
+    parser.add_argument('--traza', action='store_true',
+                        help=f'Mide cada etapa e indicador y guarda {TRAZA} junto a los resultados')
+    args = parser.parse_args()
+    if args.aproximado and not args.filas_por_bloque:
+        parser.error('--aproximado requiere --filas-por-bloque')
+
+    archivos = sorted(glob.glob(os.path.join(args.directorio, '*.csv')))
+    if not archivos:
+        sys.exit(f"No hay archivos CSV en {args.directorio}")
+
+    inicio = time.perf_counter()
+    procesados, errores = [], []
+    print(f"{'archivo':<30} {'filas':>10} {'MB':>8} {'seg':>8} {'filas/s':>12} {'MB/s':>8}")
+    with ProcessPoolExecutor(args.procesos) as pool:
+        futuros = {pool.submit(procesar_archivo, ruta, args.salida, args.filas_por_bloque, args.forzar, args.traza,
+                               args.aproximado, args.formato): ruta
+                   for ruta in archivos}
+        for futuro in as_completed(futuros):
+            ruta = futuros[futuro]
+            try:
+                estadisticas = futuro.result()
+            except Exception as e:
+                errores.append({'archivo': ruta, 'error': str(e)})
+                print(f"{os.path.basename(ruta):<30} error: {e}")
+                continue
+            procesados.append(estadisticas)
+            megas = estadisticas['bytes'] / 1024 ** 2
+            segundos = estadisticas['segundos']
+            if estadisticas['omitido']:
+                print(f"{os.path.basename(ruta):<30} {estadisticas['filas']:>10} {megas:>8.1f}   sin cambios")
+            else:
+                print(f"{os.path.basename(ruta):<30} {estadisticas['filas']:>10} {megas:>8.1f} {segundos:>8.2f} "
+                      f"{estadisticas['filas'] / segundos:>12,.0f} {megas / segundos:>8.1f}")
+
+    total = time.perf_counter() - inicio
+    filas = sum(e['filas'] for e in procesados if not e['omitido'])
+    megas = sum(e['bytes'] for e in procesados if not e['omitido']) / 1024 ** 2
+    print(f"\n{len(procesados)} archivos ({len(errores)} con error) en {total:.1f} s: "
+          f"{filas / total:,.0f} filas/s, {megas / total:.1f} MB/s")
+
+    os.makedirs(args.salida, exist_ok=True)
+    with open(os.path.join(args.salida, RESUMEN_LOTE), 'w') as archivo:
+        json.dump({'segundos': total, 'procesos': args.procesos, 'archivos': procesados, 'errores': errores},
+                  archivo, indent=2, ensure_ascii=False)
+    if errores:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,592 @@
+# motor_sql.py
+"""Los 14 indicadores como consultas SQL sobre un motor embebido respaldado por archivo.
+
+Con DuckDB instalado, el motor lee el CSV o el Parquet directamente
+(escanear), reparte cada consulta entre varios hilos y desborda a disco
+cuando no le alcanza la memoria. Sin DuckDB se usa SQLite, de la biblioteca
+estándar: el CSV se carga por bloques a una base en disco y las consultas de
+indicadores distintos corren a la vez, cada una en su conexión.
+
+Las consultas calculan los conteos y las sumas; la presentación de cada
+tabla es la misma que usan PlanAgregacion y AgregadosParciales, así que los
+resultados se comparan con el camino de pandas (la referencia) mediante
+diferencias().
+"""
+import contextvars
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from agregacion import (
+    COLUMNAS_HOJA_VIDA, ESTADISTICOS_RESUMEN, INDICADORES, _cuartiles, _pearson, _resultado_consultas,
+    _tabla_apoyos, _tabla_asistencia, _tabla_ausencias, _tabla_habilidades, _tabla_horarios,
+    _tabla_meses, _tabla_promedio_grupo, _tabla_reprobaciones, _tabla_semanas, _tabla_tipos_usuario,
+    _tabla_hoja_vida, contar_habilidades_por_texto,
+)
+from esquema import FORMATOS_FECHA, TIPOS_COLUMNAS, leer_csv
+from instrumentacion import medir
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+TABLA = 'datos'
+FILAS_POR_BLOQUE = 200_000
+
+# Unidades de tiempo (días u horas) transcurridas desde la época, redondeando
+# hacia abajo. En SQLite las fechas se guardan como segundos desde la época,
+# en DuckDB como TIMESTAMP. Las consultas agrupan por esas unidades y el
+# calendario (semana ISO, mes, hora del día) se calcula en pandas sobre los
+# pocos valores distintos, en lugar de fila por fila en SQL.
+_UNIDADES_TIEMPO = {
+    'duckdb': 'CAST(floor(epoch({col}) / {segundos}) AS BIGINT)',
+    'sqlite': '({col} / {segundos}) - ({col} < 0 AND {col} % {segundos} != 0)',
+}
+DIA = 86_400
+HORA = 3_600
+
+
+def motor_por_defecto():
+    return 'duckdb' if duckdb is not None else 'sqlite'
+
+
+def _id(nombre):
+    return '"' + nombre.replace('"', '""') + '"'
+
+
+def _texto(valor):
+    return "'" + str(valor).replace("'", "''") + "'"
+
+
+def _columnas_simples(df):
+    """Categorías como sus valores y nulos de texto como None, para que cada bloque se inserte con los mismos tipos"""
+    df = df.copy(deep=False)
+    for col in df.columns:
+        if isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = np.asarray(df[col])
+        if df[col].dtype == object:
+            df[col] = df[col].astype(object).where(df[col].notna(), None)
+    return df
+
+
+def _tipo_sqlite(serie):
+    if pd.api.types.is_bool_dtype(serie) or pd.api.types.is_integer_dtype(serie) \
+            or pd.api.types.is_datetime64_any_dtype(serie):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(serie):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _valores_sqlite(serie):
+    """Lista de valores de Python aptos para sqlite3 (fechas en segundos, nulos como None)"""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        segundos = serie.to_numpy(dtype='datetime64[s]').astype('int64')
+        return [None if nulo else int(s) for s, nulo in zip(segundos, serie.isna().to_numpy())]
+    # sqlite3 guarda NaN como NULL
+    return serie.tolist()
+
+
+def _etiquetas(indice):
+    """Etiquetas numéricas como números, igual que las categorías que limpia esquema.aplicar_esquema"""
+    numericas = pd.to_numeric(indice, errors='coerce')
+    if len(numericas) and not pd.isna(numericas).any():
+        return pd.Index(numericas, name=indice.name)
+    return indice
+
+
+class MotorSQL:
+    """Base SQL en un archivo (temporal si no se indica ruta) con los indicadores como consultas.
+
+    motor es 'duckdb' o 'sqlite' (por defecto DuckDB si está instalado).
+    memoria limita la memoria de DuckDB (por ejemplo '2GB'); lo que no cabe
+    se desborda al directorio temporal junto a la base.
+    """
+
+    def __init__(self, ruta=None, motor=None, memoria=None):
+        self.motor = motor or motor_por_defecto()
+        if self.motor not in _UNIDADES_TIEMPO:
+            raise ValueError(f'Motor SQL desconocido: {self.motor}')
+        if self.motor == 'duckdb' and duckdb is None:
+            raise ImportError('El motor duckdb requiere el paquete duckdb (pip install duckdb)')
+        self._temporal = None
+        if ruta is None:
+            self._temporal = tempfile.mkdtemp(prefix='eduanalytics_sql_')
+            ruta = os.path.join(self._temporal, f'datos.{self.motor}')
+        self.ruta = ruta
+        self.memoria = memoria
+        self._local = threading.local()
+        self._conexiones = []
+        self._candado = threading.Lock()
+        self._principal = self._conectar()
+
+    # --- Conexiones ---
+
+    def _conectar(self):
+        if self.motor == 'duckdb':
+            conexion = duckdb.connect(self.ruta)
+            conexion.execute(f"SET temp_directory = '{self.ruta}.tmp'")
+            if self.memoria:
+                conexion.execute(f"SET memory_limit = '{self.memoria}'")
+            return conexion
+        conexion = sqlite3.connect(self.ruta, check_same_thread=False)
+        # Base de trabajo: se puede reconstruir desde el CSV, no necesita diario
+        conexion.execute('PRAGMA journal_mode = OFF')
+        conexion.execute('PRAGMA synchronous = OFF')
+        conexion.execute('PRAGMA temp_store = FILE')
+        return conexion
+
+    def _conexion(self):
+        """Conexión del hilo actual: un cursor de DuckDB o una conexión propia de SQLite"""
+        conexion = getattr(self._local, 'conexion', None)
+        if conexion is None:
+            if threading.current_thread() is threading.main_thread():
+                conexion = self._principal
+            elif self.motor == 'duckdb':
+                conexion = self._principal.cursor()
+            else:
+                conexion = self._conectar()
+            self._local.conexion = conexion
+            with self._candado:
+                self._conexiones.append(conexion)
+        return conexion
+
+    def _soltar_conexiones(self):
+        """Cierra las conexiones de los hilos de trabajo (no la principal)"""
+        with self._candado:
+            for conexion in self._conexiones:
+                if conexion is not self._principal:
+                    conexion.close()
+            self._conexiones = []
+
+    def cerrar(self):
+        """Cierra las conexiones y borra la base si era temporal"""
+        self._soltar_conexiones()
+        self._principal.close()
+        if self._temporal is not None:
+            shutil.rmtree(self._temporal, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excepcion):
+        self.cerrar()
+
+    def consultar(self, sql, parametros=()):
+        """Ejecuta una consulta y devuelve el resultado como DataFrame"""
+        cursor = self._conexion().execute(sql, parametros)
+        columnas = [descripcion[0] for descripcion in cursor.description]
+        return pd.DataFrame.from_records(cursor.fetchall(), columns=columnas)
+
+    # --- Carga ---
+
+    @classmethod
+    def desde_csv(cls, archivo, filas_por_bloque=FILAS_POR_BLOQUE, escanear=False, **opciones):
+        """Motor con el CSV ya cargado (o, con escanear y DuckDB, leído directamente)"""
+        motor = cls(**opciones)
+        if escanear:
+            motor.escanear(archivo)
+        else:
+            motor.cargar_csv(archivo, filas_por_bloque)
+        return motor
+
+    def cargar_csv(self, archivo, filas_por_bloque=FILAS_POR_BLOQUE):
+        """Carga el CSV por bloques, limpiando cada uno como AnalizadorEducativo.limpiar_datos"""
+        from analizador import AnalizadorEducativo
+
+        with medir('cargar_sql') as medicion:
+            filas = 0
+            for bloque in leer_csv(archivo, chunksize=filas_por_bloque):
+                filas += self.agregar(AnalizadorEducativo(bloque).limpiar_datos())
+            medicion['filas'] = filas
+        return self
+
+    def agregar(self, df):
+        """Agrega filas ya limpias a la tabla (creándola con el primer bloque); devuelve cuántas"""
+        df = _columnas_simples(df)
+        conexion = self._conexion()
+        existe = TABLA in self._tablas()
+        if self.motor == 'duckdb':
+            conexion.register('_bloque', df)
+            try:
+                if existe:
+                    conexion.execute(f'INSERT INTO {TABLA} BY NAME SELECT * FROM _bloque')
+                else:
+                    conexion.execute(f'CREATE TABLE {TABLA} AS SELECT * FROM _bloque')
+            finally:
+                conexion.unregister('_bloque')
+            return len(df)
+
+        if not existe:
+            columnas = ', '.join(f'{_id(col)} {_tipo_sqlite(df[col])}' for col in df.columns)
+            conexion.execute(f'CREATE TABLE {TABLA} ({columnas})')
+        nombres = ', '.join(_id(col) for col in df.columns)
+        marcas = ', '.join('?' for _ in df.columns)
+        filas = zip(*[_valores_sqlite(df[col]) for col in df.columns])
+        with conexion:
+            conexion.executemany(f'INSERT INTO {TABLA} ({nombres}) VALUES ({marcas})', filas)
+        return len(df)
+
+    def escanear(self, archivo):
+        """Define la tabla como una vista sobre el CSV o Parquet, sin copiarlo (solo DuckDB).
+
+        Un Parquet se lee tal cual (se asume ya limpio). En un CSV, la vista
+        aplica en SQL la limpieza de esquema.aplicar_esquema; a diferencia de
+        pandas, las fechas que no siguen FORMATOS_FECHA quedan nulas en vez
+        de interpretarse con inferencia.
+        """
+        if self.motor != 'duckdb':
+            raise ValueError('escanear requiere el motor duckdb; con SQLite use cargar_csv')
+        ruta = _texto(archivo)
+        if str(archivo).lower().endswith('.parquet'):
+            self._principal.execute(f"CREATE OR REPLACE VIEW {TABLA} AS SELECT * FROM read_parquet({ruta})")
+            return self
+
+        # El dialecto y los tipos se detectan una vez: con auto_detect cada consulta volvería a muestrear el archivo
+        delimitador, comillas, escape, encabezado, saltar, detectadas = self._principal.execute(
+            f"SELECT Delimiter, Quote, Escape, HasHeader, SkipRows, Columns FROM sniff_csv({ruta})").fetchone()
+        columnas = [columna['name'] for columna in detectadas]
+        # Sin comillas en la muestra el sniffer no las fija; como pandas, se asumen comillas dobles
+        comillas, escape = [valor if valor and valor != '(empty)' else '"' for valor in (comillas, escape)]
+        # Las columnas declaradas se leen como texto y se convierten en la vista
+        tipos = ', '.join(
+            f"{_texto(columna['name'])}: "
+            f"{_texto('VARCHAR' if columna['name'] in TIPOS_COLUMNAS or columna['name'] in FORMATOS_FECHA else columna['type'])}"
+            for columna in detectadas)
+        opciones = (f", auto_detect = false, delim = {_texto(delimitador)}, quote = {_texto(comillas)}, "
+                    f"escape = {_texto(escape)}, header = {str(bool(encabezado)).lower()}, skip = {int(saltar)}, "
+                    f"columns = {{{tipos}}}")
+        expresiones = []
+        for col in columnas:
+            if col in FORMATOS_FECHA:
+                expresion = f"try_strptime(trim({_id(col)}), '{FORMATOS_FECHA[col]}')"
+            elif TIPOS_COLUMNAS.get(col) == 'float32':
+                expresion = f'try_cast(trim({_id(col)}) AS DOUBLE)'
+            elif col in TIPOS_COLUMNAS:
+                expresion = f'trim({_id(col)})'
+            else:
+                expresion = _id(col)
+            expresiones.append(f'{expresion} AS {_id(col)}')
+        self._principal.execute(
+            f"CREATE OR REPLACE VIEW {TABLA} AS SELECT {', '.join(expresiones)} "
+            f"FROM read_csv({ruta}{opciones})")
+        return self
+
+    def _tablas(self):
+        if self.motor == 'duckdb':
+            return {fila[0] for fila in self._conexion().execute(
+                'SELECT table_name FROM information_schema.tables').fetchall()}
+        return {fila[0] for fila in self._conexion().execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')").fetchall()}
+
+    @property
+    def columnas(self):
+        cursor = self._conexion().execute(f'SELECT * FROM {TABLA} LIMIT 0')
+        return [descripcion[0] for descripcion in cursor.description]
+
+    @property
+    def registros(self):
+        return int(self._conexion().execute(f'SELECT COUNT(*) FROM {TABLA}').fetchone()[0])
+
+    def _tiene(self, *columnas):
+        disponibles = self.columnas
+        return all(col in disponibles for col in columnas)
+
+    def _por_tiempo(self, col, segundos, donde=None):
+        """Filas por unidad de tiempo de col, como Serie indexada por el inicio de cada unidad"""
+        filtro = f'{_id(col)} IS NOT NULL' + (f' AND {donde}' if donde else '')
+        unidad = _UNIDADES_TIEMPO[self.motor].format(col=_id(col), segundos=segundos)
+        conteo = self.consultar(f'SELECT {unidad} AS unidad, COUNT(*) AS n FROM {TABLA} WHERE {filtro} GROUP BY 1')
+        inicios = pd.to_datetime(conteo['unidad'].to_numpy(dtype='int64') * segundos, unit='s')
+        return pd.Series(conteo['n'].to_numpy(dtype='int64'), index=inicios)
+
+    def _conteo(self, col, donde=None):
+        """Filas por valor no nulo de col, como Serie indexada por el valor"""
+        filtro = f'{_id(col)} IS NOT NULL' + (f' AND {donde}' if donde else '')
+        conteo = self.consultar(f'SELECT {_id(col)} AS valor, COUNT(*) AS n FROM {TABLA} '
+                                f'WHERE {filtro} GROUP BY 1')
+        return pd.Series(conteo['n'].to_numpy(dtype='int64'), index=_etiquetas(pd.Index(conteo['valor'], name=col)))
+
+    def _por_estudiante(self, agregado, donde=None, having=None):
+        """Serie agregado(...) por id_estudiante no nulo, ordenada por id"""
+        filtro = 'id_estudiante IS NOT NULL' + (f' AND {donde}' if donde else '')
+        sql = f'SELECT id_estudiante, {agregado} AS valor FROM {TABLA} WHERE {filtro} GROUP BY 1'
+        if having:
+            sql += f' HAVING {having}'
+        tabla = self.consultar(sql)
+        return pd.Series(tabla['valor'].to_numpy(), index=pd.Index(tabla['id_estudiante'], name='id_estudiante')).sort_index()
+
+    # --- Indicadores ---
+
+    def usuarios_nuevos_semana(self):
+        """Calcula usuarios nuevos por semana"""
+        if self._tiene('fecha_registro'):
+            dias = self._por_tiempo('fecha_registro', DIA)
+            año = pd.Series(dias.index.year, name='año_registro')
+            semana = pd.Series(dias.index.isocalendar().week.to_numpy(), name='semana_registro')
+            return _tabla_semanas(pd.Series(dias.to_numpy()).groupby([año, semana]).sum())
+        return pd.DataFrame()
+
+    def tipo_usuario_mas_registrado(self):
+        """Analiza distribución de tipos de usuario"""
+        if self._tiene('tipo_usuario'):
+            return _tabla_tipos_usuario(self._conteo('tipo_usuario'))
+        return pd.DataFrame()
+
+    def hoja_vida_completa(self):
+        """Analiza completitud de hojas de vida"""
+        columnas_existentes = [col for col in COLUMNAS_HOJA_VIDA if col in self.columnas]
+        if columnas_existentes:
+            completas = ' AND '.join(f'{_id(col)} IS NOT NULL' for col in columnas_existentes)
+            conteo = self.consultar(f'SELECT CASE WHEN {completas} THEN 1 ELSE 0 END AS completado, '
+                                    f'COUNT(*) AS n FROM {TABLA} GROUP BY 1')
+            completado = pd.Series(conteo['n'].to_numpy(dtype='int64'), index=conteo['completado'].astype(bool))
+            return _tabla_hoja_vida(completado, int(completado.sum()))
+        return pd.DataFrame()
+
+    def habilidades_mas_frecuentes(self):
+        """Encuentra las habilidades más frecuentes"""
+        if self._tiene('habilidades'):
+            # SQL cuenta filas por texto distinto; cada texto se separa una vez en pandas
+            textos = self._conteo('habilidades')
+            return _tabla_habilidades(contar_habilidades_por_texto(textos.index.astype(str), textos.to_numpy()))
+        return pd.DataFrame()
+
+    def consultas_familiares(self):
+        """Analiza consultas familiares a perfiles"""
+        if self._tiene('id_estudiante', 'tipo_usuario', 'timestamp'):
+            estudiantes = self.consultar(
+                "SELECT id_estudiante, SUM(CASE WHEN tipo_usuario = 'familiar' THEN 1 ELSE 0 END) AS consultas, "
+                "MAX(CASE WHEN tipo_usuario = 'estudiante' THEN 1 ELSE 0 END) AS es_estudiante "
+                f"FROM {TABLA} WHERE id_estudiante IS NOT NULL AND tipo_usuario IN ('familiar', 'estudiante') "
+                'GROUP BY 1').set_index('id_estudiante').sort_index()
+            estudiante_nulo = self._conexion().execute(
+                f"SELECT COUNT(*) FROM {TABLA} WHERE tipo_usuario = 'estudiante' AND id_estudiante IS NULL").fetchone()[0]
+            return _resultado_consultas(estudiantes['consultas'].astype('int64'),
+                                        estudiantes['es_estudiante'] > 0, estudiante_nulo > 0)
+        return {}
+
+    def horarios_acceso_familiares(self):
+        """Analiza horarios de acceso de familiares"""
+        if self._tiene('timestamp', 'tipo_usuario'):
+            horas = self._por_tiempo('timestamp', HORA, "tipo_usuario = 'familiar'")
+            horas = horas.groupby(horas.index.hour).sum()
+            return _tabla_horarios(horas.reindex(pd.RangeIndex(24), fill_value=0))
+        return pd.DataFrame()
+
+    def _por_grupo(self, agregados, col='grupo_id'):
+        tabla = self.consultar(f'SELECT {_id(col)} AS clave, {agregados} FROM {TABLA} '
+                               f'WHERE {_id(col)} IS NOT NULL GROUP BY 1')
+        tabla.index = _etiquetas(pd.Index(tabla.pop('clave'), name=col))
+        return tabla.sort_index()
+
+    def promedio_notas_grupo(self):
+        """Calcula promedio general de notas por grupo"""
+        if self._tiene('grupo_id', 'nota'):
+            medias = self._por_grupo('AVG(nota) AS media')['media'].astype('float64')
+            return _tabla_promedio_grupo(medias)
+        return pd.DataFrame()
+
+    def materias_mas_reprobaciones(self):
+        """Identifica materias con más reprobaciones"""
+        if self._tiene('materia', 'nota'):
+            reprobaciones_materia = self._por_grupo(
+                'SUM(CASE WHEN nota < 3.0 THEN 1 ELSE 0 END) AS reprobados, COUNT(*) AS total_estudiantes', 'materia')
+            return _tabla_reprobaciones(reprobaciones_materia.astype('int64'))
+        return pd.DataFrame()
+
+    def asistencia_promedio_estudiante(self):
+        """Calcula asistencia promedio por estudiante"""
+        if self._tiene('id_estudiante', 'asistencia'):
+            return _tabla_asistencia(self._por_estudiante('AVG(asistencia)').astype('float64'))
+        return pd.DataFrame()
+
+    def estudiantes_ausencias_recurrentes(self):
+        """Identifica estudiantes con ausencias recurrentes"""
+        if self._tiene('id_estudiante', 'estado_asistencia'):
+            # El umbral se aplica en la consulta: solo vuelven los estudiantes con más de 3
+            ausencias = self._por_estudiante('COUNT(*)', "estado_asistencia = 'ausente'", 'COUNT(*) > 3')
+            return _tabla_ausencias(ausencias.astype('int64'))
+        return pd.DataFrame()
+
+    def tipos_apoyo_solicitados(self):
+        """Analiza tipos de apoyo más solicitados"""
+        if self._tiene('tipo_apoyo'):
+            return _tabla_apoyos(self._conteo('tipo_apoyo'))
+        return pd.DataFrame()
+
+    def frecuencia_solicitudes_mes(self):
+        """Analiza frecuencia de solicitudes por mes"""
+        if self._tiene('timestamp'):
+            horas = self._por_tiempo('timestamp', HORA)
+            return _tabla_meses(horas.groupby(horas.index.year * 12 + horas.index.month - 1).sum())
+        return pd.DataFrame()
+
+    def resumen_estadistico_grupo(self):
+        """Genera resumen estadístico por grupo"""
+        if self._tiene('grupo_id', 'nota', 'asistencia'):
+            resumen = {}
+            for col in ESTADISTICOS_RESUMEN:
+                # Un solo recorrido por columna: el histograma de valores por grupo
+                # da conteo, sumas, extremos y cuartiles exactos, como en los parciales.
+                # Los nulos quedan en su propia cubeta para conservar los grupos sin valores.
+                histograma = self.consultar(f'SELECT grupo_id, {_id(col)} AS valor, COUNT(*) AS n FROM {TABLA} '
+                                            'WHERE grupo_id IS NOT NULL GROUP BY 1, 2')
+                claves = _etiquetas(pd.Index(histograma['grupo_id'], name='grupo_id'))
+                grupos = claves.unique().sort_values()
+                con_valor = histograma['valor'].notna().to_numpy()
+                histograma, claves = histograma[con_valor], claves[con_valor]
+                valores = histograma['valor'].to_numpy(dtype='float64')
+                filas = histograma['n'].to_numpy(dtype='float64')
+                por_grupo = pd.DataFrame({'n': filas, 'suma': valores * filas, 'cuadrados': valores ** 2 * filas,
+                                          'minimo': valores, 'maximo': valores}, index=claves).groupby(level=0)
+                sumas = por_grupo[['n', 'suma', 'cuadrados']].sum().reindex(grupos, fill_value=0)
+                histograma = pd.Series(filas, index=pd.MultiIndex.from_arrays([claves, valores])).sort_index()
+                cuartiles = _cuartiles(histograma, [0.25, 0.5, 0.75]).reindex(grupos)
+                n, suma = sumas['n'], sumas['suma']
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    media = (suma / n).where(n > 0)
+                    varianza = ((sumas['cuadrados'] - suma ** 2 / n) / (n - 1)).where(n > 1)
+                resumen[col] = pd.DataFrame({
+                    'count': n,
+                    'mean': media,
+                    'std': np.sqrt(varianza.clip(lower=0)),
+                    'min': por_grupo['minimo'].min().reindex(grupos),
+                    '25%': cuartiles[0.25],
+                    '50%': cuartiles[0.5],
+                    '75%': cuartiles[0.75],
+                    'max': por_grupo['maximo'].max().reindex(grupos)
+                })
+            return pd.concat(resumen, axis=1).round(2)
+        return pd.DataFrame()
+
+    def correlacion_nota_asistencia(self):
+        """Calcula correlación entre nota y asistencia"""
+        if self._tiene('nota', 'asistencia'):
+            sumas = self._conexion().execute(
+                'SELECT COUNT(*), SUM(nota), SUM(asistencia), SUM(nota * nota), SUM(asistencia * asistencia), '
+                f'SUM(nota * asistencia) FROM {TABLA} WHERE nota IS NOT NULL AND asistencia IS NOT NULL').fetchone()
+            sumas = [np.nan if valor is None else float(valor) for valor in sumas]
+            return round(float(_pearson(*sumas)), 4)
+        return None
+
+    def calcular(self, nombre):
+        """Calcula un indicador y lo mide en la traza activa"""
+        with medir(nombre, 'analisis'):
+            return getattr(self, nombre)()
+
+    def ejecutar(self, indicadores=INDICADORES, trabajadores=None):
+        """Calcula los indicadores pedidos; con trabajadores, varias consultas a la vez"""
+        if not trabajadores:
+            return {nombre: self.calcular(nombre) for nombre in indicadores}
+        try:
+            with ThreadPoolExecutor(trabajadores, thread_name_prefix='sql') as pool:
+                futuros = {nombre: pool.submit(contextvars.copy_context().run, self.calcular, nombre)
+                           for nombre in indicadores}
+                return {nombre: futuro.result() for nombre, futuro in futuros.items()}
+        finally:
+            # Los hilos del pool terminan con él: sus conexiones ya no se reutilizan
+            self._soltar_conexiones()
+
+
+# --- Equivalencia con el camino de pandas ---
+
+def _valores_comparables(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        # pandas < 2.2 avisa al convertir a número o texto una categórica con nulos
+        serie = serie.astype(object)
+    numericos = pd.to_numeric(serie, errors='coerce')
+    if numericos.notna().sum() == serie.notna().sum():
+        return numericos.to_numpy(dtype='float64')
+    return serie.astype(str).to_numpy()
+
+
+def _iguales(a, b, tolerancia):
+    """Igualdad elemento a elemento de dos columnas comparables (con tolerancia si son números)"""
+    if a.dtype.kind == 'f' and b.dtype.kind == 'f':
+        return np.isclose(a, b, rtol=1e-6, atol=tolerancia, equal_nan=True)
+    return a.astype(str) == b.astype(str)
+
+
+def _diferencia_tablas(referencia, otra, tolerancia):
+    if list(referencia.columns) != list(otra.columns):
+        return f'columnas distintas: {list(referencia.columns)} / {list(otra.columns)}'
+    if len(referencia) != len(otra):
+        return f'{len(referencia)} filas / {len(otra)} filas'
+    if not len(referencia):
+        # Sin filas pandas puede perder el nombre del índice: no hay valores que alinear
+        return None
+    if isinstance(referencia.columns, pd.MultiIndex):
+        # Resumen por grupo: el índice pasa a ser columnas y se compara fila a fila
+        referencia, otra = referencia.reset_index(), otra.reset_index()
+    etiqueta = None
+    if len(referencia.columns) > 1 and referencia.iloc[:, 0].is_unique:
+        # Tablas con una fila por etiqueta: un redondeo distinto puede cambiar el orden
+        # de dos valores casi iguales, así que la etiqueta se compara aparte
+        etiqueta = referencia.columns[0]
+    columnas = [col for col in referencia.columns if col != etiqueta]
+    # Los valores se comparan fila a fila: también la secuencia de la columna por la que se ordena
+    for col in columnas:
+        if not _iguales(_valores_comparables(referencia[col]), _valores_comparables(otra[col]), tolerancia).all():
+            return f'valores distintos en {col}'
+    if etiqueta is not None:
+        a, b = _valores_comparables(referencia[etiqueta]), _valores_comparables(otra[etiqueta])
+        if pd.Index(a).is_monotonic_increasing:
+            # Tabla ordenada por la etiqueta: el orden debe ser el mismo
+            tramo = np.arange(len(a))
+        else:
+            # Ordenada por valor: las etiquetas solo pueden cambiar de lugar entre filas empatadas
+            # en todos los valores, así que dentro de cada tramo de empates se ordenan por etiqueta
+            cambios = np.zeros(len(a) - 1, dtype=bool)
+            for col in columnas:
+                valores = _valores_comparables(referencia[col])
+                cambios |= ~_iguales(valores[1:], valores[:-1], tolerancia)
+            tramo = np.concatenate([[0], np.cumsum(cambios)])
+        a, b = a.astype(str), b.astype(str)
+        if not np.array_equal(a[np.lexsort((a, tramo))], b[np.lexsort((b, tramo))]):
+            return f'orden distinto en {etiqueta}'
+    return None
+
+
+def _diferencia(referencia, otro, tolerancia):
+    if isinstance(referencia, pd.DataFrame):
+        if not isinstance(otro, pd.DataFrame):
+            return f'se esperaba una tabla y se obtuvo {type(otro).__name__}'
+        return _diferencia_tablas(referencia, otro, tolerancia)
+    if isinstance(referencia, dict):
+        if not isinstance(otro, dict) or set(referencia) != set(otro):
+            return 'claves distintas'
+        for clave in referencia:
+            diferencia = _diferencia(referencia[clave], otro[clave], tolerancia)
+            if diferencia:
+                return f'{clave}: {diferencia}'
+        return None
+    if referencia is None or otro is None:
+        return None if referencia is otro else f'{referencia} / {otro}'
+    if not np.isclose(referencia, otro, rtol=1e-6, atol=tolerancia, equal_nan=True):
+        return f'{referencia} / {otro}'
+    return None
+
+
+def diferencias(referencia, resultados, indicadores=INDICADORES, tolerancia=0.01):
+    """Indicadores en que resultados no coincide con la referencia (nombre: motivo).
+
+    tolerancia admite una unidad en el último decimal redondeado: pandas
+    promedia notas y asistencia en float32 y SQL en float64, y un valor como
+    79.025 puede redondear hacia lados distintos. El orden de las filas
+    también cuenta; solo pueden cambiar de lugar las filas empatadas de una
+    tabla ordenada por valor.
+    """
+    encontradas = {}
+    for nombre in indicadores:
+        diferencia = _diferencia(referencia.get(nombre), resultados.get(nombre), tolerancia)
+        if diferencia:
+            encontradas[nombre] = diferencia
+    return encontradas
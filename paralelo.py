@@ -0,0 +1,98 @@
+# paralelo.py
+import contextvars
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from agregacion import INDICADORES, PlanAgregacion
+from graficos import renderizar_grafico
+from instrumentacion import Traza, traza_activa, trazar
+
+# Resultados del informe que no son indicadores pero se calculan igual
+EXTRAS = ('informacion_dataset', 'matriz_correlacion', 'cubo')
+
+# Plan de cada proceso del pool (el DataFrame llega por fork, sin serializarlo)
+_PLAN = None
+
+
+def trabajadores_por_defecto():
+    """Trabajadores del pool: EDUANALYTICS_TRABAJADORES o los núcleos disponibles (máx. 8)"""
+    configurados = os.environ.get('EDUANALYTICS_TRABAJADORES')
+    if configurados:
+        return max(1, int(configurados))
+    return min(8, os.cpu_count() or 1)
+
+
+def _tarea(plan, nombre, graficar):
+    """Calcula un resultado y, si corresponde, renderiza su gráfico en el mismo trabajador"""
+    resultado = plan.calcular(nombre)
+    grafico = renderizar_grafico(nombre, resultado) if nombre in graficar else None
+    return nombre, resultado, grafico
+
+
+def _iniciar_proceso(df):
+    global _PLAN
+    _PLAN = PlanAgregacion(df)
+
+
+def _tarea_proceso(nombre, graficar, medir):
+    """Tarea del pool de procesos; con medir devuelve también los eventos medidos en el proceso"""
+    with trazar(Traza() if medir else None) as traza:
+        nombre, resultado, grafico = _tarea(_PLAN, nombre, graficar)
+    return nombre, resultado, grafico, traza.eventos if traza is not None else []
+
+
+def informe_en_paralelo(df, nombres=INDICADORES + EXTRAS, trabajadores=None, procesos=False, graficar=True):
+    """Calcula los indicadores y sus gráficos en un pool y los entrega a medida que terminan.
+
+    nombres son indicadores o EXTRAS; graficar es True, False o los nombres
+    cuyo gráfico se renderiza. Devuelve un generador de (nombre, resultado,
+    png o None). Con hilos, los indicadores comparten las columnas derivadas
+    del plan; con procesos (solo donde existe fork) cada proceso recibe el
+    DataFrame por copia en escritura y recalcula lo que necesita, pero no
+    compite por el GIL. Con trabajadores=0 todo se calcula en el hilo actual,
+    sin pool (útil para perfilar con cProfile). Las mediciones de las tareas
+    quedan en la traza activa de quien consume el generador.
+    """
+    trabajadores = trabajadores_por_defecto() if trabajadores is None else trabajadores
+    graficar = frozenset(nombres if graficar is True else graficar or ())
+    traza = traza_activa()
+    if trabajadores == 0:
+        plan = PlanAgregacion(df)
+        for nombre in nombres:
+            yield _tarea(plan, nombre, graficar)
+        return
+    if procesos:
+        pool = ProcessPoolExecutor(trabajadores, mp_context=multiprocessing.get_context('fork'),
+                                   initializer=_iniciar_proceso, initargs=(df,))
+        enviar = lambda nombre: pool.submit(_tarea_proceso, nombre, graficar, traza is not None)
+    else:
+        plan = PlanAgregacion(df)
+        pool = ThreadPoolExecutor(trabajadores)
+        # Cada tarea corre en una copia del contexto actual, con la traza activa
+        enviar = lambda nombre: pool.submit(contextvars.copy_context().run, _tarea, plan, nombre, graficar)
+
+    with pool:
+        futuros = [enviar(nombre) for nombre in nombres]
+        try:
+            for futuro in as_completed(futuros):
+                if not procesos:
+                    yield futuro.result()
+                    continue
+                nombre, resultado, grafico, eventos = futuro.result()
+                if traza is not None:
+                    traza.agregar(eventos)
+                yield nombre, resultado, grafico
+        finally:
+            for futuro in futuros:
+                futuro.cancel()
+
+
+def recolectar(eventos):
+    """Junta la salida de informe_en_paralelo en los diccionarios de resultados y gráficos"""
+    resultados, graficos = {}, {}
+    for nombre, resultado, grafico in eventos:
+        resultados[nombre] = resultado
+        if grafico is not None:
+            graficos[nombre] = grafico
+    return resultados, graficos
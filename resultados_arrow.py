@@ -0,0 +1,90 @@
+# resultados_arrow.py
+"""Resultados del informe como tablas Arrow: páginas para la interfaz y archivos IPC.
+
+Cada tabla de resultados se convierte a Arrow una sola vez mientras vive
+en la caché (las columnas numéricas sin nulos no se copian) y la interfaz
+muestra cortes de esa tabla: un corte no copia datos, y solo las filas de
+la página se envían al navegador. Los resultados completos se guardan como
+Arrow IPC comprimido (ver lote.guardar_resultados), que se lee mapeando el
+archivo en memoria.
+"""
+import io
+import math
+import os
+import threading
+import weakref
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+
+FILAS_POR_PAGINA = 50
+COMPRESION_IPC = 'zstd'
+
+_CONVERTIDAS = {}
+_CANDADO = threading.Lock()
+
+
+def a_arrow(tabla):
+    """Tabla Arrow para mostrar un resultado: columnas de varios niveles unidas y el índice, si tiene nombre, como columna"""
+    if isinstance(tabla.columns, pd.MultiIndex):
+        tabla = tabla.set_axis([' '.join(str(nivel) for nivel in col if nivel != '') for col in tabla.columns], axis=1)
+    if all(nombre is None for nombre in tabla.index.names):
+        return pa.Table.from_pandas(tabla, preserve_index=False)
+    convertida = pa.Table.from_pandas(tabla, preserve_index=True)
+    # from_pandas deja el índice al final; se muestra primero (select no copia)
+    niveles = tabla.index.nlevels
+    return convertida.select(convertida.column_names[-niveles:] + convertida.column_names[:-niveles])
+
+
+def tabla_arrow(tabla):
+    """a_arrow de un resultado, calculada una vez mientras el DataFrame siga vivo"""
+    clave = id(tabla)
+    with _CANDADO:
+        convertida = _CONVERTIDAS.get(clave)
+    if convertida is None:
+        convertida = a_arrow(tabla)
+        with _CANDADO:
+            if clave not in _CONVERTIDAS:
+                _CONVERTIDAS[clave] = convertida
+                # Al salir el DataFrame de la caché se suelta también su tabla Arrow
+                weakref.finalize(tabla, _CONVERTIDAS.pop, clave, None)
+    return convertida
+
+
+def paginas(filas, filas_por_pagina=FILAS_POR_PAGINA):
+    return max(math.ceil(filas / filas_por_pagina), 1)
+
+
+def pagina(tabla, numero, filas_por_pagina=FILAS_POR_PAGINA):
+    """Filas de la página numero (desde 0) como corte de la tabla Arrow, sin copiar"""
+    return tabla.slice(numero * filas_por_pagina, filas_por_pagina)
+
+
+def escribir_ipc(tabla, ruta, compresion=COMPRESION_IPC):
+    """Escribe un DataFrame como archivo Arrow IPC (con los metadatos para volver a pandas tal cual).
+
+    Con compresion=None los buffers quedan sin comprimir y leer_ipc los usa
+    directamente desde el archivo mapeado; comprimidos ocupan menos pero se
+    descomprimen al leerlos.
+    """
+    if isinstance(tabla, pd.DataFrame):
+        tabla = pa.Table.from_pandas(tabla)
+    opciones = pa.ipc.IpcWriteOptions(compression=compresion)
+    with pa.OSFile(ruta, 'wb') as destino:
+        with pa.ipc.new_file(destino, tabla.schema, options=opciones) as escritor:
+            escritor.write_table(tabla)
+
+
+def leer_ipc(ruta):
+    """Tabla Arrow de un archivo IPC, mapeado en memoria"""
+    return pa.ipc.open_file(pa.memory_map(ruta, 'r')).read_all()
+
+
+def empaquetar(directorio):
+    """Bytes de un zip con los archivos del directorio (sin volver a comprimir: los IPC ya lo están)"""
+    salida = io.BytesIO()
+    with zipfile.ZipFile(salida, 'w', zipfile.ZIP_STORED) as paquete:
+        for nombre in sorted(os.listdir(directorio)):
+            paquete.write(os.path.join(directorio, nombre), nombre)
+    return salida.getvalue()
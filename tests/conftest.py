@@ -0,0 +1,39 @@
+# tests/conftest.py
+import os
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos de la aplicación y el generador de datos sintéticos de los benchmarks
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, 'benchmarks'))
+
+from datos_sinteticos import generar_datos  # noqa: E402
+from equivalencia import MUESTRA  # noqa: E402
+
+
+@pytest.fixture(scope='session')
+def crudos():
+    """Filas sintéticas sin limpiar, con los tipos que produce el generador"""
+    return generar_datos(5_000, semilla=1)
+
+
+@pytest.fixture(scope='session', params=['muestra', 'sinteticos', 'solo encabezado', 'grupo_id vacío',
+                                        'grupo_id con texto'])
+def ruta(request, crudos, tmp_path_factory):
+    """CSV de cada caso: el ejemplo, datos sintéticos, sin filas, sin ningún grupo y con grupo_id de texto al final"""
+    if request.param == 'muestra':
+        return MUESTRA
+    datos = {
+        'sinteticos': crudos,
+        'solo encabezado': crudos.iloc[:0],
+        'grupo_id vacío': crudos.assign(grupo_id=None),
+        'grupo_id con texto': crudos.assign(grupo_id=crudos['grupo_id'].astype(object)),
+    }[request.param]
+    if request.param == 'grupo_id con texto':
+        datos.loc[[4000, 4900], 'grupo_id'] = ['A1', 'G-7']
+    ruta = tmp_path_factory.mktemp('csv') / 'datos.csv'
+    datos.to_csv(ruta, index=False)
+    return str(ruta)
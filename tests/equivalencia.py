@@ -0,0 +1,30 @@
+# tests/equivalencia.py
+"""Referencia de las pruebas: los métodos de AnalizadorEducativo, uno por indicador."""
+import os
+
+import pandas as pd
+
+from agregacion import INDICADORES
+from analizador import AnalizadorEducativo
+from motor_sql import diferencias
+
+MUESTRA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'datos_educativos.csv')
+
+
+def limpio(datos):
+    return AnalizadorEducativo(datos).limpiar_datos()
+
+
+def referencia(df, indicadores=INDICADORES):
+    """Un método de AnalizadorEducativo por indicador, cada uno sobre su propia copia"""
+    return {nombre: getattr(AnalizadorEducativo(df.copy()), nombre)() for nombre in indicadores}
+
+
+def sin_diferencias(esperado, resultados, indicadores=INDICADORES):
+    """Indicadores distintos de la referencia (vacío si todos coinciden)"""
+    resumen = esperado.get('resumen_estadistico_grupo')
+    if isinstance(resumen, pd.Series) and resumen.empty:
+        # describe() sin ningún grupo devuelve una Serie vacía; los demás caminos, la tabla sin filas
+        assert resultados['resumen_estadistico_grupo'].empty
+        indicadores = [nombre for nombre in indicadores if nombre != 'resumen_estadistico_grupo']
+    return diferencias(esperado, resultados, indicadores)
@@ -0,0 +1,34 @@
+# tests/test_agregados_parciales.py
+import pytest
+
+from agregacion import AgregadosParciales
+from analizador import AnalizadorEducativo
+from equivalencia import limpio, referencia, sin_diferencias
+from esquema import leer_csv
+
+
+def test_por_bloques(ruta):
+    esperado = referencia(limpio(leer_csv(ruta)))
+    parciales = AnalizadorEducativo.agregar_por_bloques(ruta, filas_por_bloque=40)
+    assert sin_diferencias(esperado, parciales.finalizar()) == {}
+
+
+def test_combinados_y_guardados(ruta, tmp_path):
+    df = limpio(leer_csv(ruta))
+    mitad = len(df) // 2
+    guardado = AgregadosParciales().actualizar(df.iloc[:mitad])
+    guardado.guardar(str(tmp_path))
+    combinado = AgregadosParciales.cargar(str(tmp_path)).combinar(AgregadosParciales().actualizar(df.iloc[mitad:]))
+    assert combinado.registros == len(df)
+    assert sin_diferencias(referencia(df), combinado.finalizar()) == {}
+
+
+def test_sin_bloques():
+    resultados = AgregadosParciales().finalizar()
+    assert resultados['informacion_dataset']['registros'] == 0
+    assert resultados['promedio_notas_grupo'].empty
+
+
+def test_no_combina_exactos_con_aproximados():
+    with pytest.raises(ValueError):
+        AgregadosParciales().combinar(AgregadosParciales(aproximado=True))
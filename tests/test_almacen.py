@@ -0,0 +1,96 @@
+# tests/test_almacen.py
+import io
+
+import pyarrow as pa
+import pytest
+
+from almacen import AlmacenColumnar, ArchivoDistinto, nombre_dataset
+from equivalencia import limpio, referencia, sin_diferencias
+from esquema import leer_csv
+
+
+def csv(datos):
+    return io.BytesIO(datos.to_csv(index=False).encode())
+
+
+def test_export_que_crece(ruta, tmp_path):
+    with open(ruta, 'rb') as archivo:
+        contenido = archivo.read()
+    # Primero la mitad de las filas, después el archivo completo
+    corte = contenido.index(b'\n', len(contenido) // 2) + 1
+    almacen = AlmacenColumnar(str(tmp_path / 'almacen'))
+    anexadas = [almacen.ingerir(io.BytesIO(parte), limpio) for parte in (contenido[:corte], contenido)]
+
+    df = limpio(leer_csv(ruta))
+    assert sum(anexadas) == almacen.filas == len(almacen.leer()) == len(df)
+    if not len(df):
+        # Sin partes el almacén no conoce las columnas: solo se comprueba que finalice vacío
+        assert almacen.estado().finalizar()['informacion_dataset']['registros'] == 0
+        return
+    esperado = referencia(df)
+    assert sin_diferencias(esperado, almacen.estado().finalizar()) == {}
+    # El estado guardado en disco continúa en otra sesión sin releer las partes
+    assert sin_diferencias(esperado, AlmacenColumnar(str(tmp_path / 'almacen')).estado().finalizar()) == {}
+
+
+def test_anexa_solo_las_filas_nuevas(crudos, tmp_path):
+    almacen = AlmacenColumnar(str(tmp_path))
+    assert almacen.ingerir(csv(crudos.iloc[:3000]), limpio) == 3000
+    # Otro export con parte de las filas ya guardadas, en otro orden
+    assert almacen.ingerir(csv(crudos.iloc[2000:4000].iloc[::-1]), limpio) == 1000
+    assert almacen.filas == 4000
+    assert almacen.ingerir(csv(crudos.iloc[:4000]), limpio) == 0
+
+
+def test_rechaza_otro_dataset(crudos, tmp_path):
+    almacen = AlmacenColumnar(str(tmp_path))
+    almacen.ingerir(csv(crudos.iloc[:2000]), limpio)
+    with pytest.raises(ArchivoDistinto):
+        almacen.ingerir(csv(crudos.iloc[3000:3500]), limpio)
+    with pytest.raises(ArchivoDistinto):
+        almacen.ingerir(csv(crudos.iloc[:2500].drop(columns='habilidades')), limpio)
+    assert almacen.filas == 2000
+    # forzar anexa un export que trae solo filas nuevas
+    assert almacen.ingerir(csv(crudos.iloc[3000:3500]), limpio, forzar=True) == 500
+    assert almacen.filas == 2500
+
+
+def test_lee_solo_las_columnas_pedidas(crudos, tmp_path):
+    almacen = AlmacenColumnar(str(tmp_path))
+    almacen.anexar(limpio(crudos.iloc[:100].copy()))
+    assert list(almacen.leer(['nota', 'grupo_id', 'no_existe']).columns) == ['nota', 'grupo_id']
+
+
+def test_nombre_dataset():
+    assert nombre_dataset('/tmp/Datos 2024 (final).csv') == 'Datos_2024_final_'
+    assert nombre_dataset('') == 'dataset'
+
+
+def test_grupos_de_texto_en_una_parte_posterior(crudos, tmp_path):
+    almacen = AlmacenColumnar(str(tmp_path))
+    almacen.ingerir(csv(crudos.iloc[:3000]), limpio)
+    assert list(almacen.leer(['grupo_id'])['grupo_id'].cat.categories) == sorted(crudos['grupo_id'].unique())
+
+    datos = crudos.assign(grupo_id=crudos['grupo_id'].astype(object))
+    datos.loc[4000, 'grupo_id'] = 'G-7'
+    assert almacen.ingerir(csv(datos), limpio) == 2000
+    # Con un grupo de texto toda la columna queda en texto, como al leer el archivo completo
+    esperado = limpio(leer_csv(csv(datos)))
+    assert almacen.leer(['grupo_id'])['grupo_id'].astype(object).tolist() == esperado['grupo_id'].tolist()
+    assert sin_diferencias(referencia(esperado), almacen.estado().finalizar()) == {}
+
+
+def test_partes_con_diccionarios_numericos(crudos, tmp_path):
+    almacen = AlmacenColumnar(str(tmp_path))
+    almacen.anexar(limpio(crudos.iloc[:3000].copy()))
+    # Una parte escrita antes de guardar las categorías como texto
+    ruta = str(tmp_path / almacen.metadatos['partes'][0])
+    tabla = pa.Table.from_pandas(limpio(crudos.iloc[:3000].copy()), preserve_index=False)
+    with pa.OSFile(ruta, 'wb') as destino, pa.ipc.new_file(destino, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+    assert pa.types.is_integer(pa.ipc.open_file(ruta).schema.field('grupo_id').type.value_type)
+
+    datos = crudos.assign(grupo_id=crudos['grupo_id'].astype(object))
+    datos.loc[4000, 'grupo_id'] = 'G-7'
+    assert almacen.anexar(limpio(leer_csv(csv(datos)))) == 2000
+    assert len(almacen.leer()) == 5000
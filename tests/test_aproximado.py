@@ -0,0 +1,89 @@
+# tests/test_aproximado.py
+import numpy as np
+import pandas as pd
+
+from agregacion import AgregadosParciales
+from aproximado import ALFA_CUANTILES, BocetosIndicadores, HyperLogLog, TopK, cuantizar, probabilidad_cota
+from equivalencia import limpio
+
+
+def test_cuantizar_error_relativo():
+    valores = np.random.default_rng(0).lognormal(0, 3, 10_000) * np.where(np.arange(10_000) % 2, 1, -1)
+    cuantizados = cuantizar(valores)
+    assert np.max(np.abs(cuantizados - valores) / np.abs(valores)) <= ALFA_CUANTILES
+    assert len(np.unique(cuantizados)) < len(valores)
+    # El cero y los nulos se conservan
+    np.testing.assert_array_equal(cuantizar([0.0, np.nan, -0.0]), [0.0, np.nan, -0.0])
+
+
+def test_hyperloglog_dentro_de_la_cota():
+    for distintos in (1_000, 200_000):
+        hll = HyperLogLog().agregar(np.arange(distintos))
+        assert abs(hll.cardinalidad() - distintos) / distintos <= hll.cota_relativa()
+    assert probabilidad_cota(3) > 0.997
+
+
+def test_hyperloglog_combinado():
+    claves = np.random.default_rng(1).integers(0, 10 ** 9, 50_000)
+    todo = HyperLogLog().agregar(claves)
+    partes = HyperLogLog().agregar(claves[:20_000]).combinar(HyperLogLog().agregar(claves[20_000:]))
+    np.testing.assert_array_equal(todo.registros, partes.registros)
+    # 5.0 y 5 son la misma clave; el texto se cuenta aparte
+    assert round(HyperLogLog().agregar(pd.Index([5.0, 5.0, 7.0])).cardinalidad()) == 2
+    assert round(HyperLogLog().agregar(['5', 'G-7', 'G-7']).cardinalidad()) == 2
+
+
+def test_topk_nunca_subestima():
+    claves = np.random.default_rng(2).zipf(1.3, 100_000) % 50_000
+    reales = pd.Series(claves).value_counts()
+    topk = TopK(ancho=1024)
+    for bloque in np.array_split(claves, 5):
+        topk.agregar(pd.Series(bloque).value_counts())
+    estimadas = topk.estimar(reales.index)
+    exceso = estimadas.to_numpy() - reales.to_numpy()
+    assert (exceso >= 0).all()
+    assert topk.total == len(claves)
+    assert np.quantile(exceso, 0.99) <= topk.error_absoluto
+    assert list(topk.top(5).index) == list(reales.head(5).index)
+
+
+def test_topk_combinado():
+    conteo = pd.Series([50, 30, 5], index=['a', 'b', 'c'])
+    combinado = TopK().agregar(conteo.iloc[:2]).combinar(TopK().agregar(conteo.iloc[2:]))
+    pd.testing.assert_series_equal(combinado.top(3), conteo.set_axis(pd.Index(['a', 'b', 'c'])))
+
+
+def test_guardar_y_cargar(crudos, tmp_path):
+    parciales = AgregadosParciales(aproximado=True).actualizar(limpio(crudos.copy()))
+    datos = parciales.bocetos.guardar(str(tmp_path))
+    cargados = BocetosIndicadores.cargar(str(tmp_path), datos)
+    assert cargados.cotas() == parciales.bocetos.cotas()
+    pd.testing.assert_series_equal(cargados.consultas.top(10), parciales.bocetos.consultas.top(10))
+
+
+def test_agregados_aproximados(crudos):
+    df = limpio(crudos.copy())
+    exacto = AgregadosParciales().actualizar(df).finalizar()
+    aproximado = AgregadosParciales(aproximado=True).actualizar(df).finalizar()
+    cotas = aproximado['cotas_aproximadas']
+    consultas_e, consultas_a = exacto['consultas_familiares'], aproximado['consultas_familiares']
+
+    total = consultas_e['total_estudiantes']
+    assert abs(consultas_a['total_estudiantes'] - total) <= cotas['estudiantes_error_relativo'] * total
+    con_consultas = len(consultas_e['consultas_por_estudiante'])
+    assert abs(consultas_a['estudiantes_con_consultas'] - con_consultas) <= cotas['con_consultas_error_relativo'] * con_consultas
+    assert abs(consultas_a['estudiantes_sin_interaccion'] - consultas_e['estudiantes_sin_interaccion']) \
+        <= cotas['sin_interaccion_error_absoluto']
+
+    # La tabla trae solo los estudiantes con más consultas, nunca subestimadas
+    por_estudiante = consultas_e['consultas_por_estudiante'].set_index('id_estudiante')['consultas']
+    estimadas = consultas_a['consultas_por_estudiante'].set_index('id_estudiante')['consultas']
+    assert len(estimadas) <= min(con_consultas, 100)
+    reales = por_estudiante.reindex(estimadas.index.astype(por_estudiante.index.dtype)).to_numpy()
+    assert ((estimadas.to_numpy() - reales) >= 0).all()
+    assert ((estimadas.to_numpy() - reales) <= cotas['consultas_error_absoluto']).all()
+
+    habilidades = exacto['habilidades_mas_frecuentes'].set_index('habilidad')['frecuencia']
+    estimadas = aproximado['habilidades_mas_frecuentes'].set_index('habilidad')['frecuencia']
+    exceso = estimadas - habilidades.reindex(estimadas.index)
+    assert ((exceso >= 0) & (exceso <= cotas['habilidades_error_absoluto'])).all()
@@ -0,0 +1,60 @@
+# tests/test_cache.py
+import io
+import threading
+import time
+
+from cache import CacheLRU, huella_archivo, huella_ruta
+
+
+def test_descarta_la_menos_usada():
+    cache = CacheLRU(max_entradas=2)
+    cache.guardar('a', 1)
+    cache.guardar('b', 2)
+    assert cache.buscar('a') == (True, 1)
+    cache.guardar('c', 3)
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+
+
+def test_limite_de_bytes():
+    cache = CacheLRU(max_entradas=10, max_bytes=250)
+    cache.guardar('a', b'x' * 100)
+    cache.guardar('b', b'x' * 100)
+    cache.guardar('c', b'x' * 100)
+    assert 'a' not in cache and len(cache) == 2
+    assert cache.bytes_usados == 200
+    # Un valor más grande que la caché completa no se guarda ni desplaza a los demás
+    cache.guardar('grande', b'x' * 300)
+    assert 'grande' not in cache and len(cache) == 2
+
+
+def test_reemplazar_descuenta_los_bytes():
+    cache = CacheLRU(max_bytes=1000)
+    cache.guardar('a', b'x' * 100)
+    cache.guardar('a', b'x' * 40)
+    assert cache.bytes_usados == 40
+
+
+def test_calcula_una_sola_vez_entre_hilos():
+    cache = CacheLRU()
+    llamadas = []
+
+    def calcular():
+        llamadas.append(1)
+        time.sleep(0.05)
+        return 'valor'
+
+    valores = []
+    hilos = [threading.Thread(target=lambda: valores.append(cache.obtener('clave', calcular))) for _ in range(8)]
+    for hilo in hilos:
+        hilo.start()
+    for hilo in hilos:
+        hilo.join()
+    assert len(llamadas) == 1
+    assert valores == ['valor'] * 8
+
+
+def test_huellas_coinciden(tmp_path):
+    contenido = b'id_estudiante,nota\n1,3.5\n' * 1000
+    ruta = tmp_path / 'datos.csv'
+    ruta.write_bytes(contenido)
+    assert huella_archivo(io.BytesIO(contenido)) == huella_ruta(str(ruta), bloque=1000)
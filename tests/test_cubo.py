@@ -0,0 +1,59 @@
+# tests/test_cubo.py
+import numpy as np
+import pandas as pd
+import pytest
+
+from agregacion import CuboIndicadores
+from equivalencia import limpio, referencia, sin_diferencias
+from esquema import leer_csv
+
+# Indicadores que el cubo calcula igual que el informe
+DERIVADOS = ['promedio_notas_grupo', 'materias_mas_reprobaciones', 'correlacion_nota_asistencia']
+
+
+def derivados(cubo):
+    return {nombre: getattr(cubo, nombre)() for nombre in DERIVADOS}
+
+
+def test_sin_filtros(ruta):
+    df = limpio(leer_csv(ruta))
+    assert sin_diferencias(referencia(df, DERIVADOS), derivados(CuboIndicadores.construir(df)), DERIVADOS) == {}
+
+
+@pytest.mark.parametrize('filtros', [
+    {'materia': ['Matemáticas', 'Arte']},
+    {'grupo_id': [2, 5, 7], 'tipo_usuario': 'estudiante'},
+    {'mes': ['2025-03', '2025-06'], 'materia': 'Historia'},
+    {'materia': 'Sin materia'},
+])
+def test_filtrado(crudos, filtros):
+    cubo = CuboIndicadores.construir(limpio(crudos.copy()))
+    mascara = pd.Series(True, index=crudos.index)
+    for dimension, valores in filtros.items():
+        columna = crudos['timestamp'].str[:7] if dimension == 'mes' else crudos[dimension]
+        mascara &= columna.isin(valores if isinstance(valores, list) else [valores])
+    # La referencia limpia solo las filas filtradas, como si fueran el CSV subido
+    esperado = referencia(limpio(crudos[mascara].copy()), DERIVADOS)
+    assert sin_diferencias(esperado, derivados(cubo.filtrar(**filtros)), DERIVADOS) == {}
+
+
+def test_metricas_por_mes(crudos):
+    df = limpio(crudos.copy())
+    metricas = CuboIndicadores.construir(df).metricas(['mes'])
+    meses = df['timestamp'].dt.strftime('%Y-%m')
+    assert list(metricas.index) == sorted(meses.unique())
+    assert metricas['registros'].tolist() == meses.value_counts().sort_index().tolist()
+    promedios = df.groupby(meses)['nota'].mean().round(2)
+    assert np.allclose(metricas['promedio_nota'], promedios, atol=0.01)
+
+
+def test_combinar_equivale_a_construir_todo(crudos):
+    df = limpio(crudos.copy())
+    combinado = CuboIndicadores.construir(df.iloc[:2000]).combinar(CuboIndicadores.construir(df.iloc[2000:]))
+    assert sin_diferencias(derivados(CuboIndicadores.construir(df)), derivados(combinado), DERIVADOS) == {}
+    assert combinado.totales()['filas'].item() == len(df)
+
+
+def test_dimension_desconocida(crudos):
+    with pytest.raises(ValueError):
+        CuboIndicadores.construir(limpio(crudos.copy())).filtrar(ciudad='Bogotá')
@@ -0,0 +1,40 @@
+# tests/test_esquema.py
+import io
+
+import pandas as pd
+import pyarrow as pa
+
+from esquema import aplicar_esquema, leer_csv, limpiar_categorias
+
+
+def leer(texto, **opciones):
+    return leer_csv(io.StringIO(texto), **opciones)
+
+
+def test_tipos_declarados():
+    df = aplicar_esquema(leer('grupo_id,nota,fecha_registro,nombre\n2,3.5,2024-01-05, Ana \n10,x,05/01/2024,Luis\n'))
+    assert list(df['grupo_id'].cat.categories) == [2, 10]
+    assert df['nota'].dtype == 'float32' and df['nota'].isna().tolist() == [False, True]
+    assert df['fecha_registro'].notna().all()
+    assert df['nombre'].tolist() == ['Ana', 'Luis']
+
+
+def test_categorias_en_texto_si_alguna_no_es_numero():
+    df = aplicar_esquema(leer('grupo_id\n2\n10\nA1\n 2\n'))
+    assert list(df['grupo_id'].cat.categories) == ['10', '2', 'A1']
+    assert df['grupo_id'].tolist() == ['2', '10', 'A1', '2']
+
+
+def test_cada_bloque_decide_el_tipo():
+    bloques = [aplicar_esquema(bloque) for bloque in leer('grupo_id\n1\n2\nA1\n', chunksize=2)]
+    assert list(bloques[0]['grupo_id'].cat.categories) == [1, 2]
+    assert list(bloques[1]['grupo_id'].cat.categories) == ['A1']
+
+
+def test_limpiar_categorias_leidas_de_arrow():
+    tabla = pa.table({'grupo_id': pa.array(['10', '2', None]).dictionary_encode(),
+                      'materia': pa.array(['Lengua', 'Arte', 'Lengua']).dictionary_encode()})
+    df = limpiar_categorias(tabla.to_pandas())
+    assert list(df['grupo_id'].cat.categories) == [2, 10]
+    assert list(df['materia'].cat.categories) == ['Arte', 'Lengua']
+    assert pd.isna(df['grupo_id'].iloc[2])
@@ -0,0 +1,32 @@
+# tests/test_estado_incremental.py
+from analizador import AnalizadorEducativo
+from equivalencia import limpio, referencia, sin_diferencias
+from esquema import leer_csv
+
+
+def test_actualizar_con_filas_nuevas(ruta):
+    crudo = leer_csv(ruta)
+    mitad = len(crudo) // 2
+    analizador = AnalizadorEducativo(crudo.iloc[:mitad].copy())
+    analizador.limpiar_datos()
+    analizador.iniciar_estado()
+    resultados = analizador.actualizar(crudo.iloc[mitad:].copy())
+    assert sin_diferencias(referencia(limpio(crudo)), resultados) == {}
+
+
+def test_continuar_estado_guardado(crudos, tmp_path):
+    analizador = AnalizadorEducativo(crudos.iloc[:3000].copy())
+    analizador.limpiar_datos()
+    analizador.iniciar_estado()
+    analizador.guardar_estado(str(tmp_path))
+
+    continuado = AnalizadorEducativo.desde_estado(str(tmp_path))
+    assert continuado.df.empty
+    resultados = continuado.actualizar(crudos.iloc[3000:].copy())
+    assert resultados['informacion_dataset']['registros'] == len(crudos)
+    assert sin_diferencias(referencia(limpio(crudos.copy())), resultados) == {}
+
+
+def test_actualizar_sin_estado_previo(crudos):
+    resultados = AnalizadorEducativo(crudos.iloc[:0].copy()).actualizar(crudos.copy())
+    assert sin_diferencias(referencia(limpio(crudos.copy())), resultados) == {}
@@ -0,0 +1,40 @@
+# tests/test_lote.py
+import pandas as pd
+import pytest
+
+from agregacion import INDICADORES, PlanAgregacion
+from equivalencia import MUESTRA, limpio, referencia, sin_diferencias
+from esquema import leer_csv
+from lote import cargar_resultados, guardar_resultados, listar_resultados, procesar_archivo
+
+
+@pytest.mark.parametrize('formato', ['parquet', 'arrow'])
+def test_guardar_y_cargar(formato, tmp_path):
+    resultados = PlanAgregacion(limpio(leer_csv(MUESTRA))).ejecutar()
+    guardar_resultados(resultados, str(tmp_path), formato, huella='x')
+    cargados = cargar_resultados(str(tmp_path))
+
+    assert set(cargados) == set(resultados)
+    for nombre in INDICADORES:
+        if isinstance(resultados[nombre], pd.DataFrame):
+            # Parquet devuelve como enteros las categorías numéricas; valores y orden se conservan
+            pd.testing.assert_frame_equal(cargados[nombre], resultados[nombre], check_categorical=False,
+                                          check_dtype=formato == 'arrow', check_index_type=formato == 'arrow')
+    assert cargados['informacion_dataset'] == resultados['informacion_dataset']
+    assert cargados['correlacion_nota_asistencia'] == resultados['correlacion_nota_asistencia']
+    tabla = resultados['consultas_familiares']['consultas_por_estudiante']
+    pd.testing.assert_frame_equal(cargados['consultas_familiares']['consultas_por_estudiante'], tabla)
+
+
+@pytest.mark.parametrize('filas_por_bloque', [None, 40])
+def test_procesar_archivo(filas_por_bloque, tmp_path):
+    salida = str(tmp_path)
+    estadisticas = procesar_archivo(MUESTRA, salida, filas_por_bloque=filas_por_bloque)
+    assert not estadisticas['omitido']
+    esperado = referencia(limpio(leer_csv(MUESTRA)))
+    assert sin_diferencias(esperado, cargar_resultados(estadisticas['directorio'])) == {}
+    assert list(listar_resultados(salida)) == ['datos_educativos']
+
+    # Sin cambios en el CSV no se recalcula, salvo con forzar
+    assert procesar_archivo(MUESTRA, salida, filas_por_bloque=filas_por_bloque)['omitido']
+    assert not procesar_archivo(MUESTRA, salida, filas_por_bloque=filas_por_bloque, forzar=True)['omitido']
@@ -0,0 +1,63 @@
+# tests/test_motor_sql.py
+import pandas as pd
+import pytest
+
+from agregacion import INDICADORES, PlanAgregacion
+from equivalencia import MUESTRA, limpio, referencia, sin_diferencias
+from esquema import leer_csv
+from motor_sql import MotorSQL, diferencias
+
+MOTORES = [('sqlite', False), ('duckdb', False), ('duckdb', True)]
+
+
+def motor_disponible(motor):
+    if motor == 'duckdb':
+        pytest.importorskip('duckdb')
+
+
+@pytest.mark.parametrize('motor, escanear', MOTORES)
+def test_coincide_con_los_metodos(ruta, motor, escanear):
+    motor_disponible(motor)
+    esperado = referencia(limpio(leer_csv(ruta)))
+    with MotorSQL.desde_csv(ruta, escanear=escanear, motor=motor) as consultas:
+        assert sin_diferencias(esperado, consultas.ejecutar()) == {}
+
+
+@pytest.mark.parametrize('motor, escanear', MOTORES)
+def test_en_paralelo(motor, escanear):
+    motor_disponible(motor)
+    with MotorSQL.desde_csv(MUESTRA, filas_por_bloque=30, escanear=escanear, motor=motor) as consultas:
+        assert consultas.registros == 100
+        assert diferencias(consultas.ejecutar(), consultas.ejecutar(trabajadores=4)) == {}
+
+
+def test_diferencias_detecta_cambios():
+    resultados = PlanAgregacion(limpio(leer_csv(MUESTRA))).ejecutar()
+    cambiados = dict(resultados, correlacion_nota_asistencia=resultados['correlacion_nota_asistencia'] + 0.1)
+    promedios = resultados['promedio_notas_grupo'].copy()
+    promedios.loc[promedios.index[0], 'promedio_nota'] += 1
+    cambiados['promedio_notas_grupo'] = promedios
+    assert set(diferencias(resultados, cambiados)) == {'promedio_notas_grupo', 'correlacion_nota_asistencia'}
+
+
+def test_diferencias_detecta_el_orden():
+    resultados = PlanAgregacion(limpio(leer_csv(MUESTRA))).ejecutar()
+    tablas = {nombre: tabla for nombre, tabla in resultados.items()
+              if nombre in INDICADORES and isinstance(tabla, pd.DataFrame) and len(tabla) > 1}
+    tablas['consultas_familiares'] = resultados['consultas_familiares']['consultas_por_estudiante']
+    for nombre, tabla in tablas.items():
+        invertida = tabla.iloc[::-1]
+        if nombre == 'consultas_familiares':
+            invertida = dict(resultados[nombre], consultas_por_estudiante=invertida)
+        assert set(diferencias(resultados, dict(resultados, **{nombre: invertida}))) == {nombre}
+
+
+def test_diferencias_admite_empates_en_otro_orden():
+    esperado = pd.DataFrame({'habilidad': ['c', 'a', 'b', 'd'], 'frecuencia': [9, 5, 5, 1]})
+    empates = esperado.iloc[[0, 2, 1, 3]]
+    casi = empates.assign(frecuencia=[9, 5.004, 4.998, 1])
+    for otra in (empates, casi):
+        assert diferencias({'habilidades_mas_frecuentes': esperado}, {'habilidades_mas_frecuentes': otra}) == {}
+    # Fuera de un empate el orden sí cuenta, aunque cada etiqueta tenga su valor
+    assert diferencias({'habilidades_mas_frecuentes': esperado},
+                       {'habilidades_mas_frecuentes': esperado.iloc[[1, 0, 2, 3]]}) != {}
@@ -0,0 +1,57 @@
+# tests/test_plan_agregacion.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from agregacion import INDICADORES, PlanAgregacion, _compartida
+from equivalencia import MUESTRA, limpio, referencia, sin_diferencias
+from esquema import leer_csv
+
+
+def test_coincide_con_los_metodos(ruta):
+    df = limpio(leer_csv(ruta))
+    assert sin_diferencias(referencia(df), PlanAgregacion(df).ejecutar()) == {}
+
+
+def test_calcular_un_indicador(ruta):
+    df = limpio(leer_csv(ruta))
+    plan = PlanAgregacion(df)
+    for nombre in INDICADORES:
+        assert sin_diferencias(referencia(df, [nombre]), {nombre: plan.calcular(nombre)}, [nombre]) == {}
+
+
+class PlanEsperando(PlanAgregacion):
+    """Plan con una columna derivada que espera a liberar y cuenta sus cálculos"""
+
+    def __init__(self, df, liberar):
+        super().__init__(df)
+        self.liberar = liberar
+        self.calculos = 0
+
+    @_compartida
+    def esperada(self):
+        self.calculos += 1
+        assert self.liberar.wait(5)
+        return len(self.df)
+
+
+def test_columna_compartida_una_vez_por_plan():
+    liberar = threading.Event()
+    plan = PlanEsperando(limpio(leer_csv(MUESTRA)), liberar)
+    with ThreadPoolExecutor(8) as pool:
+        futuros = [pool.submit(lambda: plan.esperada) for _ in range(8)]
+        liberar.set()
+        assert [futuro.result() for futuro in futuros] == [100] * 8
+    assert plan.calculos == 1
+
+
+def test_planes_distintos_no_se_esperan():
+    df = limpio(leer_csv(MUESTRA))
+    bloqueado, libre = PlanEsperando(df, threading.Event()), PlanEsperando(df.iloc[:10], threading.Event())
+    libre.liberar.set()
+    with ThreadPoolExecutor(2) as pool:
+        esperando = pool.submit(lambda: bloqueado.esperada)
+        # El otro plan calcula la misma columna mientras el primero sigue dentro de la suya
+        assert pool.submit(lambda: libre.esperada).result(timeout=2) == 10
+        assert not esperando.done()
+        bloqueado.liberar.set()
+        assert esperando.result() == 100
@@ -0,0 +1,60 @@
+# tests/test_resultados_arrow.py
+import gc
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+import resultados_arrow
+from agregacion import PlanAgregacion
+from equivalencia import MUESTRA, limpio
+from esquema import leer_csv
+from resultados_arrow import a_arrow, empaquetar, escribir_ipc, leer_ipc, pagina, paginas, tabla_arrow
+
+
+@pytest.fixture(scope='module')
+def resultados():
+    return PlanAgregacion(limpio(leer_csv(MUESTRA))).ejecutar()
+
+
+def test_resumen_con_indice_primero(resultados):
+    tabla = a_arrow(resultados['resumen_estadistico_grupo'])
+    assert tabla.column_names[:3] == ['grupo_id', 'nota count', 'nota mean']
+    assert tabla.num_rows == len(resultados['resumen_estadistico_grupo'])
+
+
+def test_paginas_sin_copiar(resultados):
+    tabla = a_arrow(resultados['asistencia_promedio_estudiante'])
+    assert paginas(tabla.num_rows, 20) == -(-tabla.num_rows // 20)
+    assert paginas(0) == 1
+    ultima = paginas(tabla.num_rows, 20) - 1
+    filas = [pagina(tabla, numero, 20).num_rows for numero in range(ultima + 1)]
+    assert sum(filas) == tabla.num_rows and all(n == 20 for n in filas[:-1])
+    assert pagina(tabla, 1, 20).to_pandas().equals(tabla.to_pandas().iloc[20:40].reset_index(drop=True))
+
+
+def test_tabla_arrow_una_vez_por_resultado():
+    tabla = pd.DataFrame({'a': range(10)})
+    assert tabla_arrow(tabla) is tabla_arrow(tabla)
+    clave = id(tabla)
+    del tabla
+    gc.collect()
+    # Al soltar el DataFrame se suelta su tabla Arrow
+    assert clave not in resultados_arrow._CONVERTIDAS
+
+
+@pytest.mark.parametrize('compresion', ['zstd', None])
+def test_ipc_ida_y_vuelta(resultados, compresion, tmp_path):
+    for nombre in ('materias_mas_reprobaciones', 'promedio_notas_grupo', 'resumen_estadistico_grupo'):
+        ruta = str(tmp_path / f'{nombre}.arrow')
+        escribir_ipc(resultados[nombre], ruta, compresion)
+        pd.testing.assert_frame_equal(leer_ipc(ruta).to_pandas(), resultados[nombre])
+
+
+def test_empaquetar(resultados, tmp_path):
+    escribir_ipc(resultados['tipos_apoyo_solicitados'], str(tmp_path / 'apoyos.arrow'))
+    (tmp_path / 'manifiesto.json').write_text('{}')
+    with zipfile.ZipFile(io.BytesIO(empaquetar(str(tmp_path)))) as paquete:
+        assert paquete.namelist() == ['apoyos.arrow', 'manifiesto.json']
+        assert paquete.read('manifiesto.json') == b'{}'
@@ -0,0 +1,99 @@
+# tests/test_trabajos.py
+import threading
+
+import pytest
+
+from instrumentacion import medir
+from trabajos import CANCELADO, ERROR, TERMINADO, GestorTrabajos
+
+
+@pytest.fixture
+def gestor():
+    gestor = GestorTrabajos(trabajadores=2)
+    yield gestor
+    gestor._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def bloqueado(liberar, llamadas):
+    """Función de trabajo que espera a liberar, con una etapa medida por vuelta para poder cancelarla"""
+    def funcion(trabajo):
+        llamadas.append(trabajo.clave)
+        while not liberar.wait(0.01):
+            with medir('espera'):
+                pass
+        return 'listo'
+    return funcion
+
+
+def test_misma_clave_mismo_trabajo(gestor):
+    liberar, llamadas = threading.Event(), []
+    primero = gestor.iniciar('a', bloqueado(liberar, llamadas), solicitante='s1')
+    segundo = gestor.iniciar('a', bloqueado(liberar, llamadas), solicitante='s2')
+    assert segundo is primero
+    liberar.set()
+    assert primero.esperar(5)
+    assert primero.estado == TERMINADO and primero.resultado == 'listo'
+    assert llamadas == ['a']
+    # Ya terminado, se devuelve tal cual aunque se pida reintentar
+    assert gestor.iniciar('a', bloqueado(liberar, llamadas), reintentar=True) is primero
+
+
+def test_cancelar_retira_solo_al_solicitante(gestor):
+    liberar, llamadas = threading.Event(), []
+    trabajo = gestor.iniciar('a', bloqueado(liberar, llamadas), solicitante='s1')
+    gestor.iniciar('a', bloqueado(liberar, llamadas), solicitante='s2')
+    gestor.cancelar('a', 's1')
+    assert trabajo.retirado('s1') and not trabajo.cancelando
+    assert not trabajo.esperar(0.1) and trabajo.activo
+    # Quien canceló no vuelve a sumarse al pedirlo otra vez, salvo al reintentar
+    gestor.iniciar('a', bloqueado(liberar, llamadas), solicitante='s1')
+    assert trabajo.retirado('s1')
+    gestor.cancelar('a', 's2')
+    assert trabajo.cancelando
+    assert trabajo.esperar(5) and trabajo.estado == CANCELADO
+    assert not liberar.is_set()
+
+
+def test_reintentar_reemplaza_el_cancelado(gestor):
+    liberar, llamadas = threading.Event(), []
+    cancelado = gestor.iniciar('a', bloqueado(liberar, llamadas), solicitante='s1')
+    gestor.cancelar('a', 's1')
+    assert cancelado.esperar(5) and cancelado.estado == CANCELADO
+    assert gestor.iniciar('a', bloqueado(liberar, llamadas), solicitante='s1') is cancelado
+    liberar.set()
+    nuevo = gestor.iniciar('a', bloqueado(liberar, llamadas), reintentar=True, solicitante='s1')
+    assert nuevo is not cancelado
+    assert nuevo.esperar(5) and nuevo.estado == TERMINADO
+    assert llamadas == ['a', 'a']
+
+
+def test_error(gestor):
+    def falla(trabajo):
+        raise ValueError('sin datos')
+    trabajo = gestor.iniciar('a', falla, en_linea=True)
+    assert trabajo.estado == ERROR and str(trabajo.error) == 'sin datos'
+    assert trabajo.funcion is None
+
+
+def test_guarda_los_ultimos_terminados():
+    gestor = GestorTrabajos(trabajadores=1, max_terminados=2)
+    for clave in 'abcd':
+        gestor.iniciar(clave, lambda trabajo: trabajo.clave, en_linea=True)
+    # Se recorta al sumar un trabajo, que en ese momento sigue activo
+    assert [trabajo.clave for trabajo in gestor.trabajos()] == ['b', 'c', 'd']
+    gestor._pool.shutdown()
+
+
+def test_entregar_suelta_el_resultado(gestor):
+    liberar, llamadas = threading.Event(), []
+    trabajo = gestor.iniciar('a', bloqueado(liberar, llamadas))
+    assert gestor.entregar('a') == (False, None)
+    liberar.set()
+    assert trabajo.esperar(5)
+    assert gestor.entregar('a') == (True, 'listo')
+    # El trabajo ya no retiene el resultado ni se devuelve a otra sesión
+    assert trabajo.resultado is None and gestor.obtener('a') is None
+    assert gestor.entregar('a') == (False, None)
+    # Pedirlo otra vez vuelve a calcularlo
+    assert gestor.iniciar('a', bloqueado(liberar, llamadas)).esperar(5)
+    assert llamadas == ['a', 'a']
@@ -0,0 +1,236 @@
+# trabajos.py
+"""Trabajos de análisis en segundo plano, uno por clave (huella del dataset, modo y resultados pedidos).
+
+Pedir una clave que ya tiene un trabajo en curso o terminado devuelve ese
+mismo trabajo: dos clics o dos sesiones con el mismo archivo no repiten el
+cálculo, y una reejecución del dashboard recoge el resultado terminado.
+El progreso sale de las etapas que mide instrumentacion.medir dentro del
+trabajo y de los pasos que marca la propia función. Cada sesión que pide
+el trabajo queda como solicitante: al cancelar se retira, y el cálculo se
+detiene (al terminar la etapa en curso) cuando se retira el último.
+"""
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from instrumentacion import Traza, traza_activa, trazar
+
+EN_COLA = 'en_cola'
+EN_CURSO = 'en_curso'
+TERMINADO = 'terminado'
+CANCELADO = 'cancelado'
+ERROR = 'error'
+
+
+class Cancelado(Exception):
+    """Se lanza dentro del trabajo al terminar la primera etapa después de cancelarlo"""
+
+
+class _TrazaTrabajo(Traza):
+    """Traza del trabajo: cada etapa medida avanza su progreso y reenvía el evento a la traza de origen"""
+
+    def __init__(self, trabajo, origen):
+        super().__init__()
+        self.trabajo = trabajo
+        self.traza_origen = origen
+
+    def registrar(self, evento):
+        super().registrar(evento)
+        if self.traza_origen is not None:
+            self.traza_origen.registrar(evento)
+        self.trabajo._etapa_medida(evento)
+
+    def agregar(self, eventos):
+        super().agregar(eventos)
+        if self.traza_origen is not None:
+            self.traza_origen.agregar(eventos)
+        for evento in eventos:
+            self.trabajo._etapa_medida(evento)
+
+
+class Trabajo:
+    """Un cálculo en segundo plano con estado, progreso, resultado y cancelación cooperativa.
+
+    funcion recibe el propio trabajo, para marcar pasos con avanzar(); total
+    es el número de pasos esperados (None si no se conoce).
+    """
+
+    def __init__(self, clave, funcion, total=None):
+        self.clave = clave
+        self.funcion = funcion
+        self.total = total
+        self.estado = EN_COLA
+        self.etapa = None
+        self.etapas = 0
+        self.completados = 0
+        self.resultado = None
+        self.error = None
+        self.inicio = None
+        self.fin = None
+        self._solicitantes = set()
+        self._retirados = set()
+        self._candado = threading.Lock()
+        self._cancelar = threading.Event()
+        self._terminado = threading.Event()
+
+    @property
+    def activo(self):
+        return self.estado in (EN_COLA, EN_CURSO)
+
+    @property
+    def progreso(self):
+        """Fracción de pasos completados, o None si no se conoce el total"""
+        if not self.total:
+            return None
+        return min(self.completados / self.total, 1.0)
+
+    @property
+    def segundos(self):
+        if self.inicio is None:
+            return 0.0
+        return (self.fin or time.perf_counter()) - self.inicio
+
+    def _etapa_medida(self, evento):
+        self.etapa = evento['nombre']
+        self.etapas += 1
+        self.comprobar()
+
+    def avanzar(self, etapa=None, pasos=1):
+        """Marca pasos completados y se detiene aquí si el trabajo fue cancelado"""
+        if etapa is not None:
+            self.etapa = etapa
+        self.completados += pasos
+        self.comprobar()
+
+    def comprobar(self):
+        if self._cancelar.is_set():
+            raise Cancelado(f'Trabajo cancelado: {self.clave}')
+
+    def unir(self, solicitante, volver=False):
+        """Suma un solicitante; quien canceló no vuelve a sumarse salvo con volver"""
+        if solicitante is None:
+            return
+        with self._candado:
+            if solicitante in self._retirados and not volver:
+                return
+            self._retirados.discard(solicitante)
+            self._solicitantes.add(solicitante)
+
+    @property
+    def cancelando(self):
+        """Cancelado por todos sus solicitantes, aunque siga en la etapa en curso"""
+        return self._cancelar.is_set()
+
+    def retirado(self, solicitante):
+        with self._candado:
+            return solicitante in self._retirados
+
+    def cancelar(self, solicitante=None):
+        """Retira al solicitante y detiene el trabajo si no queda ninguno (sin solicitante, lo detiene siempre)"""
+        with self._candado:
+            if solicitante is not None:
+                self._solicitantes.discard(solicitante)
+                self._retirados.add(solicitante)
+            if solicitante is None or not self._solicitantes:
+                self._cancelar.set()
+
+    def esperar(self, tiempo=None):
+        """Espera a que el trabajo termine (bien, con error o cancelado); devuelve si terminó"""
+        return self._terminado.wait(tiempo)
+
+    def ejecutar(self, traza=None):
+        """Corre la función en el hilo actual; traza, si la hay, recibe también las etapas medidas"""
+        try:
+            self.comprobar()
+            self.estado = EN_CURSO
+            self.inicio = time.perf_counter()
+            with trazar(_TrazaTrabajo(self, traza)):
+                self.resultado = self.funcion(self)
+            self.estado = TERMINADO
+        except Cancelado:
+            self.estado = CANCELADO
+        except Exception as e:
+            self.error = e
+            self.estado = ERROR
+        finally:
+            # La función puede retener el archivo o el DataFrame: se suelta al terminar
+            self.funcion = None
+            self.fin = time.perf_counter()
+            self._terminado.set()
+
+
+class GestorTrabajos:
+    """Pool de trabajos por clave, compartido entre sesiones.
+
+    Guarda los trabajos activos y los últimos max_terminados terminados,
+    cancelados o con error (de más antiguo a más reciente).
+    """
+
+    def __init__(self, trabajadores=2, max_terminados=16):
+        self.max_terminados = max_terminados
+        self._pool = ThreadPoolExecutor(trabajadores, thread_name_prefix='trabajo')
+        self._trabajos = OrderedDict()
+        self._candado = threading.Lock()
+
+    def obtener(self, clave):
+        with self._candado:
+            return self._trabajos.get(clave)
+
+    def trabajos(self):
+        with self._candado:
+            return list(self._trabajos.values())
+
+    def iniciar(self, clave, funcion, total=None, reintentar=False, en_linea=False, solicitante=None):
+        """Trabajo de la clave: el existente o uno nuevo en el pool.
+
+        Un trabajo cancelado o con error se devuelve tal cual salvo con
+        reintentar, que lo reemplaza por uno nuevo (o, si sigue en curso
+        porque otros lo esperan, vuelve a sumar al solicitante). Con
+        en_linea el trabajo nuevo corre en el hilo que llama (por ejemplo,
+        para perfilarlo).
+        """
+        with self._candado:
+            trabajo = self._trabajos.get(clave)
+            reemplazar = trabajo is not None and (trabajo.estado in (CANCELADO, ERROR) or trabajo.cancelando)
+            if trabajo is not None and not (reintentar and reemplazar):
+                self._trabajos.move_to_end(clave)
+                trabajo.unir(solicitante, volver=reintentar)
+                return trabajo
+            trabajo = Trabajo(clave, funcion, total)
+            trabajo.unir(solicitante)
+            self._trabajos[clave] = trabajo
+            self._recortar()
+        # El trabajo hereda el contexto de quien lo pide y sus etapas llegan a su traza activa
+        if en_linea:
+            trabajo.ejecutar(traza_activa())
+        else:
+            self._pool.submit(contextvars.copy_context().run, trabajo.ejecutar, traza_activa())
+        return trabajo
+
+    def cancelar(self, clave, solicitante=None):
+        trabajo = self.obtener(clave)
+        if trabajo is not None:
+            trabajo.cancelar(solicitante)
+        return trabajo
+
+    def entregar(self, clave):
+        """Resultado del trabajo terminado de la clave, que deja de guardarse aquí.
+
+        Quien lo recibe decide dónde retenerlo (por ejemplo, en la caché con
+        su límite de memoria). Devuelve (entregado, resultado): no se entrega
+        nada si el trabajo no terminó o si otra sesión ya lo recibió.
+        """
+        with self._candado:
+            trabajo = self._trabajos.get(clave)
+            if trabajo is None or trabajo.estado != TERMINADO:
+                return False, None
+            del self._trabajos[clave]
+            resultado, trabajo.resultado = trabajo.resultado, None
+            return True, resultado
+
+    def _recortar(self):
+        inactivos = [clave for clave, trabajo in self._trabajos.items() if not trabajo.activo]
+        for clave in inactivos[:max(len(inactivos) - self.max_terminados, 0)]:
+            del self._trabajos[clave]